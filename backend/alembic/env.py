@@ -22,7 +22,10 @@ from app.db.base import Base
 
 # Importar TODOS los modelos aquí para que Alembic los detecte
 from app.models.user import User  # noqa
-from app.models.scan import Scan  # noqa
+from app.models.scan import Scan, ScanFinding  # noqa
+from app.models.findings import (  # noqa
+    Host, OpenPort, Service, Subdomain, HttpEndpoint, Vulnerability, TlsFinding
+)
 
 # Configuración de Alembic
 config = context.config
@@ -0,0 +1,38 @@
+"""Add scan progress and scanfinding table
+
+Revision ID: 3b7d2c9a41e0
+Revises: e4559338a6a8
+Create Date: 2026-10-17 09:12:41.318204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3b7d2c9a41e0'
+down_revision = 'e4559338a6a8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('scan', sa.Column('progress', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('scan', sa.Column('progress_updated_at', sa.DateTime(timezone=True), nullable=True))
+    op.create_table('scanfinding',
+    sa.Column('id', sa.BigInteger(), nullable=False),
+    sa.Column('scan_id', sa.Integer(), nullable=False),
+    sa.Column('tool', sa.String(length=100), nullable=False),
+    sa.Column('data', sa.Text(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.ForeignKeyConstraint(['scan_id'], ['scan.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_scanfinding_scan_id'), 'scanfinding', ['scan_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_scanfinding_scan_id'), table_name='scanfinding')
+    op.drop_table('scanfinding')
+    op.drop_column('scan', 'progress_updated_at')
+    op.drop_column('scan', 'progress')
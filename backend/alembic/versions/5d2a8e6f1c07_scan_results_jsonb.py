@@ -0,0 +1,58 @@
+"""Store scan results and findings as JSONB
+
+Revision ID: 5d2a8e6f1c07
+Revises: 7c1e5f2a9b34
+Create Date: 2026-10-17 12:21:09.104652
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '5d2a8e6f1c07'
+down_revision = '7c1e5f2a9b34'
+branch_labels = None
+depends_on = None
+
+
+def _without_nul(column: str) -> str:
+    """
+    Expresión USING que quita los \\u0000 del JSON antes de pasarlo a jsonb,
+    que los rechaza. Las barras escapadas (\\\\) se apartan antes con chr(1)
+    para no romper un \\\\u0000 literal.
+    """
+    return (
+        f"replace(replace(replace({column}, '\\\\', chr(1)), '\\u0000', ''), "
+        f"chr(1), '\\\\')::jsonb"
+    )
+
+
+def upgrade() -> None:
+    op.alter_column('scan', 'results',
+               existing_type=sa.Text(),
+               type_=postgresql.JSONB(astext_type=sa.Text()),
+               existing_nullable=True,
+               postgresql_using=_without_nul('results'))
+    op.alter_column('scanfinding', 'data',
+               existing_type=sa.Text(),
+               type_=postgresql.JSONB(astext_type=sa.Text()),
+               existing_nullable=False,
+               postgresql_using=_without_nul('data'))
+    op.create_index('ix_scan_results_gin', 'scan', ['results'], unique=False,
+                    postgresql_using='gin', postgresql_ops={'results': 'jsonb_path_ops'})
+
+
+def downgrade() -> None:
+    op.drop_index('ix_scan_results_gin', table_name='scan', postgresql_using='gin')
+    op.alter_column('scanfinding', 'data',
+               existing_type=postgresql.JSONB(astext_type=sa.Text()),
+               type_=sa.Text(),
+               existing_nullable=False,
+               postgresql_using='data::text')
+    op.alter_column('scan', 'results',
+               existing_type=postgresql.JSONB(astext_type=sa.Text()),
+               type_=sa.Text(),
+               existing_nullable=True,
+               postgresql_using='results::text')
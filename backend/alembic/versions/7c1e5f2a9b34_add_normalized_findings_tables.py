@@ -0,0 +1,127 @@
+"""Add normalized findings tables
+
+Revision ID: 7c1e5f2a9b34
+Revises: 3b7d2c9a41e0
+Create Date: 2026-10-17 11:04:27.530911
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7c1e5f2a9b34'
+down_revision = '3b7d2c9a41e0'
+branch_labels = None
+depends_on = None
+
+
+def _common_columns():
+    return [
+        sa.Column('id', sa.BigInteger(), nullable=False),
+        sa.Column('scan_id', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.ForeignKeyConstraint(['scan_id'], ['scan.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    ]
+
+
+def upgrade() -> None:
+    op.add_column('scan', sa.Column('findings_indexed', sa.Boolean(), server_default='false', nullable=False))
+
+    op.create_table('host',
+    *_common_columns(),
+    sa.Column('address', sa.String(length=255), nullable=False),
+    sa.Column('hostname', sa.String(length=500), nullable=True),
+    sa.Column('status', sa.String(length=50), nullable=True),
+    sa.Column('os', sa.String(length=255), nullable=True)
+    )
+    op.create_index(op.f('ix_host_scan_id'), 'host', ['scan_id'], unique=False)
+    op.create_index(op.f('ix_host_address'), 'host', ['address'], unique=False)
+
+    op.create_table('openport',
+    *_common_columns(),
+    sa.Column('ip', sa.String(length=255), nullable=False),
+    sa.Column('port', sa.Integer(), nullable=False),
+    sa.Column('protocol', sa.String(length=10), nullable=False),
+    sa.Column('state', sa.String(length=20), nullable=False)
+    )
+    op.create_index(op.f('ix_openport_scan_id'), 'openport', ['scan_id'], unique=False)
+    op.create_index(op.f('ix_openport_ip'), 'openport', ['ip'], unique=False)
+    op.create_index('ix_openport_port_state', 'openport', ['port', 'state'], unique=False)
+
+    op.create_table('service',
+    *_common_columns(),
+    sa.Column('ip', sa.String(length=255), nullable=False),
+    sa.Column('port', sa.Integer(), nullable=False),
+    sa.Column('protocol', sa.String(length=10), nullable=False),
+    sa.Column('name', sa.String(length=100), nullable=True),
+    sa.Column('product', sa.String(length=255), nullable=True),
+    sa.Column('version', sa.String(length=255), nullable=True)
+    )
+    op.create_index(op.f('ix_service_scan_id'), 'service', ['scan_id'], unique=False)
+    op.create_index(op.f('ix_service_ip'), 'service', ['ip'], unique=False)
+    op.create_index(op.f('ix_service_port'), 'service', ['port'], unique=False)
+    op.create_index(op.f('ix_service_name'), 'service', ['name'], unique=False)
+
+    op.create_table('subdomain',
+    *_common_columns(),
+    sa.Column('name', sa.String(length=500), nullable=False),
+    sa.Column('domain', sa.String(length=500), nullable=True),
+    sa.Column('source', sa.String(length=100), nullable=True)
+    )
+    op.create_index(op.f('ix_subdomain_scan_id'), 'subdomain', ['scan_id'], unique=False)
+    op.create_index(op.f('ix_subdomain_name'), 'subdomain', ['name'], unique=False)
+    op.create_index(op.f('ix_subdomain_domain'), 'subdomain', ['domain'], unique=False)
+
+    op.create_table('httpendpoint',
+    *_common_columns(),
+    sa.Column('url', sa.Text(), nullable=False),
+    sa.Column('host', sa.String(length=500), nullable=True),
+    sa.Column('status_code', sa.Integer(), nullable=True),
+    sa.Column('title', sa.Text(), nullable=True),
+    sa.Column('webserver', sa.String(length=255), nullable=True),
+    sa.Column('content_type', sa.String(length=255), nullable=True),
+    sa.Column('content_length', sa.BigInteger(), nullable=True),
+    sa.Column('tech', sa.JSON(), nullable=True)
+    )
+    op.create_index(op.f('ix_httpendpoint_scan_id'), 'httpendpoint', ['scan_id'], unique=False)
+    op.create_index(op.f('ix_httpendpoint_host'), 'httpendpoint', ['host'], unique=False)
+    op.create_index(op.f('ix_httpendpoint_status_code'), 'httpendpoint', ['status_code'], unique=False)
+
+    op.create_table('vulnerability',
+    *_common_columns(),
+    sa.Column('template_id', sa.String(length=255), nullable=False),
+    sa.Column('name', sa.String(length=500), nullable=True),
+    sa.Column('severity', sa.String(length=20), nullable=False),
+    sa.Column('host', sa.String(length=500), nullable=True),
+    sa.Column('matched_at', sa.Text(), nullable=True),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('tags', sa.JSON(), nullable=True)
+    )
+    op.create_index(op.f('ix_vulnerability_scan_id'), 'vulnerability', ['scan_id'], unique=False)
+    op.create_index(op.f('ix_vulnerability_template_id'), 'vulnerability', ['template_id'], unique=False)
+    op.create_index(op.f('ix_vulnerability_host'), 'vulnerability', ['host'], unique=False)
+    op.create_index('ix_vulnerability_severity_created_at', 'vulnerability', ['severity', 'created_at'], unique=False)
+
+    op.create_table('tlsfinding',
+    *_common_columns(),
+    sa.Column('finding_id', sa.String(length=255), nullable=False),
+    sa.Column('category', sa.String(length=20), nullable=False),
+    sa.Column('severity', sa.String(length=20), nullable=True),
+    sa.Column('finding', sa.Text(), nullable=True)
+    )
+    op.create_index(op.f('ix_tlsfinding_scan_id'), 'tlsfinding', ['scan_id'], unique=False)
+    op.create_index(op.f('ix_tlsfinding_finding_id'), 'tlsfinding', ['finding_id'], unique=False)
+    op.create_index(op.f('ix_tlsfinding_severity'), 'tlsfinding', ['severity'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_table('tlsfinding')
+    op.drop_table('vulnerability')
+    op.drop_table('httpendpoint')
+    op.drop_table('subdomain')
+    op.drop_table('service')
+    op.drop_table('openport')
+    op.drop_table('host')
+    op.drop_column('scan', 'findings_indexed')
@@ -0,0 +1,57 @@
+"""Add scan duration history and prediction columns
+
+Revision ID: 9f3b6d2e8a41
+Revises: e2a7c4b9d318
+Create Date: 2026-10-17 15:48:12.630174
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9f3b6d2e8a41'
+down_revision = 'e2a7c4b9d318'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('scan', sa.Column('target_size', sa.Integer(), nullable=True))
+    op.add_column('scan', sa.Column('options_hash', sa.String(length=64), nullable=True))
+    op.add_column('scan', sa.Column('duration', sa.Float(), nullable=True))
+    op.add_column('scan', sa.Column('expected_duration', sa.Float(), nullable=True))
+    op.add_column('scan', sa.Column('time_limit', sa.Integer(), nullable=True))
+    op.create_index('ix_scan_tool_used_target_size_completed_at', 'scan',
+                    ['tool_used', 'target_size', 'completed_at'], unique=False)
+    # Tamaño y duración de los escaneos ya terminados, para no empezar sin historial.
+    # El cast a inet va en una función que devuelve 1 si falla ("10.0.0.0/99",
+    # "ab/12"...), igual que target_size() en Python: una fila rara no aborta la migración
+    op.execute(
+        "CREATE FUNCTION pg_temp.scan_target_size(value text) RETURNS integer AS $$ "
+        "BEGIN "
+        "RETURN LEAST("
+        "2 ^ ((CASE WHEN family(value::inet) = 4 THEN 32 ELSE 128 END) - masklen(value::inet)), "
+        "2147483647)::integer; "
+        "EXCEPTION WHEN others THEN RETURN 1; "
+        "END $$ LANGUAGE plpgsql"
+    )
+    op.execute(
+        "UPDATE scan SET target_size = CASE "
+        "WHEN target ~ '^[0-9a-fA-F:.]+/[0-9]{1,3}$' THEN pg_temp.scan_target_size(target) "
+        "ELSE 1 END"
+    )
+    op.execute("DROP FUNCTION pg_temp.scan_target_size(text)")
+    op.execute(
+        "UPDATE scan SET duration = EXTRACT(EPOCH FROM completed_at - started_at) "
+        "WHERE status = 'COMPLETED' AND completed_at IS NOT NULL AND started_at IS NOT NULL"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_scan_tool_used_target_size_completed_at', table_name='scan')
+    op.drop_column('scan', 'time_limit')
+    op.drop_column('scan', 'expected_duration')
+    op.drop_column('scan', 'duration')
+    op.drop_column('scan', 'options_hash')
+    op.drop_column('scan', 'target_size')
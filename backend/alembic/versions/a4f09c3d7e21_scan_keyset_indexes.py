@@ -0,0 +1,30 @@
+"""Add keyset pagination indexes on scan
+
+Revision ID: a4f09c3d7e21
+Revises: 5d2a8e6f1c07
+Create Date: 2026-10-17 13:02:55.871342
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a4f09c3d7e21'
+down_revision = '5d2a8e6f1c07'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_scan_started_at_id', 'scan', ['started_at', 'id'], unique=False)
+    op.create_index('ix_scan_status_started_at_id', 'scan', ['status', 'started_at', 'id'], unique=False)
+    op.create_index('ix_scan_tool_used_started_at_id', 'scan', ['tool_used', 'started_at', 'id'], unique=False)
+    op.create_index('ix_scan_target_started_at_id', 'scan', ['target', 'started_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_scan_target_started_at_id', table_name='scan')
+    op.drop_index('ix_scan_tool_used_started_at_id', table_name='scan')
+    op.drop_index('ix_scan_status_started_at_id', table_name='scan')
+    op.drop_index('ix_scan_started_at_id', table_name='scan')
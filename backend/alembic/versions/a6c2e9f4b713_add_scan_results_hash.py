@@ -0,0 +1,29 @@
+"""Add scan results hash
+
+Revision ID: a6c2e9f4b713
+Revises: 9f3b6d2e8a41
+Create Date: 2026-10-17 17:21:05.904113
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a6c2e9f4b713'
+down_revision = '9f3b6d2e8a41'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('scan', sa.Column('results_hash', sa.String(length=64), nullable=True))
+    # ETag de los escaneos ya guardados (solo tiene que ser estable por escaneo)
+    op.execute(
+        "UPDATE scan SET results_hash = encode(sha256(convert_to(results::text, 'UTF8')), 'hex') "
+        "WHERE results IS NOT NULL"
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('scan', 'results_hash')
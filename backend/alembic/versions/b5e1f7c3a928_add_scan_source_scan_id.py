@@ -0,0 +1,30 @@
+"""Add scan source_scan_id
+
+Revision ID: b5e1f7c3a928
+Revises: d3f8a1c6e259
+Create Date: 2026-10-17 19:04:12.538201
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b5e1f7c3a928'
+down_revision = 'd3f8a1c6e259'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('scan', sa.Column('source_scan_id', sa.Integer(), nullable=True))
+    op.create_foreign_key(
+        'scan_source_scan_id_fkey', 'scan', 'scan', ['source_scan_id'], ['id'], ondelete='CASCADE'
+    )
+    op.create_index(op.f('ix_scan_source_scan_id'), 'scan', ['source_scan_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_scan_source_scan_id'), table_name='scan')
+    op.drop_constraint('scan_source_scan_id_fkey', 'scan', type_='foreignkey')
+    op.drop_column('scan', 'source_scan_id')
@@ -0,0 +1,26 @@
+"""Add scan cache_key
+
+Revision ID: c8b3e1d5f612
+Revises: a4f09c3d7e21
+Create Date: 2026-10-17 14:10:33.295716
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c8b3e1d5f612'
+down_revision = 'a4f09c3d7e21'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('scan', sa.Column('cache_key', sa.String(length=64), nullable=True))
+    op.create_index('ix_scan_cache_key_started_at', 'scan', ['cache_key', 'started_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_scan_cache_key_started_at', table_name='scan')
+    op.drop_column('scan', 'cache_key')
@@ -0,0 +1,27 @@
+"""Add scanfinding (scan_id, id) index
+
+Revision ID: d3f8a1c6e259
+Revises: a6c2e9f4b713
+Create Date: 2026-10-17 17:58:40.216457
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd3f8a1c6e259'
+down_revision = 'a6c2e9f4b713'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Cubre también las búsquedas por scan_id: sustituye al índice simple
+    op.create_index('ix_scanfinding_scan_id_id', 'scanfinding', ['scan_id', 'id'], unique=False)
+    op.drop_index('ix_scanfinding_scan_id', table_name='scanfinding')
+
+
+def downgrade() -> None:
+    op.create_index('ix_scanfinding_scan_id', 'scanfinding', ['scan_id'], unique=False)
+    op.drop_index('ix_scanfinding_scan_id_id', table_name='scanfinding')
@@ -0,0 +1,37 @@
+"""Add PARTIAL scan status
+
+Revision ID: e2a7c4b9d318
+Revises: c8b3e1d5f612
+Create Date: 2026-10-17 15:02:47.518390
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e2a7c4b9d318'
+down_revision = 'c8b3e1d5f612'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # ALTER TYPE ... ADD VALUE no puede usarse en la misma transacción que lo crea
+    with op.get_context().autocommit_block():
+        op.execute("ALTER TYPE scanstatus ADD VALUE IF NOT EXISTS 'PARTIAL' AFTER 'COMPLETED'")
+
+
+def downgrade() -> None:
+    # PostgreSQL no permite quitar valores de un enum: se recrea el tipo
+    op.execute("UPDATE scan SET status = 'COMPLETED' WHERE status = 'PARTIAL'")
+    op.execute("ALTER TYPE scanstatus RENAME TO scanstatus_old")
+    op.execute(
+        "CREATE TYPE scanstatus AS ENUM "
+        "('PENDING', 'RUNNING', 'COMPLETED', 'FAILED', 'CANCELLED')"
+    )
+    op.execute(
+        "ALTER TABLE scan ALTER COLUMN status TYPE scanstatus "
+        "USING status::text::scanstatus"
+    )
+    op.execute("DROP TYPE scanstatus_old")
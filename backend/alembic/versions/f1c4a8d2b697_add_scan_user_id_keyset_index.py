@@ -0,0 +1,24 @@
+"""Add scan (user_id, started_at, id) keyset index
+
+Revision ID: f1c4a8d2b697
+Revises: b5e1f7c3a928
+Create Date: 2026-10-17 21:14:36.402917
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f1c4a8d2b697'
+down_revision = 'b5e1f7c3a928'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_scan_user_id_started_at_id', 'scan', ['user_id', 'started_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_scan_user_id_started_at_id', table_name='scan')
@@ -0,0 +1,105 @@
+"""
+Dependencias compartidas de los endpoints: usuario autenticado.
+El token y el usuario se resuelven primero contra la caché en proceso
+(app/core/auth_cache.py); solo un fallo de caché verifica el JWT o consulta
+PostgreSQL, así que el polling de estado/resultados no añade viajes a la BD.
+"""
+
+from typing import Optional
+
+from fastapi import Depends, HTTPException, Request, status
+from fastapi.security import OAuth2PasswordBearer
+from jose import JWTError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core import auth_cache, security
+from app.core.config import settings
+from app.db.session import get_db
+from app.models.user import User
+from app.schemas.user import User as UserSchema
+
+reusable_oauth2 = OAuth2PasswordBearer(
+    tokenUrl=f"{settings.API_V1_STR}/login/access-token", auto_error=False
+)
+
+credentials_exception = HTTPException(
+    status_code=status.HTTP_401_UNAUTHORIZED,
+    detail="Could not validate credentials",
+    headers={"WWW-Authenticate": "Bearer"},
+)
+
+
+def get_token(token: Optional[str] = Depends(reusable_oauth2)) -> str:
+    """Token de la cabecera `Authorization: Bearer`"""
+    if not token:
+        raise credentials_exception
+    return token
+
+
+def get_stream_token(request: Request, token: Optional[str] = Depends(reusable_oauth2)) -> str:
+    """
+    Token de la cabecera o, para EventSource (que no permite cabeceras), del
+    parámetro `access_token` de la URL. Solo para el stream SSE: en la URL el
+    token acaba en los logs de acceso y de los proxies.
+    """
+    token = token or request.query_params.get("access_token")
+    if not token:
+        raise credentials_exception
+    return token
+
+
+async def _user_from_token(token: str, db: AsyncSession) -> UserSchema:
+    """Usuario del token; con la caché caliente no verifica el JWT ni toca la BD"""
+    claims = auth_cache.get_token(token)
+    if claims is None:
+        try:
+            payload = security.decode_access_token(token)
+            claims = (int(payload["sub"]), float(payload.get("iat", 0)))
+            expires_at = float(payload["exp"])
+        except (JWTError, KeyError, TypeError, ValueError):
+            raise credentials_exception
+        auth_cache.remember_token(token, *claims, expires_at=expires_at)
+
+    user_id, issued_at = claims
+    if auth_cache.is_revoked(token, user_id, issued_at):
+        raise credentials_exception
+
+    user = auth_cache.get_user(user_id)
+    if user is None:
+        db_user = await db.get(User, user_id)
+        if db_user is None:
+            raise credentials_exception
+        user = UserSchema.model_validate(db_user)
+        auth_cache.remember_user(user)
+    return user
+
+
+async def get_current_user(
+    token: str = Depends(get_token),
+    db: AsyncSession = Depends(get_db),
+) -> UserSchema:
+    return await _user_from_token(token, db)
+
+
+def _active(user: UserSchema) -> UserSchema:
+    if not user.is_active:
+        raise HTTPException(status_code=400, detail="Inactive user")
+    return user
+
+
+def get_current_active_user(user: UserSchema = Depends(get_current_user)) -> UserSchema:
+    return _active(user)
+
+
+async def get_current_active_stream_user(
+    token: str = Depends(get_stream_token),
+    db: AsyncSession = Depends(get_db),
+) -> UserSchema:
+    """get_current_active_user que acepta también `?access_token=` (stream SSE)"""
+    return _active(await _user_from_token(token, db))
+
+
+def get_current_active_superuser(user: UserSchema = Depends(get_current_active_user)) -> UserSchema:
+    if not user.is_superuser:
+        raise HTTPException(status_code=403, detail="The user doesn't have enough privileges")
+    return user
@@ -0,0 +1,23 @@
+"""
+Endpoints de métricas operativas (pool de base de datos).
+"""
+
+from typing import Any
+
+from fastapi import APIRouter
+
+from app.db.session import pool_metrics
+from app.schemas.metrics import PoolMetricsResponse
+
+router = APIRouter()
+
+
+@router.get("/db-pool", response_model=PoolMetricsResponse)
+async def get_db_pool_metrics() -> Any:
+    """
+    Ocupación del pool de conexiones de este proceso de la API.
+    Una utilización sostenida cerca de 1 indica que hay que subir DB_POOL_SIZE
+    (o añadir procesos); muchas conexiones abiertas seguidas, que el pool se
+    está quedando corto y se abren y cierran conexiones de overflow.
+    """
+    return pool_metrics()
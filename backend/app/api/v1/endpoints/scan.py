@@ -3,60 +3,370 @@ Endpoints para ejecutar escaneos de seguridad.
 Cada endpoint crea un registro en la BD y lanza una tarea Celery.
 """
 
+import asyncio
+import base64
+import csv
+import hashlib
+import io
 import json
-from typing import Any, Optional
+import logging
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import Response, StreamingResponse
+from sqlalchemy.dialects.postgresql import JSONB, JSONPATH
+from sqlalchemy.dialects.postgresql.psycopg2 import PGDialect_psycopg2
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy import desc
+from sqlalchemy.orm import aliased, defer, load_only
+from sqlalchemy import Text, and_, bindparam, cast, desc, func, insert, or_, text, tuple_, update
 
-from app.db.session import get_db
-from app.models.scan import Scan, ScanType, ScanStatus
+from app.api import deps
+from app.core.config import settings
+from app.core.events import scan_event_broker
+from app.core.scan_read_cache import results_key, scan_read_cache, status_key
+from app.core.scanner_config import FINDINGS_EXPORT_BATCH_SIZE, SCAN_RESULTS_CACHE_CONTROL
+from app.db.session import get_db, AsyncSessionLocal
+from app.models.scan import Scan, ScanFinding, ScanType, ScanStatus, TERMINAL_STATUSES
 from app.schemas.scanner import (
     ScanRequest,
     PortScanRequest,
     VulnScanRequest,
     SSLScanRequest,
     FuzzerRequest,
+    PipelineRequest,
+    BatchScanRequest,
+    BatchScanResponse,
     ScanResponse,
     ScanStatusResponse,
     ScanResultResponse,
     ScanListResponse,
+    ScanFindingResponse,
+    ScanFindingListResponse,
+)
+from app.schemas.user import User as UserSchema
+from app.services.duration_model import estimate_duration, options_hash, size_bounds, target_size
+from app.services.scan_cache import cache_key, cache_ttl
+from app.services.sharding import split_target
+from app.services.tasks import (
+    cancel_scan_execution,
+    dispatch_scan,
+    dispatch_scans,
+    new_task_id,
 )
-from app.services.tasks import run_scan_task
 
 router = APIRouter()
 
+# Rutas de streaming para EventSource: admiten el token en la URL (?access_token=)
+stream_router = APIRouter()
+
+logger = logging.getLogger(__name__)
+
+# Tipo de escaneo de cada herramienta (lotes de POST /batch)
+TOOL_SCAN_TYPES = {
+    "subfinder": ScanType.SUBDOMAIN,
+    "amass": ScanType.SUBDOMAIN,
+    "masscan": ScanType.PORT,
+    "rustscan": ScanType.PORT,
+    "nmap": ScanType.SERVICE,
+    "httpx": ScanType.WEB,
+    "whatweb": ScanType.WEB,
+    "ffuf": ScanType.WEB,
+    "nuclei": ScanType.VULNERABILITY,
+    "testssl": ScanType.SSL,
+    "pipeline": ScanType.FULL,
+}
+
+# Intervalo de keep-alive del stream SSE (segundos)
+SSE_KEEPALIVE_SECONDS = 15
+
 
 # ─────────────────── Helpers ───────────────────
 
+async def _find_cached_scan(db: AsyncSession, key: str, tool_name: str) -> Optional[Scan]:
+    """Escaneo idéntico en curso, o completado dentro del TTL de la herramienta"""
+    ttl = cache_ttl(tool_name)
+    if ttl <= 0:
+        return None
+
+    fresh_since = datetime.now(timezone.utc) - timedelta(seconds=ttl)
+    result = await db.execute(
+        select(Scan)
+        .options(defer(Scan.results), defer(Scan.raw_output))
+        .where(
+            Scan.cache_key == key,
+            or_(
+                Scan.status.in_([ScanStatus.PENDING, ScanStatus.RUNNING]),
+                and_(Scan.status == ScanStatus.COMPLETED, Scan.completed_at >= fresh_since),
+            ),
+        )
+        .order_by(desc(Scan.started_at))
+        .limit(1)
+    )
+    return result.scalar_one_or_none()
+
+
+async def _find_cached_scans(db: AsyncSession, tools: Dict[str, str]) -> Dict[str, Scan]:
+    """
+    _find_cached_scan para varias claves (clave → herramienta) en una sola
+    consulta. Devuelve el escaneo reutilizable de cada clave que lo tenga.
+    """
+    ttls = {key: cache_ttl(tool) for key, tool in tools.items()}
+    ttls = {key: ttl for key, ttl in ttls.items() if ttl > 0}
+    if not ttls:
+        return {}
+
+    now = datetime.now(timezone.utc)
+    oldest = now - timedelta(seconds=max(ttls.values()))
+    result = await db.execute(
+        select(Scan)
+        .options(defer(Scan.results), defer(Scan.raw_output))
+        .where(
+            Scan.cache_key.in_(list(ttls)),
+            or_(
+                Scan.status.in_([ScanStatus.PENDING, ScanStatus.RUNNING]),
+                and_(Scan.status == ScanStatus.COMPLETED, Scan.completed_at >= oldest),
+            ),
+        )
+        .order_by(desc(Scan.started_at))
+    )
+
+    found: Dict[str, Scan] = {}
+    for scan in result.scalars():
+        if scan.cache_key in found:
+            continue
+        fresh_since = now - timedelta(seconds=ttls[scan.cache_key])
+        if scan.status == ScanStatus.COMPLETED and scan.completed_at < fresh_since:
+            continue
+        found[scan.cache_key] = scan
+    return found
+
+
 async def _create_and_launch_scan(
     db: AsyncSession,
+    owner_id: int,
     scan_type: ScanType,
     tool_name: str,
     target: str,
     options: dict = None,
-) -> Scan:
-    """Crea un registro de Scan y lanza la tarea Celery"""
+    use_cache: bool = True,
+) -> Tuple[Scan, bool]:
+    """
+    Crea un registro de Scan de `owner_id` y lanza la tarea Celery de la
+    herramienta. Con use_cache devuelve el escaneo idéntico reciente o en curso
+    si existe (si es de otro usuario, una fila propia que lo comparte); el
+    segundo valor indica si se reutilizó.
+    """
+    key = cache_key(tool_name, target, options)
+
+    if use_cache:
+        # Serializar peticiones con la misma clave hasta el commit,
+        # para que dos envíos simultáneos no lancen dos escaneos
+        await db.execute(select(func.pg_advisory_xact_lock(_advisory_lock_id(key))))
+        cached = await _find_cached_scan(db, key, tool_name)
+        if cached is not None:
+            if cached.user_id != owner_id:
+                cached = Scan(**_shared_row(cached, owner_id))
+                db.add(cached)
+            await db.commit()
+            return cached, True
+
+    size, digest, expected, timeout = await _predict_scan(db, tool_name, target, options)
+
+    # El id de la tarea Celery se genera antes y se guarda en la misma inserción
     scan = Scan(
+        user_id=owner_id,
         scan_type=scan_type,
         target=target,
         tool_used=tool_name,
         status=ScanStatus.PENDING,
+        cache_key=key,
+        target_size=size,
+        options_hash=digest,
+        expected_duration=expected,
+        time_limit=timeout,
+        celery_task_id=new_task_id(),
     )
     db.add(scan)
     await db.commit()
-    await db.refresh(scan)
 
-    # Lanzar tarea Celery
-    task = run_scan_task.delay(scan.id, tool_name, target, options or {})
+    # Lanzar tarea Celery (pipeline, shards o tarea única)
+    await _publish_scans(
+        db, [(scan.id, tool_name, target, options or {}, timeout, scan.celery_task_id)]
+    )
+    return scan, False
 
-    # Guardar el task_id de Celery
-    scan.celery_task_id = task.id
-    await db.commit()
 
-    return scan
+async def _publish_scans(
+    db: AsyncSession,
+    launches: List[Tuple[int, str, str, dict, Optional[int], str]],
+) -> None:
+    """
+    Publica las tareas en el broker desde un hilo, sin bloquear el event loop
+    con la latencia de Redis. Si la publicación falla, los Scan (ya guardados
+    con su task id) pasan a FAILED y se responde 503: ninguno queda pendiente
+    de una tarea que nunca se encoló.
+    """
+    try:
+        if len(launches) == 1:
+            await asyncio.to_thread(dispatch_scan, *launches[0])
+        else:
+            await asyncio.to_thread(dispatch_scans, launches)
+    except Exception as e:
+        scan_ids = [launch[0] for launch in launches]
+        logger.error(f"No se pudieron encolar los escaneos {scan_ids}: {e}")
+        await db.execute(
+            update(Scan)
+            .where(Scan.id.in_(scan_ids), Scan.status == ScanStatus.PENDING)
+            .values(
+                status=ScanStatus.FAILED,
+                error_message=f"No se pudo encolar la tarea: {e}",
+                completed_at=func.now(),
+            )
+        )
+        await db.commit()
+        await scan_read_cache.invalidate(*scan_ids)
+        raise HTTPException(
+            status_code=503,
+            detail="No se pudo encolar el escaneo; inténtalo de nuevo",
+        )
+
+
+async def _predict_scan(
+    db: AsyncSession,
+    tool_name: str,
+    target: str,
+    options: Optional[dict],
+    memo: Optional[Dict[tuple, Tuple[Optional[float], Optional[int]]]] = None,
+) -> Tuple[int, str, Optional[float], Optional[int]]:
+    """
+    (tamaño del target, hash de opciones, duración esperada, timeout) de un
+    scan nuevo según el historial de escaneos comparables. `memo` evita repetir
+    la consulta para targets de la misma clase de tamaño (lotes).
+    """
+    size = target_size(target)
+    digest = options_hash(options)
+    bucket = (tool_name, size_bounds(size), digest)
+    if memo is not None and bucket in memo:
+        expected, timeout = memo[bucket]
+    else:
+        expected, timeout = await estimate_duration(db, tool_name, size, digest)
+        if memo is not None:
+            memo[bucket] = (expected, timeout)
+
+    if len(split_target(tool_name, target)) > 1:
+        # Cada shard usa el timeout estático de la herramienta
+        timeout = None
+    return size, digest, expected, timeout
+
+
+def _shared_row(scan: Scan, owner_id: int) -> Dict[str, Any]:
+    """
+    Fila de `owner_id` que reutiliza el escaneo de otro usuario. Sin cache_key
+    (nunca es candidata de la caché): sus datos se leen de source_scan_id.
+    """
+    return {
+        "user_id": owner_id,
+        "source_scan_id": scan.id,
+        "scan_type": scan.scan_type,
+        "target": scan.target,
+        "tool_used": scan.tool_used,
+        "status": scan.status,
+        "started_at": scan.started_at,
+        "completed_at": scan.completed_at,
+        "expected_duration": scan.expected_duration,
+        "time_limit": scan.time_limit,
+    }
+
+
+def _can_read(user: UserSchema, owner_id: Optional[int]) -> bool:
+    """Cada usuario ve sus escaneos; un superusuario, todos"""
+    return user.is_superuser or owner_id == user.id
+
+
+async def _readable_scan(
+    db: AsyncSession, scan_id: int, user: UserSchema
+) -> Tuple[int, Optional[int]]:
+    """
+    (id del escaneo con los datos, propietario) de `scan_id`, o 404 si no
+    existe o es de otro usuario. Una fila compartida se lee del original.
+    """
+    row = (await db.execute(
+        select(Scan.user_id, Scan.source_scan_id).where(Scan.id == scan_id)
+    )).one_or_none()
+    if row is None or not _can_read(user, row.user_id):
+        raise HTTPException(status_code=404, detail="Escaneo no encontrado")
+    return row.source_scan_id or scan_id, row.user_id
+
+
+def _advisory_lock_id(key: str) -> int:
+    """Id de advisory lock (bigint con signo) derivado de la clave de caché"""
+    return int(key[:16], 16) - (1 << 63)
+
+
+def _scan_response(scan: Scan, reused: bool, message: str) -> ScanResponse:
+    """Response al lanzar un escaneo, o al reutilizar uno de la caché"""
+    if reused:
+        origin = scan.source_scan_id or scan.id
+        if scan.status == ScanStatus.COMPLETED:
+            message = f"Resultado reutilizado del escaneo {origin} (caché)"
+        else:
+            message = f"Escaneo idéntico {origin} en curso; se reutiliza"
+    return ScanResponse(
+        scan_id=scan.id,
+        status=scan.status.value,
+        message=message,
+        cached=reused,
+    )
+
+
+# Columnas que usa _status_response: leer el estado nunca trae results ni raw_output
+STATUS_COLUMNS = (
+    Scan.id,
+    Scan.scan_type,
+    Scan.target,
+    Scan.tool_used,
+    Scan.status,
+    Scan.started_at,
+    Scan.completed_at,
+    Scan.error_message,
+    Scan.progress,
+    Scan.progress_updated_at,
+    Scan.expected_duration,
+    Scan.time_limit,
+)
+
+
+def _status_response(scan: Scan, scan_id: Optional[int] = None) -> ScanStatusResponse:
+    """
+    Convierte un Scan en su response de estado. `scan_id` es el id pedido
+    cuando los datos vienen del escaneo original de una fila compartida.
+    """
+    return ScanStatusResponse(
+        scan_id=scan.id if scan_id is None else scan_id,
+        scan_type=scan.scan_type.value if scan.scan_type else "",
+        target=scan.target,
+        tool_used=scan.tool_used,
+        status=scan.status.value if scan.status else "",
+        started_at=scan.started_at,
+        completed_at=scan.completed_at,
+        error_message=scan.error_message,
+        progress=scan.progress or 0,
+        progress_updated_at=scan.progress_updated_at,
+        expected_duration=scan.expected_duration,
+        time_limit=scan.time_limit,
+        eta=_scan_eta(scan),
+    )
+
+
+def _scan_eta(scan: Scan) -> Optional[datetime]:
+    """Hora estimada de fin de un scan en curso (inicio + mediana histórica)"""
+    if scan.status != ScanStatus.RUNNING or not scan.expected_duration or not scan.started_at:
+        return None
+    return scan.started_at + timedelta(seconds=scan.expected_duration)
 
 
 # ─────────────── Subdomain Discovery ───────────────
@@ -70,19 +380,17 @@ async def scan_subdomains(
         description="Herramienta a usar"
     ),
     db: AsyncSession = Depends(get_db),
+    current_user: UserSchema = Depends(deps.get_current_active_user),
 ) -> Any:
     """
     Descubrimiento de subdominios.
     Herramientas: subfinder (rápido, pasivo) o amass (completo, activo+pasivo).
     """
-    scan = await _create_and_launch_scan(
-        db, ScanType.SUBDOMAIN, tool, request.target, request.options
-    )
-    return ScanResponse(
-        scan_id=scan.id,
-        status="pending",
-        message=f"Escaneo de subdominios iniciado con {tool}",
+    scan, reused = await _create_and_launch_scan(
+        db, current_user.id, ScanType.SUBDOMAIN, tool,
+        request.target, request.options, request.use_cache
     )
+    return _scan_response(scan, reused, f"Escaneo de subdominios iniciado con {tool}")
 
 
 # ──────────────── Port Scanning ────────────────
@@ -96,6 +404,7 @@ async def scan_ports(
         description="Herramienta a usar"
     ),
     db: AsyncSession = Depends(get_db),
+    current_user: UserSchema = Depends(deps.get_current_active_user),
 ) -> Any:
     """
     Escaneo de puertos.
@@ -107,14 +416,10 @@ async def scan_ports(
     if request.scan_speed:
         options["rate"] = request.scan_speed * 500  # Escalar velocidad
 
-    scan = await _create_and_launch_scan(
-        db, ScanType.PORT, tool, request.target, options
-    )
-    return ScanResponse(
-        scan_id=scan.id,
-        status="pending",
-        message=f"Escaneo de puertos iniciado con {tool}",
+    scan, reused = await _create_and_launch_scan(
+        db, current_user.id, ScanType.PORT, tool, request.target, options, request.use_cache
     )
+    return _scan_response(scan, reused, f"Escaneo de puertos iniciado con {tool}")
 
 
 # ─────────────── Service Enumeration ───────────────
@@ -128,6 +433,7 @@ async def scan_services(
         description="Tipo de escaneo Nmap"
     ),
     db: AsyncSession = Depends(get_db),
+    current_user: UserSchema = Depends(deps.get_current_active_user),
 ) -> Any:
     """
     Enumeración de servicios con Nmap.
@@ -136,14 +442,10 @@ async def scan_services(
     options = request.options or {}
     options["scan_type"] = scan_type
 
-    scan = await _create_and_launch_scan(
-        db, ScanType.SERVICE, "nmap", request.target, options
-    )
-    return ScanResponse(
-        scan_id=scan.id,
-        status="pending",
-        message=f"Escaneo de servicios iniciado con nmap ({scan_type})",
+    scan, reused = await _create_and_launch_scan(
+        db, current_user.id, ScanType.SERVICE, "nmap", request.target, options, request.use_cache
     )
+    return _scan_response(scan, reused, f"Escaneo de servicios iniciado con nmap ({scan_type})")
 
 
 # ──────────────── Web Fingerprinting ────────────────
@@ -157,19 +459,16 @@ async def scan_web(
         description="Herramienta a usar"
     ),
     db: AsyncSession = Depends(get_db),
+    current_user: UserSchema = Depends(deps.get_current_active_user),
 ) -> Any:
     """
     Detección y fingerprinting web.
     Herramientas: httpx (rápido, multi-propósito) o whatweb (detallado, CMS).
     """
-    scan = await _create_and_launch_scan(
-        db, ScanType.WEB, tool, request.target, request.options
-    )
-    return ScanResponse(
-        scan_id=scan.id,
-        status="pending",
-        message=f"Escaneo web iniciado con {tool}",
+    scan, reused = await _create_and_launch_scan(
+        db, current_user.id, ScanType.WEB, tool, request.target, request.options, request.use_cache
     )
+    return _scan_response(scan, reused, f"Escaneo web iniciado con {tool}")
 
 
 # ─────────────── Vulnerability Detection ───────────────
@@ -178,6 +477,7 @@ async def scan_web(
 async def scan_vulnerabilities(
     request: VulnScanRequest,
     db: AsyncSession = Depends(get_db),
+    current_user: UserSchema = Depends(deps.get_current_active_user),
 ) -> Any:
     """
     Detección de vulnerabilidades con Nuclei.
@@ -189,14 +489,11 @@ async def scan_vulnerabilities(
     if request.templates:
         options["templates"] = request.templates
 
-    scan = await _create_and_launch_scan(
-        db, ScanType.VULNERABILITY, "nuclei", request.target, options
-    )
-    return ScanResponse(
-        scan_id=scan.id,
-        status="pending",
-        message="Escaneo de vulnerabilidades iniciado con nuclei",
+    scan, reused = await _create_and_launch_scan(
+        db, current_user.id, ScanType.VULNERABILITY, "nuclei",
+        request.target, options, request.use_cache
     )
+    return _scan_response(scan, reused, "Escaneo de vulnerabilidades iniciado con nuclei")
 
 
 # ──────────────── SSL/TLS Audit ────────────────
@@ -205,6 +502,7 @@ async def scan_vulnerabilities(
 async def scan_ssl(
     request: SSLScanRequest,
     db: AsyncSession = Depends(get_db),
+    current_user: UserSchema = Depends(deps.get_current_active_user),
 ) -> Any:
     """
     Auditoría SSL/TLS con testssl.sh.
@@ -214,14 +512,10 @@ async def scan_ssl(
     if request.full_check:
         options["full_check"] = True
 
-    scan = await _create_and_launch_scan(
-        db, ScanType.SSL, "testssl", request.target, options
-    )
-    return ScanResponse(
-        scan_id=scan.id,
-        status="pending",
-        message="Auditoría SSL/TLS iniciada con testssl.sh",
+    scan, reused = await _create_and_launch_scan(
+        db, current_user.id, ScanType.SSL, "testssl", request.target, options, request.use_cache
     )
+    return _scan_response(scan, reused, "Auditoría SSL/TLS iniciada con testssl.sh")
 
 
 # ──────────────── Fuzzing ────────────────
@@ -230,6 +524,7 @@ async def scan_ssl(
 async def scan_fuzz(
     request: FuzzerRequest,
     db: AsyncSession = Depends(get_db),
+    current_user: UserSchema = Depends(deps.get_current_active_user),
 ) -> Any:
     """
     Fuzzing web con ffuf.
@@ -241,101 +536,765 @@ async def scan_fuzz(
     if request.extensions:
         options["extensions"] = request.extensions
 
-    scan = await _create_and_launch_scan(
-        db, ScanType.WEB, "ffuf", request.target, options
+    scan, reused = await _create_and_launch_scan(
+        db, current_user.id, ScanType.WEB, "ffuf", request.target, options, request.use_cache
     )
-    return ScanResponse(
-        scan_id=scan.id,
-        status="pending",
-        message="Fuzzing web iniciado con ffuf",
+    return _scan_response(scan, reused, "Fuzzing web iniciado con ffuf")
+
+
+# ──────────────── Full Recon Pipeline ────────────────
+
+@router.post("/full", response_model=ScanResponse)
+async def scan_full(
+    request: PipelineRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user: UserSchema = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Escaneo completo encadenado en un solo DAG:
+    subdominios → puertos → servicios (nmap) → web (httpx) → vulnerabilidades (nuclei).
+    Cada resultado pasa a la siguiente etapa en cuanto se produce.
+    """
+    options = request.options or {}
+    options.update(
+        subdomain_tool=request.subdomain_tool,
+        port_tool=request.port_tool,
+        severity=request.severity,
+        include_vulns=request.include_vulns,
+    )
+    if request.ports:
+        options["ports"] = request.ports
+
+    scan, reused = await _create_and_launch_scan(
+        db, current_user.id, ScanType.FULL, "pipeline", request.target, options, request.use_cache
+    )
+    return _scan_response(scan, reused, "Escaneo completo iniciado (pipeline de reconocimiento)")
+
+
+# ──────────────── Batch ────────────────
+
+@router.post("/batch", response_model=BatchScanResponse)
+async def scan_batch(
+    request: BatchScanRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user: UserSchema = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Lanza varios escaneos en una sola petición: todos los Scan se crean (con
+    su task id) en una inserción masiva y se encolan como un único group de Celery.
+    Devuelve un scan_id por elemento, en el orden recibido.
+    """
+    items = request.scans
+    keys = [cache_key(item.tool, item.target, item.options) for item in items]
+
+    reused: Dict[str, Scan] = {}
+    if request.use_cache:
+        # Mismos advisory locks que _create_and_launch_scan, tomados en orden
+        # ascendente para que dos lotes solapados no se bloqueen mutuamente
+        lock_ids = sorted({_advisory_lock_id(key) for key in keys})
+        await db.execute(
+            text("SELECT pg_advisory_xact_lock(k) FROM unnest(CAST(:ids AS bigint[])) AS k"),
+            {"ids": lock_ids},
+        )
+        reused = await _find_cached_scans(
+            db, {key: item.tool for key, item in zip(keys, items)}
+        )
+        # Los escaneos de otros usuarios se comparten con una fila propia
+        for key, scan in list(reused.items()):
+            if scan.user_id != current_user.id:
+                reused[key] = Scan(**_shared_row(scan, current_user.id))
+                db.add(reused[key])
+
+    # Filas nuevas; con caché, los elementos repetidos del lote comparten escaneo
+    rows: List[Dict[str, Any]] = []
+    launches: List[Tuple[str, str, dict, Optional[int], str]] = []
+    row_of_item: List[Optional[int]] = []
+    row_of_key: Dict[str, int] = {}
+    memo: Dict[tuple, Tuple[Optional[float], Optional[int]]] = {}
+    for item, key in zip(items, keys):
+        if key in reused:
+            row_of_item.append(None)
+            continue
+        if request.use_cache and key in row_of_key:
+            row_of_item.append(row_of_key[key])
+            continue
+
+        size, digest, expected, timeout = await _predict_scan(
+            db, item.tool, item.target, item.options, memo
+        )
+        row_of_key[key] = len(rows)
+        row_of_item.append(len(rows))
+        task_id = new_task_id()
+        rows.append({
+            "user_id": current_user.id,
+            "scan_type": TOOL_SCAN_TYPES[item.tool],
+            "target": item.target,
+            "tool_used": item.tool,
+            "status": ScanStatus.PENDING,
+            "cache_key": key,
+            "target_size": size,
+            "options_hash": digest,
+            "expected_duration": expected,
+            "time_limit": timeout,
+            "celery_task_id": task_id,
+        })
+        launches.append((item.tool, item.target, item.options or {}, timeout, task_id))
+
+    scan_ids: List[int] = []
+    if rows:
+        result = await db.execute(
+            insert(Scan).returning(Scan.id, sort_by_parameter_order=True), rows
+        )
+        scan_ids = list(result.scalars())
+    await db.commit()
+
+    if rows:
+        await _publish_scans(db, [
+            (scan_id, *launch) for scan_id, launch in zip(scan_ids, launches)
+        ])
+
+    responses = []
+    first_use = set()
+    for item, key, row in zip(items, keys, row_of_item):
+        if row is None:
+            responses.append(_scan_response(reused[key], True, ""))
+        elif row in first_use:
+            responses.append(ScanResponse(
+                scan_id=scan_ids[row],
+                status=ScanStatus.PENDING.value,
+                message=f"Escaneo idéntico {scan_ids[row]} en el mismo lote; se reutiliza",
+                cached=True,
+            ))
+        else:
+            first_use.add(row)
+            responses.append(ScanResponse(
+                scan_id=scan_ids[row],
+                status=ScanStatus.PENDING.value,
+                message=f"Escaneo iniciado con {item.tool}",
+            ))
+
+    return BatchScanResponse(
+        scans=responses,
+        created=len(rows),
+        cached=len(items) - len(rows),
     )
 
 
 # ──────────────── Status & Results ────────────────
 
+def _json_response(payload: bytes, headers: Optional[Dict[str, str]] = None) -> Response:
+    """Response con un JSON ya serializado (el mismo que guarda la caché de lectura)"""
+    return Response(content=payload, media_type="application/json", headers=headers)
+
+
 @router.get("/{scan_id}", response_model=ScanStatusResponse)
 async def get_scan_status(
     scan_id: int,
     db: AsyncSession = Depends(get_db),
+    current_user: UserSchema = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Obtiene el estado actual de un escaneo.
+    Se sirve desde la caché de lectura en Redis; solo un fallo de caché
+    consulta la BD, y únicamente las columnas de estado.
+    """
+    key = status_key(scan_id)
+    cached = await _read_cached(key, current_user)
+    if cached is not None:
+        return _json_response(cached[1])
+
+    data_id, owner = await _readable_scan(db, scan_id, current_user)
+    result = await db.execute(
+        select(Scan).options(load_only(*STATUS_COLUMNS)).where(Scan.id == data_id)
+    )
+    scan = result.scalar_one_or_none()
+
+    if not scan:
+        raise HTTPException(status_code=404, detail="Escaneo no encontrado")
+
+    payload = _status_response(scan, scan_id).model_dump_json().encode()
+    await scan_read_cache.store(
+        key, _pack_cached(owner, {}, payload), terminal=scan.status in TERMINAL_STATUSES
+    )
+    return _json_response(payload)
+
+
+def _field_keys(fields: str) -> list:
+    """Claves de primer nivel pedidas en el parámetro fields"""
+    return [k.strip() for k in fields.split(",") if k.strip()]
+
+
+@router.delete("/{scan_id}", response_model=ScanStatusResponse)
+async def cancel_scan(
+    scan_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: UserSchema = Depends(deps.get_current_active_user),
 ) -> Any:
-    """Obtiene el estado actual de un escaneo"""
-    result = await db.execute(select(Scan).where(Scan.id == scan_id))
+    """
+    Cancela un escaneo pendiente o en ejecución del usuario (un superusuario
+    puede cancelar cualquiera; para el resto, los ajenos dan 404).
+    Revoca la tarea Celery y el worker termina el árbol de procesos de la
+    herramienta (SIGTERM y después SIGKILL) en unos segundos.
+    Los hallazgos guardados hasta ese momento se conservan.
+    Una fila compartida solo se desvincula: el escaneo original sigue para su dueño.
+    """
+    active = [ScanStatus.PENDING, ScanStatus.RUNNING]
+    owned = [] if current_user.is_superuser else [Scan.user_id == current_user.id]
+    data_id, _ = await _readable_scan(db, scan_id, current_user)
+
+    if data_id != scan_id:
+        source = aliased(Scan)
+        source_active = (
+            select(source.id).where(source.id == data_id, source.status.in_(active)).exists()
+        )
+        result = await db.execute(
+            update(Scan)
+            .where(Scan.id == scan_id, source_active, *owned)
+            .values(status=ScanStatus.CANCELLED, completed_at=func.now(), source_scan_id=None)
+            .returning(Scan.id)
+        )
+    else:
+        result = await db.execute(
+            update(Scan)
+            .where(Scan.id == scan_id, Scan.status.in_(active), *owned)
+            .values(status=ScanStatus.CANCELLED, completed_at=func.now())
+            .returning(Scan.id)
+        )
+    cancelled = result.scalar_one_or_none() is not None
+    await db.commit()
+
+    result = await db.execute(
+        select(Scan)
+        .options(load_only(*STATUS_COLUMNS))
+        .where(Scan.id == (scan_id if cancelled else data_id))
+    )
     scan = result.scalar_one_or_none()
 
     if not scan:
         raise HTTPException(status_code=404, detail="Escaneo no encontrado")
+    if not cancelled:
+        raise HTTPException(
+            status_code=409,
+            detail=f"El escaneo ya terminó con estado {scan.status.value}",
+        )
+
+    if data_id != scan_id:
+        await scan_read_cache.invalidate(scan_id)
+    else:
+        # Revocar la tarea y avisar al worker (Redis/broker: fuera del event loop)
+        await asyncio.to_thread(cancel_scan_execution, scan.id, scan.celery_task_id)
 
-    return scan
+    return _status_response(scan)
+
+
+def _results_projection(fields: Optional[str], path: Optional[str]):
+    """
+    Expresión SQL que proyecta Scan.results en la BD:
+    solo las claves pedidas (fields) o el resultado de un jsonpath (path).
+    """
+    if path:
+        return func.jsonb_path_query_array(
+            Scan.results, cast(path, JSONPATH), type_=JSONB
+        )
+    if fields:
+        args = []
+        for key in _field_keys(fields):
+            args += [cast(key, Text), Scan.results[key]]
+        return func.jsonb_build_object(*args, type_=JSONB)
+    return Scan.results
+
+
+def _results_cache_headers(
+    status: ScanStatus,
+    results_hash: Optional[str],
+    completed_at: Optional[datetime],
+    fields: Optional[str],
+    path: Optional[str],
+) -> Dict[str, str]:
+    """
+    Cabeceras de caché HTTP de /results. Un escaneo terminado con resultados
+    es inmutable: ETag fuerte (hash guardado + proyección pedida) y
+    SCAN_RESULTS_CACHE_CONTROL. El resto se revalida siempre.
+    """
+    if status not in TERMINAL_STATUSES or not results_hash:
+        return {"Cache-Control": "no-cache"}
+
+    tag = results_hash
+    if fields or path:
+        projection = f"{fields or ''}\0{path or ''}".encode("utf-8")
+        tag += "-" + hashlib.sha256(projection).hexdigest()[:16]
+    headers = {"ETag": f'"{tag}"', "Cache-Control": SCAN_RESULTS_CACHE_CONTROL}
+    if completed_at is not None:
+        headers["Last-Modified"] = format_datetime(completed_at.astimezone(timezone.utc), usegmt=True)
+    return headers
+
+
+def _not_modified(
+    headers: Dict[str, str], if_none_match: Optional[str], if_modified_since: Optional[str]
+) -> bool:
+    """Evalúa la petición condicional (If-None-Match tiene prioridad, RFC 9110)"""
+    etag = headers.get("ETag")
+    if etag is None:
+        return False
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        tags = [t.strip().removeprefix("W/") for t in if_none_match.split(",")]
+        return etag in tags
+    if if_modified_since and "Last-Modified" in headers:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            return False
+        return parsedate_to_datetime(headers["Last-Modified"]) <= since
+    return False
+
+
+def _pack_cached(owner: Optional[int], headers: Dict[str, str], payload: bytes) -> bytes:
+    """
+    Entrada de la caché de lectura: propietario y cabeceras HTTP en la primera
+    línea y el JSON. El propietario permite comprobar el acceso sin ir a la BD.
+    """
+    return json.dumps({"owner": owner, "headers": headers}).encode() + b"\n" + payload
+
+
+async def _read_cached(key: str, user: UserSchema) -> Optional[Tuple[Dict[str, str], bytes]]:
+    """(cabeceras, JSON) de la caché de lectura, o None; 404 si es de otro usuario"""
+    entry = await scan_read_cache.get(key)
+    if entry is None:
+        return None
+    # El JSON serializado no contiene saltos de línea literales
+    meta, _, payload = entry.partition(b"\n")
+    try:
+        meta = json.loads(meta)
+    except ValueError:
+        return None
+    if not isinstance(meta, dict) or "owner" not in meta:
+        # Entrada de una versión anterior, sin propietario: se trata como fallo
+        return None
+    if not _can_read(user, meta["owner"]):
+        raise HTTPException(status_code=404, detail="Escaneo no encontrado")
+    return meta.get("headers") or {}, payload
 
 
 @router.get("/{scan_id}/results", response_model=ScanResultResponse)
 async def get_scan_results(
+    scan_id: int,
+    fields: Optional[str] = Query(
+        default=None,
+        max_length=500,
+        description="Claves de primer nivel separadas por coma (ej: by_severity,count)",
+    ),
+    path: Optional[str] = Query(
+        default=None,
+        max_length=1000,
+        description='Filtro jsonpath (ej: $.hosts[*].ports[*] ? (@.state == "open"))',
+    ),
+    if_none_match: Optional[str] = Header(default=None),
+    if_modified_since: Optional[str] = Header(default=None),
+    db: AsyncSession = Depends(get_db),
+    current_user: UserSchema = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Obtiene los resultados de un escaneo.
+    `fields` y `path` se evalúan en PostgreSQL, así solo viaja la parte pedida.
+    Mientras el escaneo no termina no hay agregado parcial: la respuesta lleva
+    `findings_count` y `findings_url` (/findings?after=, paginación por keyset).
+    La respuesta completa (sin fields ni path) se sirve desde la caché de lectura.
+    Un escaneo terminado lleva ETag/Last-Modified: con If-None-Match o
+    If-Modified-Since vigentes se responde 304 sin leer la columna results.
+    """
+    if fields and path:
+        raise HTTPException(status_code=400, detail="Usa fields o path, no ambos")
+
+    cacheable = not fields and not path
+    key = results_key(scan_id)
+    if cacheable:
+        cached = await _read_cached(key, current_user)
+        if cached is not None:
+            headers, payload = cached
+            if _not_modified(headers, if_none_match, if_modified_since):
+                return Response(status_code=304, headers=headers)
+            return _json_response(payload, headers)
+
+    data_id, owner = await _readable_scan(db, scan_id, current_user)
+    if if_none_match is not None or if_modified_since:
+        # Revalidación: solo el estado y el hash, nunca el documento de resultados
+        row = (await db.execute(
+            select(Scan.status, Scan.results_hash, Scan.completed_at).where(Scan.id == data_id)
+        )).one_or_none()
+        if not row:
+            raise HTTPException(status_code=404, detail="Escaneo no encontrado")
+        headers = _results_cache_headers(*row, fields, path)
+        if _not_modified(headers, if_none_match, if_modified_since):
+            return Response(status_code=304, headers=headers)
+
+    try:
+        result = await db.execute(
+            select(Scan, _results_projection(fields, path))
+            .options(load_only(*STATUS_COLUMNS, Scan.results_hash))
+            .where(Scan.id == data_id)
+        )
+    except DBAPIError as e:
+        await db.rollback()
+        raise HTTPException(status_code=400, detail=f"Filtro jsonpath inválido: {e.orig}")
+    row = result.one_or_none()
+
+    if not row:
+        raise HTTPException(status_code=404, detail="Escaneo no encontrado")
+    scan, results = row
+
+    progress = {}
+    if scan.status not in TERMINAL_STATUSES:
+        # Sin re-agregar los hallazgos en cada poll: cuántos hay y dónde leerlos
+        progress = {
+            "findings_count": scan.progress or 0,
+            "findings_url": f"{settings.API_V1_STR}/scan/{scan_id}/findings?after=0",
+        }
+
+    response = ScanResultResponse(
+        **_status_response(scan, scan_id).model_dump(),
+        results=results,
+        **progress,
+    )
+    headers = _results_cache_headers(scan.status, scan.results_hash, scan.completed_at, fields, path)
+    payload = response.model_dump_json().encode()
+    if cacheable:
+        await scan_read_cache.store(
+            key, _pack_cached(owner, headers, payload), terminal=scan.status in TERMINAL_STATUSES
+        )
+    return _json_response(payload, headers)
+
+
+def _sse(event: str, data: Any) -> str:
+    """Formatea un mensaje Server-Sent Events"""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+async def _scan_event_stream(scan_id: int, data_id: int) -> AsyncIterator[str]:
+    """
+    Envía el estado actual del escaneo y después los eventos publicados por
+    el worker, hasta que el escaneo llega a un estado final. `data_id` es el
+    escaneo que publica los eventos (el original, en una fila compartida).
+    La suscripción se abre aquí, al empezar a enviar la respuesta: si el
+    cliente se desconecta antes, el generador no arranca y no queda colgada.
+    """
+    # Suscribirse antes de leer el estado inicial para no perder transiciones
+    queue = await scan_event_broker.subscribe(data_id)
+    try:
+        # Una sola consulta a la BD por cliente: el estado inicial
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(Scan).options(load_only(*STATUS_COLUMNS)).where(Scan.id == data_id)
+            )
+            scan = result.scalar_one_or_none()
+        if scan is None:
+            return
+
+        yield _sse("status", _status_response(scan, scan_id).model_dump(mode="json"))
+        if scan.status in TERMINAL_STATUSES:
+            return
+
+        while True:
+            try:
+                event = await asyncio.wait_for(queue.get(), timeout=SSE_KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+
+            if data_id != scan_id:
+                event = {**event, "scan_id": scan_id}
+            yield _sse(event.get("event", "message"), event)
+            if event.get("event") == "status" and event.get("status") in {
+                s.value for s in TERMINAL_STATUSES
+            }:
+                return
+    finally:
+        await scan_event_broker.unsubscribe(data_id, queue)
+
+
+@stream_router.get("/{scan_id}/events")
+async def stream_scan_events(
     scan_id: int,
     db: AsyncSession = Depends(get_db),
+    current_user: UserSchema = Depends(deps.get_current_active_stream_user),
 ) -> Any:
-    """Obtiene los resultados completos de un escaneo"""
-    result = await db.execute(select(Scan).where(Scan.id == scan_id))
+    """
+    Stream SSE con los cambios de estado y lotes de hallazgos de un escaneo.
+    Sustituye al polling de GET /scan/{scan_id}.
+    """
+    data_id, _ = await _readable_scan(db, scan_id, current_user)
+    return StreamingResponse(
+        _scan_event_stream(scan_id, data_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/{scan_id}/findings", response_model=ScanFindingListResponse)
+async def get_scan_findings(
+    scan_id: int,
+    after: int = Query(default=0, ge=0, description="Último id de hallazgo ya recibido"),
+    limit: int = Query(default=500, ge=1, le=5000),
+    db: AsyncSession = Depends(get_db),
+    current_user: UserSchema = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Hallazgos guardados de un escaneo, en orden de llegada.
+    Permite consultar de forma incremental un escaneo en ejecución.
+    """
+    data_id, _ = await _readable_scan(db, scan_id, current_user)
+    result = await db.execute(
+        select(Scan).options(load_only(*STATUS_COLUMNS)).where(Scan.id == data_id)
+    )
     scan = result.scalar_one_or_none()
 
     if not scan:
         raise HTTPException(status_code=404, detail="Escaneo no encontrado")
 
-    # Parsear JSON de resultados
-    results_dict = None
-    if scan.results:
-        try:
-            results_dict = json.loads(scan.results)
-        except json.JSONDecodeError:
-            results_dict = {"raw": scan.results}
+    result = await db.execute(
+        select(ScanFinding)
+        .where(ScanFinding.scan_id == data_id, ScanFinding.id > after)
+        .order_by(ScanFinding.id)
+        .limit(limit)
+    )
+    findings = result.scalars().all()
 
-    return ScanResultResponse(
-        scan_id=scan.id,
-        scan_type=scan.scan_type.value if scan.scan_type else "",
-        target=scan.target,
-        tool_used=scan.tool_used,
+    return ScanFindingListResponse(
+        scan_id=scan_id,
         status=scan.status.value if scan.status else "",
-        started_at=scan.started_at,
-        completed_at=scan.completed_at,
-        error_message=scan.error_message,
-        results=results_dict,
+        progress=scan.progress or 0,
+        findings=[
+            ScanFindingResponse(
+                id=f.id,
+                tool=f.tool,
+                data=f.data,
+                created_at=f.created_at,
+            )
+            for f in findings
+        ],
+        next_after=findings[-1].id if findings else after,
+    )
+
+
+# ──────────────── Export ────────────────
+
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+# Columnas fijas del CSV; después, una por cada clave de `data`
+EXPORT_CSV_COLUMNS = ["id", "tool", "created_at"]
+
+# Primeros caracteres que Excel/LibreOffice/Sheets interpretan como fórmula
+# (inyección CSV): esas celdas se exportan precedidas de una comilla simple
+CSV_FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def _findings_stream_query(scan_id: int):
+    """Hallazgos de un escaneo en orden de llegada (índice scan_id, id)"""
+    return (
+        select(ScanFinding.id, ScanFinding.tool, ScanFinding.created_at, ScanFinding.data)
+        .where(ScanFinding.scan_id == scan_id)
+        .order_by(ScanFinding.id)
+        .execution_options(yield_per=FINDINGS_EXPORT_BATCH_SIZE)
+    )
+
+
+def _csv_cell(value: Any) -> Any:
+    """
+    Valor de una celda: escalares tal cual, listas y objetos como JSON.
+    El texto que empieza como una fórmula se neutraliza con una comilla simple:
+    los datos salen de respuestas de los objetivos escaneados.
+    """
+    if value is None:
+        return ""
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, separators=(",", ":"), default=str)
+    if isinstance(value, str) and value.startswith(CSV_FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+async def _export_findings(scan_id: int, export_format: str) -> AsyncIterator[str]:
+    """
+    Recorre los hallazgos con un cursor de servidor y emite un bloque por cada
+    lote de FINDINGS_EXPORT_BATCH_SIZE filas: la memoria no depende del tamaño
+    del escaneo. Usa su propia sesión (la de la petición se cierra antes de
+    que empiece el stream).
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    async with AsyncSessionLocal() as db:
+        keys: List[str] = []
+        if export_format == "csv":
+            # Cabecera: claves de `data` de todos los hallazgos (agregadas en la BD)
+            result = await db.execute(
+                select(func.jsonb_object_keys(ScanFinding.data).label("key"))
+                .where(
+                    ScanFinding.scan_id == scan_id,
+                    func.jsonb_typeof(ScanFinding.data) == "object",
+                )
+                .distinct()
+                .order_by("key")
+            )
+            keys = [k for k in result.scalars() if k not in EXPORT_CSV_COLUMNS]
+            writer.writerow(EXPORT_CSV_COLUMNS + [_csv_cell(key) for key in keys])
+            yield buffer.getvalue()
+
+        result = await db.stream(_findings_stream_query(scan_id))
+        async for rows in result.partitions():
+            if export_format == "ndjson":
+                yield "".join(
+                    json.dumps(
+                        {
+                            "id": id_,
+                            "tool": tool,
+                            "created_at": created_at.isoformat() if created_at else None,
+                            "data": data,
+                        },
+                        separators=(",", ":"),
+                        default=str,
+                    ) + "\n"
+                    for id_, tool, created_at, data in rows
+                )
+                continue
+
+            buffer.seek(0)
+            buffer.truncate()
+            for id_, tool, created_at, data in rows:
+                data = data if isinstance(data, dict) else {}
+                writer.writerow(
+                    [id_, _csv_cell(tool), created_at.isoformat() if created_at else ""]
+                    + [_csv_cell(data.get(key)) for key in keys]
+                )
+            yield buffer.getvalue()
+
+
+@router.get("/{scan_id}/export")
+async def export_scan_findings(
+    scan_id: int,
+    export_format: str = Query(
+        default="ndjson",
+        alias="format",
+        pattern="^(ndjson|csv)$",
+        description="ndjson (un hallazgo JSON por línea) o csv (una columna por clave)",
+    ),
+    db: AsyncSession = Depends(get_db),
+    current_user: UserSchema = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Exporta los hallazgos de un escaneo fila a fila en streaming, sin
+    construir el documento de resultados: sirve para escaneos de millones de
+    registros. En un escaneo en curso exporta lo guardado hasta ese momento.
+    """
+    data_id, _ = await _readable_scan(db, scan_id, current_user)
+    filename = f"scan-{scan_id}-findings.{export_format}"
+    return StreamingResponse(
+        _export_findings(data_id, export_format),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
     )
 
 
+def _encode_cursor(scan: Scan) -> str:
+    """Cursor opaco con la clave de orden (started_at, id) del último escaneo"""
+    raw = json.dumps({"s": scan.started_at.isoformat(), "i": scan.id})
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(data["s"]), int(data["i"])
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Cursor inválido")
+
+
+async def _estimate_count(db: AsyncSession, query) -> int:
+    """
+    Estimación del planner (EXPLAIN) de las filas que devuelve una consulta.
+    Los valores de los filtros viajan como parámetros ligados (nunca se
+    incrustan en el SQL): se compila con marcadores `:nombre` para text(), con
+    el compilador de psycopg2, que no les añade casts `::TIPO`.
+    """
+    compiled = query.compile(dialect=PGDialect_psycopg2(paramstyle="named"))
+    params = [
+        bindparam(name, compiled.params[name], type_=bind.type)
+        for bind, name in compiled.bind_names.items()
+    ]
+    result = await db.execute(text(f"EXPLAIN (FORMAT JSON) {compiled}").bindparams(*params))
+    plan = result.scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
 @router.get("/", response_model=ScanListResponse)
 async def list_scans(
-    skip: int = Query(default=0, ge=0),
     limit: int = Query(default=20, ge=1, le=100),
-    status: Optional[str] = Query(default=None),
+    cursor: Optional[str] = Query(
+        default=None, description="next_cursor de la página anterior"
+    ),
+    skip: int = Query(
+        default=0, ge=0, description="Obsoleto: usar cursor (se ignora si hay cursor)"
+    ),
+    status: Optional[ScanStatus] = Query(default=None),
+    tool: Optional[str] = Query(default=None, max_length=100),
+    target: Optional[str] = Query(default=None, max_length=500),
+    count_mode: str = Query(
+        default="exact",
+        enum=["exact", "approximate", "none"],
+        description="exact: COUNT(*); approximate: estimación del planner; none: sin total",
+    ),
     db: AsyncSession = Depends(get_db),
+    current_user: UserSchema = Depends(deps.get_current_active_user),
 ) -> Any:
-    """Lista todos los escaneos con paginación y filtro"""
-    query = select(Scan).order_by(desc(Scan.started_at))
-
+    """
+    Lista los escaneos del usuario (todos si es superusuario) del más reciente
+    al más antiguo. Paginación por cursor (keyset) sobre (started_at, id): cada
+    página cuesta lo mismo sin importar cuántas se hayan recorrido.
+    """
+    filters = []
+    if not current_user.is_superuser:
+        filters.append(Scan.user_id == current_user.id)
     if status:
-        query = query.where(Scan.status == status)
+        filters.append(Scan.status == status)
+    if tool:
+        filters.append(Scan.tool_used == tool)
+    if target:
+        filters.append(Scan.target == target)
 
-    # Contar total
-    from sqlalchemy import func
-    count_result = await db.execute(select(func.count(Scan.id)))
-    total = count_result.scalar()
+    # Contar total (con los mismos filtros que la página)
+    total = None
+    if count_mode == "exact":
+        total = (await db.execute(
+            select(func.count()).select_from(Scan).where(*filters)
+        )).scalar()
+    elif count_mode == "approximate":
+        total = await _estimate_count(db, select(Scan.id).where(*filters))
 
-    # Obtener página
-    result = await db.execute(query.offset(skip).limit(limit))
+    query = (
+        select(Scan)
+        .options(defer(Scan.results), defer(Scan.raw_output))
+        .where(*filters)
+        .order_by(desc(Scan.started_at), desc(Scan.id))
+    )
+    if cursor:
+        started_at, scan_id = _decode_cursor(cursor)
+        query = query.where(tuple_(Scan.started_at, Scan.id) < (started_at, scan_id))
+    elif skip:
+        query = query.offset(skip)
+
+    # Obtener página (una fila extra indica si hay más)
+    result = await db.execute(query.limit(limit + 1))
     scans = result.scalars().all()
+    has_more = len(scans) > limit
+    scans = scans[:limit]
 
     return ScanListResponse(
         total=total,
-        scans=[
-            ScanStatusResponse(
-                scan_id=s.id,
-                scan_type=s.scan_type.value if s.scan_type else "",
-                target=s.target,
-                tool_used=s.tool_used,
-                status=s.status.value if s.status else "",
-                started_at=s.started_at,
-                completed_at=s.completed_at,
-                error_message=s.error_message,
-            )
-            for s in scans
-        ],
+        scans=[_status_response(s) for s in scans],
+        next_cursor=_encode_cursor(scans[-1]) if has_more else None,
     )
@@ -5,8 +5,9 @@ from fastapi.encoders import jsonable_encoder
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
+from app.api import deps
 from app.core.config import settings
-from app.core.security import get_password_hash
+from app.core.security import get_password_hash_async
 from app.db.session import get_db
 from app.models.user import User
 from app.schemas.user import User as UserSchema, UserCreate
@@ -26,6 +27,15 @@ async def read_users(
     users = result.scalars().all()
     return users
 
+@router.get("/me", response_model=UserSchema)
+async def read_user_me(
+    current_user: UserSchema = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Get current user.
+    """
+    return current_user
+
 @router.post("/", response_model=UserSchema)
 async def create_user(
     *,
@@ -45,7 +55,7 @@ async def create_user(
     
     user = User(
         email=user_in.email,
-        hashed_password=get_password_hash(user_in.password),
+        hashed_password=await get_password_hash_async(user_in.password),
         is_active=user_in.is_active,
         is_superuser=user_in.is_superuser,
     )
@@ -1,9 +1,28 @@
 
-from fastapi import APIRouter
-from app.api.v1.endpoints import auth, users, scan
+from fastapi import APIRouter, Depends
+
+from app.api import deps
+from app.api.v1.endpoints import auth, users, scan, metrics
 
 api_router = APIRouter()
 api_router.include_router(auth.router, tags=["login"])
 api_router.include_router(users.router, prefix="/users", tags=["users"])
-api_router.include_router(scan.router, prefix="/scan", tags=["scan"])
+api_router.include_router(
+    scan.router,
+    prefix="/scan",
+    tags=["scan"],
+    dependencies=[Depends(deps.get_current_active_user)],
+)
+api_router.include_router(
+    scan.stream_router,
+    prefix="/scan",
+    tags=["scan"],
+    dependencies=[Depends(deps.get_current_active_stream_user)],
+)
+api_router.include_router(
+    metrics.router,
+    prefix="/metrics",
+    tags=["metrics"],
+    dependencies=[Depends(deps.get_current_active_superuser)],
+)
 
@@ -0,0 +1,132 @@
+"""
+Backfill de las tablas normalizadas de hallazgos.
+Indexa los escaneos completados antes de que existieran las tablas
+(findings_indexed = false) a partir de sus ScanFinding o de Scan.results.
+
+Uso (desde backend/):
+    python -m app.commands.backfill_findings              # Todos los pendientes
+    python -m app.commands.backfill_findings --limit 100  # Solo 100 escaneos
+    python -m app.commands.backfill_findings --dry-run    # Contar sin escribir
+"""
+
+import argparse
+import logging
+import sys
+from typing import Any, Dict, Iterator, List, Tuple
+
+from sqlalchemy import select, update
+
+from app.db.sync_session import SyncSession
+from app.models.scan import Scan, ScanFinding, ScanStatus
+from app.services.normalizer import insert_normalized, insert_records
+from app.services.tasks import _get_scanner, SCANNER_MAP
+
+logger = logging.getLogger("backfill_findings")
+
+
+def _records_from_results(scan: Scan) -> Iterator[Tuple[str, List[Dict[str, Any]]]]:
+    """Extrae (herramienta, registros) del JSON de resultados de un escaneo"""
+    results = scan.results or {}
+    if not isinstance(results, dict):
+        logger.warning(f"[Scan {scan.id}] results no es un objeto JSON, se omite")
+        return
+
+    if scan.tool_used == "pipeline":
+        stages = results.get("stages", {})
+    else:
+        stages = {scan.tool_used: results}
+
+    for tool, result in stages.items():
+        if tool in SCANNER_MAP and isinstance(result, dict):
+            yield tool, _get_scanner(tool).result_records(result)
+
+
+def _chunks(records: List[Dict[str, Any]], size: int) -> Iterator[List[Dict[str, Any]]]:
+    for i in range(0, len(records), size):
+        yield records[i:i + size]
+
+
+def backfill_scan(session, scan: Scan, batch_size: int) -> int:
+    """Indexa un escaneo y devuelve el número de registros procesados"""
+    has_findings = session.execute(
+        select(ScanFinding.id).where(ScanFinding.scan_id == scan.id).limit(1)
+    ).first() is not None
+
+    total = 0
+    if has_findings:
+        # Los registros crudos ya están guardados: solo faltan las filas normalizadas
+        rows = session.execute(
+            select(ScanFinding.tool, ScanFinding.data)
+            .where(ScanFinding.scan_id == scan.id)
+            .order_by(ScanFinding.id)
+            .execution_options(yield_per=batch_size)
+        )
+        for partition in rows.partitions():
+            by_tool: Dict[str, List[Dict[str, Any]]] = {}
+            for tool, data in partition:
+                by_tool.setdefault(tool, []).append(data)
+            for tool, records in by_tool.items():
+                insert_normalized(session, scan.id, tool, records)
+                total += len(records)
+    else:
+        for tool, records in _records_from_results(scan):
+            for chunk in _chunks(records, batch_size):
+                total += insert_records(session, scan.id, tool, chunk)
+
+    session.execute(
+        update(Scan).where(Scan.id == scan.id).values(findings_indexed=True)
+    )
+    return total
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Backfill de hallazgos normalizados")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Filas por INSERT")
+    parser.add_argument("--limit", type=int, default=None, help="Máximo de escaneos a procesar")
+    parser.add_argument("--dry-run", action="store_true", help="No guardar cambios")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    session = SyncSession()
+    try:
+        query = (
+            select(Scan.id)
+            .where(Scan.status == ScanStatus.COMPLETED, Scan.findings_indexed.is_(False))
+            .order_by(Scan.id)
+        )
+        if args.limit:
+            query = query.limit(args.limit)
+        scan_ids = session.execute(query).scalars().all()
+        logger.info(f"{len(scan_ids)} escaneos pendientes de indexar")
+
+        processed = 0
+        for scan_id in scan_ids:
+            scan = session.get(Scan, scan_id)
+            try:
+                count = backfill_scan(session, scan, args.batch_size)
+            except Exception as e:
+                session.rollback()
+                logger.error(f"[Scan {scan_id}] Error: {e}")
+                continue
+
+            # Una transacción por escaneo: un fallo no deshace el resto
+            if args.dry_run:
+                session.rollback()
+            else:
+                session.commit()
+            session.expunge_all()
+
+            processed += 1
+            logger.info(f"[Scan {scan_id}] {count} registros indexados")
+
+        suffix = " (dry-run, sin cambios)" if args.dry_run else ""
+        logger.info(f"Backfill terminado: {processed}/{len(scan_ids)} escaneos{suffix}")
+    finally:
+        session.close()
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,155 @@
+"""
+Caché en proceso de la autenticación.
+Los endpoints de estado y resultados de un escaneo se consultan cada pocos
+segundos: sin caché, cada petición verificaría el JWT y cargaría el User de
+PostgreSQL. Aquí se guardan, en LRU acotados a AUTH_CACHE_SIZE entradas:
+
+- los tokens ya verificados (token -> id de usuario, iat), durante
+  AUTH_TOKEN_CACHE_TTL segundos y nunca más allá de su `exp`;
+- los usuarios (id -> schema User), durante AUTH_USER_CACHE_TTL segundos.
+
+Ganchos de revocación:
+
+- `invalidate_user`: el usuario cambió (desactivado, permisos); se relee de la BD.
+- `revoke_token`: un token concreto deja de aceptarse hasta su caducidad.
+- `revoke_user_tokens`: se rechazan todos los tokens emitidos antes de ahora.
+
+La caché es de cada proceso de la API: los ganchos actúan en el proceso que los
+llama. En los demás, un cambio del usuario se aplica al caducar su entrada.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+from jose import JWTError, jwt
+
+from app.core.config import settings
+from app.schemas.user import User as UserSchema
+
+
+class TTLCache:
+    """LRU acotado a `maxsize` entradas, cada una con su propia caducidad"""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= now:
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Guarda `value` durante min(ttl, self.ttl) segundos"""
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if ttl <= 0 or self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+_tokens = TTLCache(settings.AUTH_CACHE_SIZE, settings.AUTH_TOKEN_CACHE_TTL)
+_users = TTLCache(settings.AUTH_CACHE_SIZE, settings.AUTH_USER_CACHE_TTL)
+
+# Revocaciones: no se acotan por tamaño (descartar una volvería a aceptar el
+# token); cada una se purga cuando el token ya habría caducado de todos modos
+_revocation_lock = threading.Lock()
+_revoked_tokens: Dict[str, float] = {}   # token -> exp (epoch)
+_revoked_before: Dict[int, float] = {}   # usuario -> tokens con iat anterior rechazados
+
+
+# ─────────────── Tokens ───────────────
+
+def get_token(token: str) -> Optional[Tuple[int, float]]:
+    """(id de usuario, iat) de un token ya verificado, o None si no está en caché"""
+    return _tokens.get(token)
+
+
+def remember_token(token: str, user_id: int, issued_at: float, expires_at: float) -> None:
+    """Guarda un token verificado sin sobrepasar su caducidad"""
+    _tokens.set(token, (user_id, issued_at), ttl=expires_at - time.time())
+
+
+def is_revoked(token: str, user_id: int, issued_at: float) -> bool:
+    """El token se revocó, o todos los del usuario emitidos antes de su iat"""
+    if not _revoked_tokens and not _revoked_before:
+        return False
+    with _revocation_lock:
+        if token in _revoked_tokens:
+            return True
+        cutoff = _revoked_before.get(user_id)
+        return cutoff is not None and issued_at < cutoff
+
+
+def revoke_token(token: str) -> None:
+    """Rechaza un token concreto (p.ej. al cerrar sesión) hasta su caducidad"""
+    try:
+        expires_at = float(jwt.get_unverified_claims(token)["exp"])
+    except (JWTError, KeyError, TypeError, ValueError):
+        expires_at = time.time() + settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+
+    now = time.time()
+    with _revocation_lock:
+        for revoked, exp in list(_revoked_tokens.items()):
+            if exp <= now:
+                del _revoked_tokens[revoked]
+        _revoked_tokens[token] = expires_at
+    _tokens.pop(token)
+
+
+def revoke_user_tokens(user_id: int) -> None:
+    """Rechaza todos los tokens del usuario emitidos hasta ahora"""
+    now = time.time()
+    horizon = now - settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+    with _revocation_lock:
+        for revoked, cutoff in list(_revoked_before.items()):
+            if cutoff <= horizon:
+                del _revoked_before[revoked]
+        _revoked_before[user_id] = now
+    invalidate_user(user_id)
+
+
+# ─────────────── Usuarios ───────────────
+
+def get_user(user_id: int) -> Optional[UserSchema]:
+    return _users.get(user_id)
+
+
+def remember_user(user: UserSchema) -> None:
+    _users.set(user.id, user)
+
+
+def invalidate_user(user_id: int) -> None:
+    """Descarta el usuario en caché: la siguiente petición lo relee de la BD"""
+    _users.pop(user_id)
+
+
+def clear() -> None:
+    """Vacía las cachés de tokens y usuarios (las revocaciones se conservan)"""
+    _tokens.clear()
+    _users.clear()
@@ -4,7 +4,10 @@ Usa Redis como broker y backend de resultados.
 """
 
 from celery import Celery
+from kombu import Queue
+
 from app.core.config import settings
+from app.core.scanner_config import QUEUE_HEAVY, QUEUE_LIGHT, SCANNER_QUEUES
 
 celery_app = Celery(
     "blitzscan",
@@ -12,18 +15,46 @@ celery_app = Celery(
     backend=settings.CELERY_RESULT_BACKEND,
 )
 
+# Tareas cuyo segundo argumento posicional es la herramienta
+TOOL_TASKS = {"run_scan", "run_scan_shard"}
+
+
+def route_scan_task(name, args, kwargs, options, task=None, **kw):
+    """
+    Router de Celery: envía cada escaneo a la cola de la clase de coste de su
+    herramienta (SCANNER_QUEUES). El pipeline va a la cola pesada y el resto
+    de tareas de control (p. ej. merge_scan_shards) a la ligera.
+    """
+    if name == "run_pipeline":
+        return {"queue": SCANNER_QUEUES["pipeline"]}
+    if name in TOOL_TASKS:
+        tool_name = kwargs.get("tool_name") if kwargs else None
+        if tool_name is None and args and len(args) > 1:
+            tool_name = args[1]
+        return {"queue": SCANNER_QUEUES.get(tool_name, QUEUE_HEAVY)}
+    return {"queue": QUEUE_LIGHT}
+
+
 celery_app.conf.update(
     task_serializer="json",
     accept_content=["json"],
     result_serializer="json",
     timezone="UTC",
     enable_utc=True,
-    # Evitar que un task bloquee el worker para siempre
+    # Evitar que un task bloquee el worker para siempre (con el pool "threads"
+    # Celery no los aplica: worker_loop.run_coroutine impone el límite blando)
     task_soft_time_limit=900,   # 15 min soft limit
     task_time_limit=1200,       # 20 min hard limit
     # Reintentos
     task_acks_late=True,
     worker_prefetch_multiplier=1,
+    # Cada hilo del pool delega su escaneo al event loop del proceso
+    worker_pool=settings.CELERY_WORKER_POOL,
+    worker_concurrency=settings.CELERY_WORKER_CONCURRENCY,
+    # Colas por clase de coste (ver "Perfiles de Worker" en la documentación)
+    task_queues=(Queue(QUEUE_HEAVY), Queue(QUEUE_LIGHT)),
+    task_default_queue=QUEUE_LIGHT,
+    task_routes=(route_scan_task,),
 )
 
 # Auto-descubrir tareas en el módulo de tasks
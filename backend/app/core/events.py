@@ -0,0 +1,173 @@
+"""
+Canal de eventos de escaneo sobre Redis pub/sub.
+El worker Celery publica transiciones de estado y lotes de hallazgos;
+la API reparte cada mensaje entre los clientes conectados por SSE.
+También guarda la marca de cancelación que vigilan los workers.
+"""
+
+import asyncio
+import json
+import logging
+from typing import Any, Dict, Optional, Set
+
+import redis
+import redis.asyncio as aioredis
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Mensajes pendientes por cliente antes de descartar los más antiguos
+SUBSCRIBER_QUEUE_SIZE = 256
+
+
+def scan_channel(scan_id: int) -> str:
+    """Nombre del canal Redis de un escaneo"""
+    return f"blitzscan:scan:{scan_id}"
+
+
+# ─────────────── Publicación (worker, síncrono) ───────────────
+
+_publisher: Optional[redis.Redis] = None
+
+# Duración de la marca de cancelación (cubre escaneos aún en cola)
+CANCEL_FLAG_TTL = 24 * 3600
+
+
+def _sync_client() -> redis.Redis:
+    global _publisher
+    if _publisher is None:
+        _publisher = redis.Redis.from_url(settings.REDIS_URL)
+    return _publisher
+
+
+def publish_scan_event(scan_id: int, event: str, data: Dict[str, Any]) -> None:
+    """
+    Publica un evento de escaneo. Los errores de Redis se registran
+    pero nunca interrumpen la ejecución del escaneo.
+    """
+    payload = json.dumps({"event": event, "scan_id": scan_id, **data}, default=str)
+    try:
+        _sync_client().publish(scan_channel(scan_id), payload)
+    except redis.RedisError as e:
+        logger.warning(f"[Scan {scan_id}] No se pudo publicar evento {event}: {e}")
+
+
+# ─────────────── Cancelación ───────────────
+
+def cancel_flag_key(scan_id: int) -> str:
+    return f"{scan_channel(scan_id)}:cancel"
+
+
+def request_scan_cancel(scan_id: int) -> None:
+    """Marca un escaneo como cancelado para que el worker detenga la herramienta"""
+    try:
+        _sync_client().set(cancel_flag_key(scan_id), "1", ex=CANCEL_FLAG_TTL)
+    except redis.RedisError as e:
+        logger.warning(f"[Scan {scan_id}] No se pudo guardar la marca de cancelación: {e}")
+
+
+def is_scan_cancelled(scan_id: int) -> bool:
+    """Consulta la marca de cancelación (False si Redis no responde)"""
+    try:
+        return bool(_sync_client().exists(cancel_flag_key(scan_id)))
+    except redis.RedisError:
+        return False
+
+
+# ─────────────── Suscripción (API, asíncrono) ───────────────
+
+class ScanEventBroker:
+    """
+    Mantiene una única conexión pub/sub por proceso de la API y reparte los
+    mensajes entre colas por cliente. Cada escaneo se suscribe en Redis solo
+    mientras tenga al menos un cliente escuchando.
+    """
+
+    def __init__(self, url: str):
+        self.url = url
+        self._redis: Optional[aioredis.Redis] = None
+        self._pubsub = None
+        self._reader: Optional[asyncio.Task] = None
+        self._subscribers: Dict[int, Set[asyncio.Queue]] = {}
+        self._lock = asyncio.Lock()
+
+    async def subscribe(self, scan_id: int) -> asyncio.Queue:
+        """Registra un cliente y devuelve la cola donde recibirá los eventos"""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        async with self._lock:
+            if self._pubsub is None:
+                self._redis = aioredis.from_url(self.url)
+                self._pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+
+            watchers = self._subscribers.setdefault(scan_id, set())
+            if not watchers:
+                await self._pubsub.subscribe(scan_channel(scan_id))
+            watchers.add(queue)
+
+            if self._reader is None or self._reader.done():
+                self._reader = asyncio.create_task(self._read_loop())
+        return queue
+
+    async def unsubscribe(self, scan_id: int, queue: asyncio.Queue) -> None:
+        """Elimina un cliente; el último en salir cancela la suscripción Redis"""
+        async with self._lock:
+            watchers = self._subscribers.get(scan_id)
+            if not watchers:
+                return
+            watchers.discard(queue)
+            if not watchers:
+                del self._subscribers[scan_id]
+                try:
+                    await self._pubsub.unsubscribe(scan_channel(scan_id))
+                except redis.RedisError as e:
+                    logger.warning(f"[Scan {scan_id}] Error al cancelar suscripción: {e}")
+
+    async def close(self) -> None:
+        """Cierra la conexión pub/sub (apagado de la API)"""
+        if self._reader is not None:
+            self._reader.cancel()
+        if self._pubsub is not None:
+            await self._pubsub.aclose()
+        if self._redis is not None:
+            await self._redis.aclose()
+        self._reader = self._pubsub = self._redis = None
+        self._subscribers.clear()
+
+    async def _read_loop(self) -> None:
+        """Lee mensajes de Redis y los reparte a las colas de cada escaneo"""
+        while True:
+            if not self._subscribers:
+                await asyncio.sleep(0.5)
+                continue
+            try:
+                message = await self._pubsub.get_message(
+                    ignore_subscribe_messages=True, timeout=1.0
+                )
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Error leyendo eventos de Redis: {e}")
+                await asyncio.sleep(1)
+                continue
+
+            if message is None or message.get("type") != "message":
+                continue
+            self._dispatch(message["channel"], message["data"])
+
+    def _dispatch(self, channel: bytes, data: bytes) -> None:
+        try:
+            event = json.loads(data)
+            scan_id = int(event["scan_id"])
+        except (ValueError, KeyError, TypeError):
+            logger.warning(f"Evento inválido en {channel!r}")
+            return
+
+        for queue in list(self._subscribers.get(scan_id, ())):
+            if queue.full():
+                # Cliente lento: se descarta el evento más antiguo
+                queue.get_nowait()
+            queue.put_nowait(event)
+
+
+scan_event_broker = ScanEventBroker(settings.REDIS_URL)
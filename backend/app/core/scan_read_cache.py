@@ -0,0 +1,134 @@
+"""
+Caché read-through en Redis de las lecturas de un escaneo.
+Los clientes consultan GET /scan/{id} y /scan/{id}/results cada pocos
+segundos: cada respuesta se guarda ya serializada y las siguientes peticiones,
+de cualquier proceso de la API, la sirven sin tocar PostgreSQL.
+
+- Escaneos terminados: SCAN_READ_CACHE_TERMINAL_TTL (ya no cambian).
+- Escaneos en curso: SCAN_READ_CACHE_ACTIVE_TTL; el contador de progreso puede
+  ir ese tiempo por detrás (el stream SSE lo da en vivo).
+
+En cada cambio de estado el worker sustituye las entradas por una lápida de
+SCAN_READ_CACHE_TOMBSTONE_TTL segundos. La API solo escribe con SET NX, así que
+una lectura de la BD anterior al cambio que llegue tarde no vuelve a cachear el
+estado viejo. Si Redis no responde, las lecturas van directamente a la BD.
+"""
+
+import logging
+from typing import Optional
+
+import redis
+import redis.asyncio as aioredis
+
+from app.core.config import settings
+from app.core.events import scan_channel
+from app.core.scanner_config import (
+    SCAN_READ_CACHE_ACTIVE_TTL,
+    SCAN_READ_CACHE_TERMINAL_TTL,
+    SCAN_READ_CACHE_TOMBSTONE_TTL,
+    SCAN_READ_CACHE_MAX_BYTES,
+)
+
+logger = logging.getLogger(__name__)
+
+# Valor de la lápida: una lectura la trata como fallo de caché
+TOMBSTONE = b""
+
+# Segundos máximos esperando a Redis: una caché caída no debe frenar el polling
+REDIS_TIMEOUT = 0.5
+
+
+def status_key(scan_id: int) -> str:
+    return f"{scan_channel(scan_id)}:status"
+
+
+def results_key(scan_id: int) -> str:
+    return f"{scan_channel(scan_id)}:results"
+
+
+# ─────────────── Invalidación (worker, síncrono) ───────────────
+
+_invalidator: Optional[redis.Redis] = None
+
+
+def _sync_client() -> redis.Redis:
+    global _invalidator
+    if _invalidator is None:
+        _invalidator = redis.Redis.from_url(
+            settings.REDIS_URL,
+            socket_timeout=REDIS_TIMEOUT,
+            socket_connect_timeout=REDIS_TIMEOUT,
+        )
+    return _invalidator
+
+
+def invalidate_scan(scan_id: int) -> None:
+    """
+    Sustituye el estado y los resultados cacheados por lápidas. Los errores de
+    Redis se registran pero nunca interrumpen el escaneo.
+    """
+    try:
+        pipe = _sync_client().pipeline(transaction=False)
+        for key in (status_key(scan_id), results_key(scan_id)):
+            pipe.set(key, TOMBSTONE, ex=SCAN_READ_CACHE_TOMBSTONE_TTL)
+        pipe.execute()
+    except redis.RedisError as e:
+        logger.warning(f"[Scan {scan_id}] No se pudo invalidar la caché de lectura: {e}")
+
+
+# ─────────────── Lectura y escritura (API, asíncrono) ───────────────
+
+class ScanReadCache:
+    """Cliente Redis de la API para la caché de lectura (uno por proceso)"""
+
+    def __init__(self, url: str):
+        self.url = url
+        self._redis: Optional[aioredis.Redis] = None
+
+    def _client(self) -> aioredis.Redis:
+        if self._redis is None:
+            self._redis = aioredis.from_url(
+                self.url,
+                socket_timeout=REDIS_TIMEOUT,
+                socket_connect_timeout=REDIS_TIMEOUT,
+            )
+        return self._redis
+
+    async def get(self, key: str) -> Optional[bytes]:
+        """Respuesta JSON cacheada, o None (fallo, lápida o Redis caído)"""
+        try:
+            value = await self._client().get(key)
+        except redis.RedisError as e:
+            logger.debug(f"Caché de lectura no disponible ({key}): {e}")
+            return None
+        return value or None
+
+    async def store(self, key: str, payload: bytes, terminal: bool) -> None:
+        """Guarda una respuesta si no hay entrada ni lápida (SET NX)"""
+        if len(payload) > SCAN_READ_CACHE_MAX_BYTES:
+            return
+        ttl = SCAN_READ_CACHE_TERMINAL_TTL if terminal else SCAN_READ_CACHE_ACTIVE_TTL
+        try:
+            await self._client().set(key, payload, ex=ttl, nx=True)
+        except redis.RedisError as e:
+            logger.debug(f"No se pudo guardar en la caché de lectura ({key}): {e}")
+
+    async def invalidate(self, *scan_ids: int) -> None:
+        """Lápidas para escaneos cuyo estado cambia desde la API"""
+        try:
+            pipe = self._client().pipeline(transaction=False)
+            for scan_id in scan_ids:
+                for key in (status_key(scan_id), results_key(scan_id)):
+                    pipe.set(key, TOMBSTONE, ex=SCAN_READ_CACHE_TOMBSTONE_TTL)
+            await pipe.execute()
+        except redis.RedisError as e:
+            logger.warning(f"No se pudo invalidar la caché de lectura de {list(scan_ids)}: {e}")
+
+    async def close(self) -> None:
+        """Cierra la conexión (apagado de la API)"""
+        if self._redis is not None:
+            await self._redis.aclose()
+        self._redis = None
+
+
+scan_read_cache = ScanReadCache(settings.REDIS_URL)
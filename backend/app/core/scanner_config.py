@@ -96,6 +96,122 @@ SCANNER_TIMEOUTS = {
     "testssl": 300,        # 5 min
 }
 
+# Subprocesos concurrentes por herramienta dentro de un mismo proceso worker
+# (herramientas de I/O de red toleran más paralelismo que las de CPU/paquetes)
+SCANNER_CONCURRENCY = {
+    "subfinder": 8,
+    "amass": 2,
+    "masscan": 1,
+    "rustscan": 4,
+    "nmap": 2,
+    "httpx": 8,
+    "whatweb": 8,
+    "nuclei": 2,
+    "ffuf": 4,
+    "testssl": 4,
+}
+
+# Cola Celery por clase de coste: los escaneos largos o intensivos en CPU/red
+# no bloquean a los rápidos (cada cola la consume un pool de workers propio)
+QUEUE_HEAVY = "scans.heavy"
+QUEUE_LIGHT = "scans.light"
+SCANNER_QUEUES = {
+    "subfinder": QUEUE_LIGHT,
+    "amass": QUEUE_HEAVY,      # enumeración activa, hasta 10 min
+    "masscan": QUEUE_HEAVY,    # saturación de red
+    "rustscan": QUEUE_LIGHT,
+    "nmap": QUEUE_HEAVY,       # -sV/-A: scripts y detección de SO
+    "httpx": QUEUE_LIGHT,
+    "whatweb": QUEUE_LIGHT,
+    "nuclei": QUEUE_HEAVY,     # plantillas: hasta 15 min
+    "ffuf": QUEUE_HEAVY,       # miles de peticiones por wordlist
+    "testssl": QUEUE_LIGHT,
+    "pipeline": QUEUE_HEAVY,
+}
+
+# Workers concurrentes por etapa del pipeline de reconocimiento (ScanType.FULL)
+PIPELINE_STAGE_CONCURRENCY = {
+    "ports": 8,        # un escaneo de puertos por host descubierto
+    "services": 4,     # nmap por host con puertos abiertos
+    "web": 16,         # httpx por servicio HTTP
+    "vuln": 4,         # nuclei por endpoint vivo
+}
+
+# Agrupación de puertos abiertos antes de lanzar nmap en el pipeline: una
+# ejecución `-p p1,p2,...` por host y lote, en vez de una por puerto
+PIPELINE_PORT_BATCH_SIZE = 100      # Puertos por lote (se lanza al llenarse)
+PIPELINE_PORT_BATCH_WINDOW = 2.0    # Segundos desde el primer puerto del lote
+
+# Fragmentación de rangos CIDR grandes en shards (un shard = una tarea Celery)
+SHARD_PREFIXLEN = {
+    "masscan": 24,     # /16 → 256 shards /24
+    "nmap": 26,        # nmap es más lento por host: shards de 64 direcciones
+}
+SHARD_MAX_COUNT = 1024  # Máximo de shards por escaneo (los shards crecen si hace falta)
+
+# Límites del modo streaming (BaseScanner.execute con parse_record)
+STREAM_LINE_LIMIT = 1024 * 1024     # Máximo de bytes por línea de stdout
+STDERR_TAIL_BYTES = 64 * 1024       # Bytes finales de stderr que se conservan
+
+# Terminación de herramientas (cancelación, timeout o apagado del worker)
+PROCESS_KILL_GRACE = 5.0            # Segundos entre SIGTERM y SIGKILL al grupo
+CANCEL_POLL_INTERVAL = 2.0          # Cada cuánto el worker consulta la marca de cancelación
+
+# Qué hacer cuando una herramienta excede su timeout (opción `timeout_mode`):
+#   "partial": detenerla con SIGTERM, parsear lo que ya emitió y guardar el
+#              escaneo como PARTIAL con metadatos de cobertura
+#   "fail":    descartar la salida y marcar el escaneo como FAILED
+TIMEOUT_MODES = ("partial", "fail")
+DEFAULT_TIMEOUT_MODE = "partial"
+
+# Timeouts adaptativos (app/services/duration_model.py): con historial suficiente
+# del mismo tamaño de target, el timeout sale de los percentiles de duración;
+# sin historial se usa SCANNER_TIMEOUTS
+DURATION_HISTORY_SAMPLES = 50       # Escaneos recientes que entran en los percentiles
+DURATION_MIN_SAMPLES = 5            # Mínimo de muestras para fiarse del historial
+DURATION_TIMEOUT_PERCENTILE = 0.95  # Percentil base del timeout
+DURATION_TIMEOUT_HEADROOM = 1.5     # Timeout = percentil × margen
+DURATION_TIMEOUT_MIN = 30           # Segundos mínimos de timeout
+DURATION_TIMEOUT_MAX_FACTOR = 4     # Tope: SCANNER_TIMEOUTS × factor
+TASK_TIME_LIMIT_MARGIN = 120        # Segundos de la tarea Celery sobre el timeout (parada, parseo, volcado)
+
+# Máximo de escaneos por petición a POST /api/v1/scan/batch
+BATCH_MAX_SCANS = 1000
+
+# Volcado de hallazgos parciales a la BD durante la ejecución
+FINDINGS_BATCH_SIZE = 500           # Registros por lote
+FINDINGS_FLUSH_INTERVAL = 2.0       # Segundos máximos entre lotes
+FINDINGS_EXPORT_BATCH_SIZE = 2000   # Filas por lote del cursor de servidor en /export
+FINDINGS_MERGE_BATCH_SIZE = 2000    # Filas por lote al agregar los shards de un scan
+
+# Caché de resultados: segundos durante los que un escaneo completado idéntico
+# (herramienta + target + opciones + binario) se reutiliza. 0 = sin caché
+SCANNER_CACHE_TTL = {
+    "subfinder": 6 * 3600,   # fuentes pasivas: cambian poco en horas
+    "amass": 12 * 3600,
+    "masscan": 600,
+    "rustscan": 600,
+    "nmap": 1800,
+    "httpx": 900,
+    "whatweb": 3600,
+    "nuclei": 3600,
+    "ffuf": 1800,
+    "testssl": 6 * 3600,     # la configuración TLS rara vez cambia
+    "pipeline": 1800,
+}
+
+# Caché read-through en Redis de GET /scan/{id} y /scan/{id}/results
+# (app/core/scan_read_cache.py). El worker la invalida en cada cambio de estado
+SCAN_READ_CACHE_ACTIVE_TTL = 2          # Segundos para escaneos en curso (retraso máximo del progreso)
+SCAN_READ_CACHE_TERMINAL_TTL = 3600     # Segundos para escaneos terminados (ya no cambian)
+SCAN_READ_CACHE_TOMBSTONE_TTL = 2       # Segundos que una invalidación impide volver a cachear
+SCAN_READ_CACHE_MAX_BYTES = 1024 * 1024 # Respuestas más grandes se sirven siempre desde la BD
+
+# Cache-Control de GET /scan/{id}/results para escaneos terminados (inmutables,
+# validados con ETag). "private" porque las rutas de escaneo exigen token: con
+# "public" una CDN serviría el informe a cualquiera que conozca la URL
+SCAN_RESULTS_CACHE_CONTROL = "private, max-age=31536000, immutable"
+
 # Directorio temporal para resultados
 SCAN_RESULTS_DIR = PROJECT_ROOT / "scan_results"
 SCAN_RESULTS_DIR.mkdir(exist_ok=True)
@@ -1,6 +1,9 @@
 
+import asyncio
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Any, Union
+from typing import Any, Dict, Optional, Union
 from jose import jwt
 from passlib.context import CryptContext
 from app.core.config import settings
@@ -15,12 +18,63 @@ def create_access_token(subject: Union[str, Any], expires_delta: timedelta = Non
     else:
         expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     
-    to_encode = {"exp": expire, "sub": str(subject)}
+    to_encode = {"exp": expire, "iat": datetime.utcnow(), "sub": str(subject)}
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
+def decode_access_token(token: str) -> Dict[str, Any]:
+    """Verifica firma y caducidad del JWT y devuelve sus claims (JWTError si no es válido)"""
+    return jwt.decode(token, settings.SECRET_KEY, algorithms=[ALGORITHM])
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
+
+
+# ─────────────── bcrypt fuera del event loop ───────────────
+# Cada verificación cuesta ~100-300 ms de CPU: ejecutada en un handler async
+# congelaría el loop para todas las peticiones. Se delega a un pool acotado a
+# PASSWORD_HASH_WORKERS; el exceso de logins espera turno en su cola.
+
+_hash_executor: Optional[Executor] = None
+_hash_lock = threading.Lock()
+
+
+def _executor() -> Executor:
+    """Pool de hashing del proceso, creado en el primer uso"""
+    global _hash_executor
+
+    with _hash_lock:
+        if _hash_executor is None:
+            if settings.PASSWORD_HASH_POOL == "process":
+                _hash_executor = ProcessPoolExecutor(max_workers=settings.PASSWORD_HASH_WORKERS)
+            else:
+                _hash_executor = ThreadPoolExecutor(
+                    max_workers=settings.PASSWORD_HASH_WORKERS,
+                    thread_name_prefix="password-hash",
+                )
+    return _hash_executor
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """verify_password en el pool de hashing"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor(), verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """get_password_hash en el pool de hashing"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor(), get_password_hash, password)
+
+
+def shutdown_password_hashing() -> None:
+    """Cierra el pool de hashing (apagado de la API)"""
+    global _hash_executor
+
+    with _hash_lock:
+        if _hash_executor is not None:
+            _hash_executor.shutdown(wait=False, cancel_futures=True)
+            _hash_executor = None
@@ -1,12 +1,28 @@
+import json
+import time
+from typing import Any, Dict
 
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from app.core.config import settings
 
-# El motor asíncrono que usa la URL de tu .env
+# El motor asíncrono que usa la URL de tu .env (ajustes de pool en Settings.DB_*)
 engine = create_async_engine(
-    settings.DATABASE_URL, 
-    echo=True, # Muestra el SQL en la consola (ideal para desarrollo)
-    future=True
+    settings.DATABASE_URL,
+    echo=settings.DB_ECHO,  # Muestra el SQL en la consola (solo para desarrollo)
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    pool_pre_ping=settings.DB_POOL_PRE_PING,
+    query_cache_size=settings.DB_QUERY_CACHE_SIZE,
+    connect_args={
+        # Sentencias preparadas reutilizadas por conexión (asyncpg y SQLAlchemy)
+        "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        "prepared_statement_cache_size": settings.DB_PREPARED_STATEMENT_CACHE_SIZE,
+    },
+    # Columnas JSONB: serializar tipos no nativos (datetime, etc.) como texto
+    json_serializer=lambda obj: json.dumps(obj, default=str),
 )
 
 # Nueva forma recomendada en SQLAlchemy 2.0+
@@ -24,3 +40,47 @@ async def get_db():
     """
     async with AsyncSessionLocal() as session:
         yield session
+
+
+# ─────────────── Métricas del pool ───────────────
+
+# Contadores desde el arranque del proceso (eventos del pool de SQLAlchemy)
+_pool_counters = {
+    "connections_opened": 0,   # Conexiones nuevas: muchas seguidas = tormenta de conexiones
+    "connections_invalidated": 0,  # Descartadas (pre-ping fallido, errores de red)
+    "checkouts": 0,
+}
+_started_at = time.monotonic()
+
+
+@event.listens_for(engine.sync_engine, "connect")
+def _on_connect(dbapi_connection, connection_record):
+    _pool_counters["connections_opened"] += 1
+
+
+@event.listens_for(engine.sync_engine, "invalidate")
+def _on_invalidate(dbapi_connection, connection_record, exception):
+    _pool_counters["connections_invalidated"] += 1
+
+
+@event.listens_for(engine.sync_engine, "checkout")
+def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+    _pool_counters["checkouts"] += 1
+
+
+def pool_metrics() -> Dict[str, Any]:
+    """Ocupación actual del pool de la API y contadores desde el arranque"""
+    pool = engine.pool
+    size = pool.size()
+    checked_out = pool.checkedout()
+    capacity = size + settings.DB_MAX_OVERFLOW
+    return {
+        "pool_size": size,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "checked_out": checked_out,
+        "checked_in": pool.checkedin(),
+        "overflow": max(pool.overflow(), 0),
+        "utilization": round(checked_out / capacity, 3) if capacity else 0.0,
+        "uptime_seconds": round(time.monotonic() - _started_at),
+        **_pool_counters,
+    }
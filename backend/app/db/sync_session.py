@@ -0,0 +1,49 @@
+"""
+Motor síncrono (psycopg2) para las escrituras del worker Celery.
+El pool se dimensiona con la concurrencia del worker: con el pool de hilos
+cada tarea puede tener una escritura en curso, además de los volcados de
+hallazgos que el event loop delega a su executor.
+"""
+
+import json
+import os
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+
+# Pools de Celery en los que varias tareas comparten proceso
+THREADED_POOLS = {"threads", "gevent", "eventlet"}
+
+
+def _pool_size() -> int:
+    if settings.WORKER_DB_POOL_SIZE > 0:
+        return settings.WORKER_DB_POOL_SIZE
+    if settings.CELERY_WORKER_POOL in THREADED_POOLS:
+        return settings.CELERY_WORKER_CONCURRENCY
+    # prefork/solo: una tarea por proceso más el volcado de hallazgos
+    return 2
+
+
+# Reemplazar asyncpg por psycopg2 para conexión síncrona
+sync_engine = create_engine(
+    settings.DATABASE_URL.replace("postgresql+asyncpg", "postgresql+psycopg2"),
+    pool_size=_pool_size(),
+    max_overflow=settings.WORKER_DB_MAX_OVERFLOW,
+    # Descartar conexiones cortadas (reinicio de PostgreSQL, pgbouncer) antes de usarlas
+    pool_pre_ping=True,
+    pool_recycle=settings.WORKER_DB_POOL_RECYCLE,
+    # Columnas JSONB: serializar tipos no nativos (datetime, etc.) como texto
+    json_serializer=lambda obj: json.dumps(obj, default=str),
+)
+SyncSession = sessionmaker(bind=sync_engine)
+
+
+def _reset_after_fork() -> None:
+    """Un proceso hijo (prefork) no debe reutilizar las conexiones del padre"""
+    sync_engine.dispose(close=False)
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
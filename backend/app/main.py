@@ -1,13 +1,29 @@
 
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from starlette.middleware.cors import CORSMiddleware
 
 from app.api.v1.router import api_router
 from app.core.config import settings
+from app.core.events import scan_event_broker
+from app.core.scan_read_cache import scan_read_cache
+from app.core.security import shutdown_password_hashing
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Cerrar las conexiones a Redis y el pool de hashing al apagar la API
+    await scan_event_broker.close()
+    await scan_read_cache.close()
+    shutdown_password_hashing()
+
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
-    openapi_url=f"{settings.API_V1_STR}/openapi.json"
+    openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    lifespan=lifespan,
 )
 
 # Set all CORS enabled origins
@@ -0,0 +1,112 @@
+"""
+Modelos normalizados de hallazgos.
+Cada fila es un hallazgo de un escaneo (hosts, puertos, servicios, subdominios,
+endpoints HTTP, vulnerabilidades y hallazgos TLS), indexado para consultas
+entre escaneos sin tener que parsear Scan.results.
+"""
+
+from sqlalchemy import (
+    Column, Integer, BigInteger, String, DateTime, Text, JSON,
+    ForeignKey, Index
+)
+from sqlalchemy.sql import func
+from app.db.base import Base
+
+
+def _scan_fk():
+    return Column(
+        Integer, ForeignKey("scan.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+
+
+class Host(Base):
+    """Host detectado (nmap, amass)"""
+    id = Column(BigInteger, primary_key=True)
+    scan_id = _scan_fk()
+    address = Column(String(255), nullable=False, index=True)
+    hostname = Column(String(500), nullable=True)
+    status = Column(String(50), nullable=True)
+    os = Column(String(255), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+class OpenPort(Base):
+    """Puerto detectado en un host (masscan, rustscan, nmap)"""
+    id = Column(BigInteger, primary_key=True)
+    scan_id = _scan_fk()
+    ip = Column(String(255), nullable=False, index=True)
+    port = Column(Integer, nullable=False)
+    protocol = Column(String(10), nullable=False, default="tcp")
+    state = Column(String(20), nullable=False, default="open")
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        Index("ix_openport_port_state", "port", "state"),
+    )
+
+
+class Service(Base):
+    """Servicio identificado en un puerto (nmap)"""
+    id = Column(BigInteger, primary_key=True)
+    scan_id = _scan_fk()
+    ip = Column(String(255), nullable=False, index=True)
+    port = Column(Integer, nullable=False, index=True)
+    protocol = Column(String(10), nullable=False, default="tcp")
+    name = Column(String(100), nullable=True, index=True)
+    product = Column(String(255), nullable=True)
+    version = Column(String(255), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+class Subdomain(Base):
+    """Subdominio descubierto (subfinder, amass)"""
+    id = Column(BigInteger, primary_key=True)
+    scan_id = _scan_fk()
+    name = Column(String(500), nullable=False, index=True)
+    domain = Column(String(500), nullable=True, index=True)
+    source = Column(String(100), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+class HttpEndpoint(Base):
+    """Endpoint HTTP (httpx, whatweb, ffuf)"""
+    id = Column(BigInteger, primary_key=True)
+    scan_id = _scan_fk()
+    url = Column(Text, nullable=False)
+    host = Column(String(500), nullable=True, index=True)
+    status_code = Column(Integer, nullable=True, index=True)
+    title = Column(Text, nullable=True)
+    webserver = Column(String(255), nullable=True)
+    content_type = Column(String(255), nullable=True)
+    content_length = Column(BigInteger, nullable=True)
+    tech = Column(JSON, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+class Vulnerability(Base):
+    """Vulnerabilidad detectada (nuclei)"""
+    id = Column(BigInteger, primary_key=True)
+    scan_id = _scan_fk()
+    template_id = Column(String(255), nullable=False, index=True)
+    name = Column(String(500), nullable=True)
+    severity = Column(String(20), nullable=False)
+    host = Column(String(500), nullable=True, index=True)
+    matched_at = Column(Text, nullable=True)
+    description = Column(Text, nullable=True)
+    tags = Column(JSON, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        Index("ix_vulnerability_severity_created_at", "severity", "created_at"),
+    )
+
+
+class TlsFinding(Base):
+    """Hallazgo de la auditoría TLS (testssl)"""
+    id = Column(BigInteger, primary_key=True)
+    scan_id = _scan_fk()
+    finding_id = Column(String(255), nullable=False, index=True)
+    category = Column(String(20), nullable=False)  # certificate, vulnerability, finding
+    severity = Column(String(20), nullable=True, index=True)
+    finding = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
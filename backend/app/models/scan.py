@@ -4,9 +4,10 @@ Modelo de escaneo - Almacena información y resultados de cada escaneo ejecutado
 
 import enum
 from sqlalchemy import (
-    Column, Integer, String, DateTime, Text,
-    ForeignKey, Enum as SAEnum
+    Column, Integer, BigInteger, String, DateTime, Text, Boolean, Float,
+    ForeignKey, Index, Enum as SAEnum
 )
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.sql import func
 from app.db.base import Base
 
@@ -27,10 +28,20 @@ class ScanStatus(str, enum.Enum):
     PENDING = "pending"
     RUNNING = "running"
     COMPLETED = "completed"
+    PARTIAL = "partial"      # Completado con resultados parciales (timeout)
     FAILED = "failed"
     CANCELLED = "cancelled"
 
 
+# Estados en los que un escaneo ya no cambia
+TERMINAL_STATUSES = (
+    ScanStatus.COMPLETED,
+    ScanStatus.PARTIAL,
+    ScanStatus.FAILED,
+    ScanStatus.CANCELLED,
+)
+
+
 class Scan(Base):
     """
     Modelo principal para almacenar escaneos.
@@ -38,6 +49,11 @@ class Scan(Base):
     """
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("user.id"), nullable=True)
+    # Fila de un usuario que reutiliza (caché) el escaneo de otro: estado,
+    # resultados, hallazgos y eventos se leen del escaneo original
+    source_scan_id = Column(
+        Integer, ForeignKey("scan.id", ondelete="CASCADE"), nullable=True, index=True
+    )
 
     # Información del escaneo
     scan_type = Column(SAEnum(ScanType), nullable=False)
@@ -50,9 +66,69 @@ class Scan(Base):
     completed_at = Column(DateTime(timezone=True), nullable=True)
 
     # Resultados
-    results = Column(Text, nullable=True)  # JSON string con resultados parseados
+    results = Column(JSONB, nullable=True)  # Resultados parseados (consultables con jsonpath)
     raw_output = Column(Text, nullable=True)  # Salida cruda del comando
     error_message = Column(Text, nullable=True)
 
+    # Progreso en vivo: hallazgos guardados mientras la herramienta se ejecuta
+    progress = Column(Integer, default=0, server_default="0", nullable=False)
+    progress_updated_at = Column(DateTime(timezone=True), nullable=True)
+
+    # True cuando sus hallazgos ya están en las tablas normalizadas (app/models/findings.py)
+    findings_indexed = Column(Boolean, default=False, server_default="false", nullable=False)
+
+    # Hash de (herramienta, target, opciones, versión) para reutilizar resultados
+    cache_key = Column(String(64), nullable=True)
+
+    # sha256 de results al guardarlos: ETag de GET /scan/{id}/results
+    results_hash = Column(String(64), nullable=True)
+
+    # Historial de duraciones: tamaño del target (nº de direcciones) y hash de
+    # las opciones al lanzar; duración real al terminar (completed/partial)
+    target_size = Column(Integer, nullable=True)
+    options_hash = Column(String(64), nullable=True)
+    duration = Column(Float, nullable=True)  # Segundos de ejecución
+
+    # Predicción al lanzar (app/services/duration_model.py)
+    expected_duration = Column(Float, nullable=True)  # Mediana histórica (segundos)
+    time_limit = Column(Integer, nullable=True)  # Timeout asignado a la herramienta
+
     # Celery task id para seguimiento
     celery_task_id = Column(String(255), nullable=True, index=True)
+
+    __table_args__ = (
+        # Paginación por cursor (started_at, id), sola o con cada filtro del listado
+        Index("ix_scan_started_at_id", "started_at", "id"),
+        Index("ix_scan_status_started_at_id", "status", "started_at", "id"),
+        Index("ix_scan_tool_used_started_at_id", "tool_used", "started_at", "id"),
+        Index("ix_scan_target_started_at_id", "target", "started_at", "id"),
+        Index("ix_scan_user_id_started_at_id", "user_id", "started_at", "id"),
+        # Búsqueda del escaneo idéntico más reciente
+        Index("ix_scan_cache_key_started_at", "cache_key", "started_at"),
+        # Percentiles de duración por herramienta y tamaño de target
+        Index("ix_scan_tool_used_target_size_completed_at", "tool_used", "target_size", "completed_at"),
+        # Búsquedas por contenido (@>, @?, @@) sobre los resultados
+        Index(
+            "ix_scan_results_gin", "results",
+            postgresql_using="gin", postgresql_ops={"results": "jsonb_path_ops"},
+        ),
+    )
+
+
+class ScanFinding(Base):
+    """
+    Hallazgo individual emitido por una herramienta durante un escaneo.
+    El worker los inserta por lotes mientras el proceso sigue en ejecución.
+    """
+    id = Column(BigInteger, primary_key=True)
+    scan_id = Column(
+        Integer, ForeignKey("scan.id", ondelete="CASCADE"), nullable=False
+    )
+    tool = Column(String(100), nullable=False)
+    data = Column(JSONB, nullable=False)  # Registro parseado
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        # Hallazgos de un escaneo en orden de llegada (/findings, /export) sin ordenar
+        Index("ix_scanfinding_scan_id_id", "scan_id", "id"),
+    )
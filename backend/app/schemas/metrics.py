@@ -0,0 +1,19 @@
+"""
+Schemas Pydantic de las métricas operativas de la API.
+"""
+
+from pydantic import BaseModel, Field
+
+
+class PoolMetricsResponse(BaseModel):
+    """Ocupación del pool de conexiones a PostgreSQL de este proceso de la API"""
+    pool_size: int = Field(description="Conexiones persistentes configuradas")
+    max_overflow: int = Field(description="Conexiones extra permitidas en picos")
+    checked_out: int = Field(description="Conexiones en uso ahora")
+    checked_in: int = Field(description="Conexiones libres en el pool")
+    overflow: int = Field(description="Conexiones extra abiertas ahora")
+    utilization: float = Field(description="checked_out / (pool_size + max_overflow)")
+    uptime_seconds: int = Field(description="Segundos desde el arranque del proceso")
+    connections_opened: int = Field(description="Conexiones abiertas desde el arranque")
+    connections_invalidated: int = Field(description="Conexiones descartadas desde el arranque")
+    checkouts: int = Field(description="Préstamos de conexión desde el arranque")
@@ -6,6 +6,8 @@ from datetime import datetime
 from typing import Optional, Dict, Any, List
 from pydantic import BaseModel, Field
 
+from app.core.scanner_config import BATCH_MAX_SCANS
+
 
 # ──────────────────────────── Requests ────────────────────────────
 
@@ -22,6 +24,10 @@ class ScanRequest(BaseModel):
         default_factory=dict,
         description="Opciones adicionales para la herramienta"
     )
+    use_cache: bool = Field(
+        default=True,
+        description="Reutilizar un escaneo idéntico reciente o en curso"
+    )
 
 
 class PortScanRequest(ScanRequest):
@@ -69,6 +75,65 @@ class FuzzerRequest(ScanRequest):
     )
 
 
+class PipelineRequest(ScanRequest):
+    """Request para el escaneo completo encadenado (subdominios → vulnerabilidades)"""
+    subdomain_tool: Optional[str] = Field(
+        default="subfinder",
+        pattern="^(subfinder|amass)$",
+        description="Herramienta de subdominios: subfinder o amass"
+    )
+    port_tool: Optional[str] = Field(
+        default="rustscan",
+        pattern="^(rustscan|masscan)$",
+        description="Herramienta de puertos: rustscan o masscan"
+    )
+    ports: Optional[str] = Field(
+        default=None,
+        description="Puertos a escanear en cada host (ej: '1-1000')"
+    )
+    severity: Optional[str] = Field(
+        default="medium,high,critical",
+        description="Severidades de nuclei a reportar"
+    )
+    include_vulns: Optional[bool] = Field(
+        default=True,
+        description="Ejecutar nuclei sobre los endpoints vivos"
+    )
+
+
+class BatchScanItem(BaseModel):
+    """Escaneo individual dentro de un lote"""
+    target: str = Field(
+        ...,
+        min_length=1,
+        max_length=500,
+        description="Dominio, IP o URL a escanear",
+    )
+    tool: str = Field(
+        ...,
+        pattern="^(subfinder|amass|masscan|rustscan|nmap|httpx|whatweb|nuclei|ffuf|testssl|pipeline)$",
+        description="Herramienta a ejecutar (pipeline = escaneo completo)",
+    )
+    options: Optional[Dict[str, Any]] = Field(
+        default_factory=dict,
+        description="Opciones adicionales para la herramienta"
+    )
+
+
+class BatchScanRequest(BaseModel):
+    """Request para lanzar varios escaneos en una sola petición"""
+    scans: List[BatchScanItem] = Field(
+        ...,
+        min_length=1,
+        max_length=BATCH_MAX_SCANS,
+        description="Escaneos a lanzar (target + herramienta)"
+    )
+    use_cache: bool = Field(
+        default=True,
+        description="Reutilizar escaneos idénticos recientes o en curso (también dentro del lote)"
+    )
+
+
 # ──────────────────────────── Responses ────────────────────────────
 
 class ScanResponse(BaseModel):
@@ -76,10 +141,18 @@ class ScanResponse(BaseModel):
     scan_id: int
     status: str
     message: str = "Escaneo iniciado correctamente"
+    cached: bool = False  # True si se reutilizó un escaneo idéntico
 
     model_config = {"from_attributes": True}
 
 
+class BatchScanResponse(BaseModel):
+    """Response al lanzar un lote: un ScanResponse por escaneo, en el orden recibido"""
+    scans: List[ScanResponse]
+    created: int = 0  # Escaneos nuevos encolados
+    cached: int = 0   # Escaneos reutilizados (caché, en curso o repetidos en el lote)
+
+
 class ScanStatusResponse(BaseModel):
     """Response con el estado actual de un escaneo"""
     scan_id: int
@@ -90,16 +163,51 @@ class ScanStatusResponse(BaseModel):
     started_at: Optional[datetime] = None
     completed_at: Optional[datetime] = None
     error_message: Optional[str] = None
+    progress: int = 0
+    progress_updated_at: Optional[datetime] = None
+    expected_duration: Optional[float] = Field(
+        default=None, description="Duración esperada en segundos (mediana histórica)"
+    )
+    time_limit: Optional[int] = Field(
+        default=None, description="Timeout asignado a la herramienta en segundos"
+    )
+    eta: Optional[datetime] = Field(
+        default=None, description="Hora estimada de finalización (solo en running)"
+    )
 
     model_config = {"from_attributes": True}
 
 
 class ScanResultResponse(ScanStatusResponse):
-    """Response con resultados completos del escaneo"""
-    results: Optional[Dict[str, Any]] = None
+    """Response con resultados del escaneo (completos o proyectados con fields/path)"""
+    results: Optional[Any] = None
+    findings_count: Optional[int] = Field(
+        default=None, description="Hallazgos guardados hasta ahora (solo si no ha terminado)"
+    )
+    findings_url: Optional[str] = Field(
+        default=None, description="Lectura incremental de los hallazgos (/findings?after=)"
+    )
 
 
 class ScanListResponse(BaseModel):
     """Response con lista de escaneos"""
-    total: int
+    total: Optional[int] = None  # Estimado con count_mode=approximate, None con none
     scans: List[ScanStatusResponse]
+    next_cursor: Optional[str] = None
+
+
+class ScanFindingResponse(BaseModel):
+    """Hallazgo individual guardado durante la ejecución"""
+    id: int
+    tool: str
+    data: Dict[str, Any]
+    created_at: Optional[datetime] = None
+
+
+class ScanFindingListResponse(BaseModel):
+    """Página de hallazgos; next_after se usa como `after` en la siguiente consulta"""
+    scan_id: int
+    status: str
+    progress: int
+    findings: List[ScanFindingResponse]
+    next_after: int
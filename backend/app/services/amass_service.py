@@ -4,12 +4,14 @@ Usa OWASP Amass para enumeración activa y pasiva de subdominios.
 """
 
 import json
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from app.services.base_scanner import BaseScanner
 
 
 class AmassService(BaseScanner):
     tool_name = "amass"
+    streaming = True
+    records_key = "details"
 
     def build_command(self, target: str, **options) -> List[str]:
         cmd = [
@@ -32,33 +34,32 @@ class AmassService(BaseScanner):
 
         return cmd
 
-    def parse_output(self, stdout: str, stderr: str) -> Dict[str, Any]:
-        subdomains = []
-        sources = []
+    def parse_record(self, line: str) -> Optional[Dict[str, Any]]:
+        line = line.strip()
+        if not line:
+            return None
+        try:
+            data = json.loads(line)
+        except json.JSONDecodeError:
+            if "." in line:
+                return {"name": line, "domain": "", "addresses": [], "source": ""}
+            return None
 
-        for line in stdout.strip().split("\n"):
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                data = json.loads(line)
-                name = data.get("name", "")
-                if name:
-                    subdomains.append(name)
-                    sources.append({
-                        "name": name,
-                        "domain": data.get("domain", ""),
-                        "addresses": data.get("addresses", []),
-                        "source": data.get("source", ""),
-                    })
-            except json.JSONDecodeError:
-                if line and "." in line:
-                    subdomains.append(line)
+        name = data.get("name", "") if isinstance(data, dict) else ""
+        if not name:
+            return None
+        return {
+            "name": name,
+            "domain": data.get("domain", ""),
+            "addresses": data.get("addresses", []),
+            "source": data.get("source", ""),
+        }
 
-        unique = list(dict.fromkeys(subdomains))
+    def aggregate(self, records: List[Dict[str, Any]]) -> Dict[str, Any]:
+        unique = list(dict.fromkeys(r["name"] for r in records))
 
         return {
             "subdomains": unique,
             "count": len(unique),
-            "details": sources,
+            "details": records,
         }
@@ -4,28 +4,128 @@ Define la interfaz común que cada servicio de scanner debe implementar.
 """
 
 import asyncio
-import json
+import inspect
 import logging
+import os
+import signal
+import subprocess
+import time
 from abc import ABC, abstractmethod
 from datetime import datetime
-from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Iterator, AsyncIterator, Callable, Set, Tuple
 
-from app.core.scanner_config import SCANNER_BINARIES, SCANNER_TIMEOUTS
+from app.core.scanner_config import (
+    IS_WINDOWS,
+    SCANNER_BINARIES,
+    SCANNER_TIMEOUTS,
+    STREAM_LINE_LIMIT,
+    STDERR_TAIL_BYTES,
+    PROCESS_KILL_GRACE,
+    TIMEOUT_MODES,
+    DEFAULT_TIMEOUT_MODE,
+)
 
 logger = logging.getLogger(__name__)
 
+# Callback invocado por cada registro parseado en modo streaming
+# (puede ser una función normal o una corrutina)
+RecordCallback = Callable[[Dict[str, Any]], Any]
+
+
+# ─────────────── Grupos de procesos ───────────────
+
+# Herramientas en ejecución en este proceso (para terminarlas al apagar el worker)
+_live_processes: Set[asyncio.subprocess.Process] = set()
+
+
+def _process_group_kwargs() -> Dict[str, Any]:
+    """Cada herramienta se lanza como líder de su propio grupo de procesos"""
+    if IS_WINDOWS:
+        return {"creationflags": subprocess.CREATE_NEW_PROCESS_GROUP}
+    return {"start_new_session": True}
+
+
+def _signal_process_tree(pid: int, force: bool) -> None:
+    """Envía SIGTERM (o SIGKILL si force) a todo el grupo de la herramienta"""
+    try:
+        if IS_WINDOWS:
+            if force:
+                subprocess.run(
+                    ["taskkill", "/T", "/F", "/PID", str(pid)],
+                    capture_output=True,
+                )
+            else:
+                os.kill(pid, signal.CTRL_BREAK_EVENT)
+        else:
+            os.killpg(pid, signal.SIGKILL if force else signal.SIGTERM)
+    except (ProcessLookupError, PermissionError, OSError):
+        # El grupo ya terminó
+        pass
+
+
+async def terminate_process_tree(
+    process: asyncio.subprocess.Process, grace: float = PROCESS_KILL_GRACE
+) -> None:
+    """
+    Termina la herramienta y todos sus hijos: SIGTERM al grupo, espera
+    `grace` segundos y SIGKILL a lo que quede (también a hijos huérfanos).
+    """
+    _signal_process_tree(process.pid, force=False)
+    try:
+        await asyncio.wait_for(process.wait(), timeout=grace)
+    except asyncio.TimeoutError:
+        logger.warning(f"[pid {process.pid}] No terminó con SIGTERM, enviando SIGKILL")
+    _signal_process_tree(process.pid, force=True)
+    await process.wait()
+
+
+def kill_all_processes(grace: float = PROCESS_KILL_GRACE) -> None:
+    """Termina (de forma síncrona) todas las herramientas vivas del proceso"""
+    processes = [p for p in _live_processes if p.returncode is None]
+    if not processes:
+        return
+
+    logger.warning(f"Terminando {len(processes)} herramientas en ejecución")
+    for process in processes:
+        _signal_process_tree(process.pid, force=False)
+
+    deadline = time.monotonic() + grace
+    while time.monotonic() < deadline and any(_pid_alive(p.pid) for p in processes):
+        time.sleep(0.1)
+
+    for process in processes:
+        _signal_process_tree(process.pid, force=True)
+    _live_processes.clear()
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except OSError:
+        return False
+    return True
+
 
 class BaseScanner(ABC):
     """
     Clase base para todos los servicios de escaneo.
     Cada herramienta (subfinder, nmap, etc.) hereda de esta clase
     e implementa build_command() y parse_output().
+
+    Los scanners con salida orientada a líneas activan `streaming` e
+    implementan parse_record() y aggregate(): stdout se consume a medida
+    que llega, sin acumular la salida completa en memoria.
     """
 
     # Nombre de la herramienta (se sobreescribe en cada subclase)
     tool_name: str = "base"
 
+    # Si es True, execute() parsea stdout línea a línea con parse_record()
+    streaming: bool = False
+
+    # Clave del resultado que contiene la lista de registros
+    records_key: str = "records"
+
     def __init__(self):
         self.binary_path = str(SCANNER_BINARIES.get(self.tool_name, self.tool_name))
         self.timeout = SCANNER_TIMEOUTS.get(self.tool_name, 300)
@@ -38,14 +138,63 @@ class BaseScanner(ABC):
         """
         pass
 
-    @abstractmethod
     def parse_output(self, stdout: str, stderr: str) -> Dict[str, Any]:
         """
-        Parsea la salida del comando y devuelve un diccionario estructurado.
-        Cada herramienta implementa su propio parser.
+        Parsea la salida completa del comando y devuelve un diccionario estructurado.
+        Por defecto reutiliza el parser incremental sobre cada línea de stdout;
+        los scanners sin modo streaming lo sobreescriben.
+        """
+        return self.aggregate(self.records_from_text(stdout))
+
+    # ─────────────── Parser incremental ───────────────
+
+    def start_stream(self) -> None:
+        """
+        Reinicia el estado del parser incremental antes de cada ejecución.
+        Solo lo necesitan los parsers con estado entre líneas.
         """
         pass
 
+    def parse_record(self, line: str) -> Optional[Dict[str, Any]]:
+        """
+        Parsea una línea de stdout y devuelve un registro,
+        o None si la línea no contiene un resultado.
+        """
+        return None
+
+    def iter_records(self, line: str) -> Iterator[Dict[str, Any]]:
+        """
+        Devuelve los registros que aporta una línea de stdout.
+        Se sobreescribe cuando una línea puede producir varios registros.
+        """
+        record = self.parse_record(line)
+        if record is not None:
+            yield record
+
+    def aggregate(self, records: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Construye el resultado final a partir de los registros parseados.
+        Debe producir la misma estructura que parse_output().
+        """
+        return {
+            "records": records,
+            "count": len(records),
+        }
+
+    def result_records(self, result: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Extrae la lista de registros de un resultado ya agregado"""
+        return result.get(self.records_key) or []
+
+    def records_from_text(self, stdout: str) -> List[Dict[str, Any]]:
+        """Aplica el parser incremental a una salida ya capturada"""
+        self.start_stream()
+        records = []
+        for line in stdout.splitlines():
+            records.extend(self.iter_records(line))
+        return records
+
+    # ─────────────── Validación y ejecución ───────────────
+
     def validate_target(self, target: str) -> bool:
         """
         Validación básica del target (dominio/IP/URL).
@@ -60,57 +209,85 @@ class BaseScanner(ABC):
                 return False
         return True
 
-    async def execute(self, target: str, **options) -> Dict[str, Any]:
+    async def execute(
+        self,
+        target: str,
+        on_record: Optional[RecordCallback] = None,
+        timeout_mode: str = DEFAULT_TIMEOUT_MODE,
+        **options,
+    ) -> Dict[str, Any]:
         """
         Ejecuta el scanner de forma asíncrona.
         1. Valida el target
         2. Construye el comando
         3. Ejecuta con timeout
         4. Parsea los resultados
+
+        En modo streaming, `on_record` recibe cada registro en cuanto la
+        herramienta lo emite, antes de que el proceso termine; en el resto
+        de scanners, al terminar el parseo.
+
+        Con `timeout_mode="partial"`, al vencer el timeout la herramienta se
+        detiene con SIGTERM y se devuelve lo que alcanzó a emitir, marcado con
+        `_meta.partial` y la cobertura; con "fail" se lanza TimeoutError.
         """
         # Validar target
         if not self.validate_target(target):
             raise ValueError(f"Target inválido o con caracteres peligrosos: {target}")
+        if timeout_mode not in TIMEOUT_MODES:
+            raise ValueError(
+                f"timeout_mode inválido: {timeout_mode} (opciones: {', '.join(TIMEOUT_MODES)})"
+            )
 
         # Construir comando
         cmd = self.build_command(target, **options)
         logger.info(f"[{self.tool_name}] Ejecutando: {' '.join(cmd)}")
 
+        started = time.monotonic()
         try:
             # Ejecutar de forma asíncrona con timeout
-            process = await asyncio.create_subprocess_exec(
-                *cmd,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-            )
-
-            stdout_bytes, stderr_bytes = await asyncio.wait_for(
-                process.communicate(),
-                timeout=self.timeout
-            )
+            if self.streaming:
+                records, stderr, return_code, timed_out = await self._run_streaming(
+                    cmd, on_record
+                )
+                result = self.aggregate(records)
+            else:
+                stdout, stderr, return_code, timed_out = await self._run_buffered(cmd)
+                result = self.parse_output(stdout, stderr)
+                if on_record is not None:
+                    for record in self.result_records(result):
+                        ret = on_record(record)
+                        if inspect.isawaitable(ret):
+                            await ret
 
-            stdout = stdout_bytes.decode("utf-8", errors="replace")
-            stderr = stderr_bytes.decode("utf-8", errors="replace")
+            elapsed = time.monotonic() - started
+            if timed_out:
+                logger.warning(f"[{self.tool_name}] Timeout después de {self.timeout}s")
+                if timeout_mode == "fail":
+                    raise TimeoutError(
+                        f"{self.tool_name} excedió el timeout de {self.timeout} segundos"
+                    )
+            else:
+                logger.info(
+                    f"[{self.tool_name}] Terminado con código: {return_code}"
+                )
 
-            logger.info(
-                f"[{self.tool_name}] Terminado con código: {process.returncode}"
-            )
-
-            # Parsear resultados
-            result = self.parse_output(stdout, stderr)
             result["_meta"] = {
                 "tool": self.tool_name,
                 "target": target,
-                "return_code": process.returncode,
+                "return_code": return_code,
                 "timestamp": datetime.utcnow().isoformat(),
             }
+            if timed_out:
+                result["_meta"]["partial"] = True
+                result["_meta"]["coverage"] = {
+                    "reason": "timeout",
+                    "timeout": self.timeout,
+                    "elapsed": round(elapsed, 1),
+                    "records": len(self.result_records(result)),
+                }
             return result
 
-        except asyncio.TimeoutError:
-            logger.error(f"[{self.tool_name}] Timeout después de {self.timeout}s")
-            raise TimeoutError(
-                f"{self.tool_name} excedió el timeout de {self.timeout} segundos"
-            )
         except FileNotFoundError:
             logger.error(f"[{self.tool_name}] Binario no encontrado: {self.binary_path}")
             raise FileNotFoundError(
@@ -120,3 +297,176 @@ class BaseScanner(ABC):
         except Exception as e:
             logger.error(f"[{self.tool_name}] Error: {str(e)}")
             raise
+
+    async def _spawn(self, cmd: List[str], **kwargs) -> asyncio.subprocess.Process:
+        """Lanza la herramienta en su propio grupo de procesos y la registra"""
+        process = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            **_process_group_kwargs(),
+            **kwargs,
+        )
+        _live_processes.add(process)
+        return process
+
+    async def _reap(self, process: asyncio.subprocess.Process) -> None:
+        """
+        Si la herramienta sigue viva (cancelación, timeout o error del parser),
+        termina su árbol de procesos antes de salir.
+        """
+        try:
+            if process.returncode is None:
+                logger.warning(f"[{self.tool_name}] Terminando proceso {process.pid}")
+                await terminate_process_tree(process)
+        finally:
+            _live_processes.discard(process)
+
+    async def _wait_or_stop(
+        self, process: asyncio.subprocess.Process, reader: "asyncio.Future[Any]"
+    ) -> bool:
+        """
+        Espera a que `reader` consuma la salida completa dentro del timeout.
+        Si vence, detiene la herramienta con SIGTERM y sigue leyendo lo que
+        vuelque al salir durante PROCESS_KILL_GRACE; después, SIGKILL.
+        Devuelve True si hubo timeout.
+        """
+        try:
+            await asyncio.wait_for(asyncio.shield(reader), timeout=self.timeout)
+            return False
+        except asyncio.TimeoutError:
+            pass
+
+        _signal_process_tree(process.pid, force=False)
+        try:
+            await asyncio.wait_for(asyncio.shield(reader), timeout=PROCESS_KILL_GRACE)
+        except asyncio.TimeoutError:
+            # Sin el grupo, stdout se cierra y el lector termina con EOF
+            _signal_process_tree(process.pid, force=True)
+            try:
+                await asyncio.wait_for(asyncio.shield(reader), timeout=PROCESS_KILL_GRACE)
+            except asyncio.TimeoutError:
+                logger.warning(
+                    f"[{self.tool_name}] La salida sigue abierta tras SIGKILL; se descarta el resto"
+                )
+                reader.cancel()
+        return True
+
+    async def _run_buffered(self, cmd: List[str]) -> Tuple[str, str, Optional[int], bool]:
+        """
+        Ejecuta el comando y captura stdout/stderr completos.
+        Si vence el timeout, devuelve lo capturado hasta la parada.
+        """
+        process = await self._spawn(cmd)
+        stdout_buf, stderr_buf = bytearray(), bytearray()
+
+        async def drain(stream: asyncio.StreamReader, buffer: bytearray) -> None:
+            while True:
+                chunk = await stream.read(65536)
+                if not chunk:
+                    break
+                buffer += chunk
+
+        reader = asyncio.ensure_future(asyncio.gather(
+            drain(process.stdout, stdout_buf),
+            drain(process.stderr, stderr_buf),
+        ))
+        try:
+            timed_out = await self._wait_or_stop(process, reader)
+            if not timed_out:
+                await process.wait()
+        finally:
+            if not reader.done():
+                reader.cancel()
+            await self._reap(process)
+
+        stdout = stdout_buf.decode("utf-8", errors="replace")
+        stderr = stderr_buf.decode("utf-8", errors="replace")
+        return stdout, stderr, process.returncode, timed_out
+
+    async def _run_streaming(
+        self,
+        cmd: List[str],
+        on_record: Optional[RecordCallback],
+    ) -> Tuple[List[Dict[str, Any]], str, Optional[int], bool]:
+        """
+        Ejecuta el comando consumiendo stdout línea a línea.
+        Solo se conservan los registros parseados y la cola de stderr: la
+        memoria es O(registros), porque aggregate() los incluye en el resultado.
+        Si vence el timeout, devuelve los registros emitidos hasta la parada.
+        """
+        process = await self._spawn(cmd, limit=STREAM_LINE_LIMIT)
+        stderr_task = asyncio.create_task(self._read_stderr_tail(process.stderr))
+
+        records = []
+
+        async def consume() -> None:
+            async for line in self._iter_lines(process.stdout):
+                for record in self.iter_records(line):
+                    records.append(record)
+                    if on_record is not None:
+                        ret = on_record(record)
+                        if inspect.isawaitable(ret):
+                            await ret
+
+        self.start_stream()
+        reader = asyncio.ensure_future(consume())
+        stderr = ""
+        try:
+            timed_out = await self._wait_or_stop(process, reader)
+            if timed_out:
+                if stderr_task.done() and not stderr_task.cancelled():
+                    stderr = stderr_task.result()
+            else:
+                stderr = await stderr_task
+                await process.wait()
+        finally:
+            if not reader.done():
+                reader.cancel()
+            if not stderr_task.done():
+                stderr_task.cancel()
+            await self._reap(process)
+
+        return records, stderr, process.returncode, timed_out
+
+    async def _iter_lines(self, stream: asyncio.StreamReader) -> AsyncIterator[str]:
+        """
+        Itera las líneas de un stream con un buffer acotado a STREAM_LINE_LIMIT.
+        Las líneas que exceden el límite se descartan en lugar de crecer sin control.
+        """
+        discarding = False
+        while True:
+            try:
+                chunk = await stream.readuntil(b"\n")
+            except asyncio.IncompleteReadError as e:
+                # EOF: la última línea puede no terminar en salto de línea
+                if e.partial and not discarding:
+                    yield e.partial.decode("utf-8", errors="replace")
+                return
+            except asyncio.LimitOverrunError as e:
+                if not discarding:
+                    logger.warning(
+                        f"[{self.tool_name}] Línea de salida mayor a "
+                        f"{STREAM_LINE_LIMIT} bytes descartada"
+                    )
+                await stream.readexactly(e.consumed)
+                discarding = True
+                continue
+
+            if discarding:
+                # Resto de la línea descartada
+                discarding = False
+                continue
+            yield chunk.decode("utf-8", errors="replace")
+
+    async def _read_stderr_tail(self, stream: asyncio.StreamReader) -> str:
+        """Lee stderr completo conservando solo los últimos STDERR_TAIL_BYTES"""
+        tail = bytearray()
+        while True:
+            chunk = await stream.read(65536)
+            if not chunk:
+                break
+            tail += chunk
+            if len(tail) > STDERR_TAIL_BYTES:
+                del tail[:-STDERR_TAIL_BYTES]
+        return tail.decode("utf-8", errors="replace")
@@ -0,0 +1,125 @@
+"""
+Predicción de duraciones a partir del historial de escaneos.
+Cada escaneo terminado guarda su duración junto con el tamaño del target y el
+hash de sus opciones; al lanzar uno nuevo se calculan en PostgreSQL los
+percentiles de los escaneos recientes comparables para obtener:
+
+- la duración esperada (mediana), que alimenta el ETA del estado;
+- el timeout de la herramienta (percentil alto × margen), en lugar del valor
+  fijo de SCANNER_TIMEOUTS.
+
+Los escaneos PARTIAL (cortados por timeout) también cuentan: si un tamaño de
+target agota su timeout de forma repetida, el percentil sube y el siguiente
+escaneo recibe más tiempo (hasta SCANNER_TIMEOUTS × DURATION_TIMEOUT_MAX_FACTOR).
+"""
+
+import hashlib
+import ipaddress
+import json
+import math
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
+
+from app.core.scanner_config import (
+    SCANNER_TIMEOUTS,
+    DURATION_HISTORY_SAMPLES,
+    DURATION_MIN_SAMPLES,
+    DURATION_TIMEOUT_PERCENTILE,
+    DURATION_TIMEOUT_HEADROOM,
+    DURATION_TIMEOUT_MIN,
+    DURATION_TIMEOUT_MAX_FACTOR,
+)
+from app.models.scan import Scan, ScanStatus
+from app.services.scan_cache import normalize_target
+
+# Tope de la columna Integer (un /64 IPv6 no cabe)
+MAX_TARGET_SIZE = 2**31 - 1
+
+
+def target_size(target: str) -> int:
+    """Número de direcciones de un rango CIDR; 1 para IPs, dominios y URLs"""
+    try:
+        network = ipaddress.ip_network(normalize_target(target), strict=False)
+    except ValueError:
+        return 1
+    return min(network.num_addresses, MAX_TARGET_SIZE)
+
+
+def options_hash(options: Optional[Dict[str, Any]] = None) -> str:
+    """Hash sha256 canónico de las opciones del escaneo"""
+    options = {k: v for k, v in (options or {}).items() if v is not None}
+    payload = json.dumps(options, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def size_bounds(size: int) -> Tuple[int, int]:
+    """
+    Clase de tamaño en potencias de 2 con la que se compara un target:
+    un /24 (256 direcciones) se compara con targets de 129 a 256.
+    """
+    upper = 1 << max(size - 1, 0).bit_length()
+    return upper // 2 + 1, upper
+
+
+def stats_query(tool_name: str, size: int, options_digest: Optional[str] = None) -> Select:
+    """
+    (muestras, mediana, percentil alto) de la duración de los últimos
+    DURATION_HISTORY_SAMPLES escaneos comparables de la herramienta.
+    """
+    low, high = size_bounds(size)
+    conditions = [
+        Scan.tool_used == tool_name,
+        Scan.status.in_((ScanStatus.COMPLETED, ScanStatus.PARTIAL)),
+        Scan.duration.isnot(None),
+        Scan.target_size.between(low, high),
+    ]
+    if options_digest is not None:
+        conditions.append(Scan.options_hash == options_digest)
+
+    recent = (
+        select(Scan.duration)
+        .where(*conditions)
+        .order_by(Scan.completed_at.desc())
+        .limit(DURATION_HISTORY_SAMPLES)
+        .subquery()
+    )
+    return select(
+        func.count(),
+        func.percentile_cont(0.5).within_group(recent.c.duration),
+        func.percentile_cont(DURATION_TIMEOUT_PERCENTILE).within_group(recent.c.duration),
+    ).select_from(recent)
+
+
+def estimate_from_stats(
+    tool_name: str, stats: Tuple[int, Optional[float], Optional[float]]
+) -> Tuple[Optional[float], Optional[int]]:
+    """
+    (duración esperada, timeout) a partir de las estadísticas del historial.
+    Sin muestras suficientes: sin ETA y el timeout estático de la herramienta.
+    """
+    static = SCANNER_TIMEOUTS.get(tool_name)
+    samples, median, high = stats
+    if samples < DURATION_MIN_SAMPLES:
+        return None, static
+
+    timeout = max(DURATION_TIMEOUT_MIN, math.ceil(high * DURATION_TIMEOUT_HEADROOM))
+    if static is not None:
+        timeout = min(timeout, static * DURATION_TIMEOUT_MAX_FACTOR)
+    return float(median), int(timeout)
+
+
+async def estimate_duration(
+    db: AsyncSession, tool_name: str, size: int, options_digest: str
+) -> Tuple[Optional[float], Optional[int]]:
+    """
+    Predice duración y timeout de un escaneo: primero con el historial de las
+    mismas opciones y, si no alcanza, con el de cualquier opción de la herramienta.
+    """
+    for digest in (options_digest, None):
+        stats = (await db.execute(stats_query(tool_name, size, digest))).one()
+        if stats[0] >= DURATION_MIN_SAMPLES:
+            break
+    return estimate_from_stats(tool_name, tuple(stats))
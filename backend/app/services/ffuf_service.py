@@ -4,7 +4,7 @@ Usa ffuf para descubrimiento de directorios, archivos y parámetros ocultos.
 """
 
 import json
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from app.services.base_scanner import BaseScanner
 from app.core.scanner_config import TOOLS_DIR
 
@@ -19,6 +19,8 @@ WORDLISTS = {
 
 class FfufService(BaseScanner):
     tool_name = "ffuf"
+    streaming = True
+    records_key = "discovered"
 
     def build_command(self, target: str, **options) -> List[str]:
         # Asegurar que el target tenga FUZZ para inyección
@@ -28,8 +30,7 @@ class FfufService(BaseScanner):
         cmd = [
             self.binary_path,
             "-u", target,
-            "-o", "-",         # Output a stdout
-            "-of", "json",     # Formato JSON
+            "-json",           # Un resultado JSON por línea en stdout
             "-s",              # Silent
         ]
 
@@ -58,40 +59,46 @@ class FfufService(BaseScanner):
 
         return cmd
 
-    def parse_output(self, stdout: str, stderr: str) -> Dict[str, Any]:
-        discovered = []
+    def parse_record(self, line: str) -> Optional[Dict[str, Any]]:
+        line = line.strip()
+        if not line:
+            return None
+        try:
+            entry = json.loads(line)
+        except json.JSONDecodeError:
+            return None
+        return self._extract_entry(entry)
 
+    def parse_output(self, stdout: str, stderr: str) -> Dict[str, Any]:
+        # Documento JSON completo (-of json); si falla, parsear línea por línea
         try:
             data = json.loads(stdout)
-            results = data.get("results", [])
-
-            for entry in results:
-                discovered.append({
-                    "url": entry.get("url", ""),
-                    "status": entry.get("status", 0),
-                    "length": entry.get("length", 0),
-                    "words": entry.get("words", 0),
-                    "lines": entry.get("lines", 0),
-                    "content_type": entry.get("content-type", ""),
-                    "redirect_location": entry.get("redirectlocation", ""),
-                })
         except json.JSONDecodeError:
-            # Parsear línea por línea si el JSON global falla
-            for line in stdout.strip().split("\n"):
-                line = line.strip()
-                if not line:
-                    continue
-                try:
-                    entry = json.loads(line)
-                    discovered.append({
-                        "url": entry.get("url", ""),
-                        "status": entry.get("status", 0),
-                        "length": entry.get("length", 0),
-                    })
-                except json.JSONDecodeError:
-                    continue
+            return super().parse_output(stdout, stderr)
+
+        if isinstance(data, dict) and "results" in data:
+            entries = data.get("results") or []
+        else:
+            entries = [data]
+
+        return self.aggregate([
+            self._extract_entry(entry) for entry in entries if isinstance(entry, dict)
+        ])
+
+    def aggregate(self, records: List[Dict[str, Any]]) -> Dict[str, Any]:
+        return {
+            "discovered": records,
+            "count": len(records),
+        }
 
+    def _extract_entry(self, entry: dict) -> dict:
+        """Normaliza un resultado de ffuf"""
         return {
-            "discovered": discovered,
-            "count": len(discovered),
+            "url": entry.get("url", ""),
+            "status": entry.get("status", 0),
+            "length": entry.get("length", 0),
+            "words": entry.get("words", 0),
+            "lines": entry.get("lines", 0),
+            "content_type": entry.get("content-type", ""),
+            "redirect_location": entry.get("redirectlocation", ""),
         }
@@ -4,12 +4,14 @@ Usa httpx de ProjectDiscovery para probar endpoints HTTP y detectar tecnologías
 """
 
 import json
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from app.services.base_scanner import BaseScanner
 
 
 class HttpxService(BaseScanner):
     tool_name = "httpx"
+    streaming = True
+    records_key = "endpoints"
 
     def build_command(self, target: str, **options) -> List[str]:
         cmd = [
@@ -41,30 +43,29 @@ class HttpxService(BaseScanner):
 
         return cmd
 
-    def parse_output(self, stdout: str, stderr: str) -> Dict[str, Any]:
-        results = []
+    def parse_record(self, line: str) -> Optional[Dict[str, Any]]:
+        line = line.strip()
+        if not line:
+            return None
+        try:
+            data = json.loads(line)
+        except json.JSONDecodeError:
+            return None
 
-        for line in stdout.strip().split("\n"):
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                data = json.loads(line)
-                results.append({
-                    "url": data.get("url", ""),
-                    "status_code": data.get("status_code", 0),
-                    "title": data.get("title", ""),
-                    "tech": data.get("tech", []),
-                    "content_type": data.get("content_type", ""),
-                    "content_length": data.get("content_length", 0),
-                    "webserver": data.get("webserver", ""),
-                    "cdn": data.get("cdn", False),
-                    "host": data.get("host", ""),
-                })
-            except json.JSONDecodeError:
-                continue
+        return {
+            "url": data.get("url", ""),
+            "status_code": data.get("status_code", 0),
+            "title": data.get("title", ""),
+            "tech": data.get("tech", []),
+            "content_type": data.get("content_type", ""),
+            "content_length": data.get("content_length", 0),
+            "webserver": data.get("webserver", ""),
+            "cdn": data.get("cdn", False),
+            "host": data.get("host", ""),
+        }
 
+    def aggregate(self, records: List[Dict[str, Any]]) -> Dict[str, Any]:
         return {
-            "endpoints": results,
-            "count": len(results),
+            "endpoints": records,
+            "count": len(records),
         }
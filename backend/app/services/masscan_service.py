@@ -5,12 +5,14 @@ Usa masscan para detectar puertos abiertos a alta velocidad.
 
 import re
 import json
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from app.services.base_scanner import BaseScanner
 
 
 class MasscanService(BaseScanner):
     tool_name = "masscan"
+    streaming = True
+    records_key = "open_ports"
 
     def build_command(self, target: str, **options) -> List[str]:
         cmd = [self.binary_path]
@@ -31,40 +33,40 @@ class MasscanService(BaseScanner):
 
         return cmd
 
-    def parse_output(self, stdout: str, stderr: str) -> Dict[str, Any]:
-        open_ports = []
+    def parse_record(self, line: str) -> Optional[Dict[str, Any]]:
+        # Masscan produce un array JSON con un host por línea y comas finales
+        line = line.strip().rstrip(",")
+        if not line or line in ("[", "]"):
+            return None
 
-        # Masscan produce JSON con comas finales, intentar parsear
-        try:
-            # Limpiar output de masscan (a veces tiene formato irregular)
-            cleaned = stdout.strip()
-            if cleaned.startswith("["):
-                # Remover coma final antes de ]
-                cleaned = re.sub(r",\s*]", "]", cleaned)
-                data = json.loads(cleaned)
-                for entry in data:
-                    port_info = entry.get("ports", [{}])[0]
-                    open_ports.append({
-                        "ip": entry.get("ip", ""),
-                        "port": port_info.get("port", 0),
-                        "protocol": port_info.get("proto", "tcp"),
-                        "status": port_info.get("status", "open"),
-                    })
-        except (json.JSONDecodeError, IndexError):
-            # Fallback: parsear formato texto
-            for line in stdout.split("\n"):
-                match = re.search(
-                    r"Discovered open port (\d+)/(tcp|udp) on ([\d.]+)", line
-                )
-                if match:
-                    open_ports.append({
-                        "port": int(match.group(1)),
-                        "protocol": match.group(2),
-                        "ip": match.group(3),
-                        "status": "open",
-                    })
+        if line.startswith("{"):
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                return None
+            port_info = (entry.get("ports") or [{}])[0]
+            return {
+                "ip": entry.get("ip", ""),
+                "port": port_info.get("port", 0),
+                "protocol": port_info.get("proto", "tcp"),
+                "status": port_info.get("status", "open"),
+            }
 
+        # Fallback: parsear formato texto
+        match = re.search(
+            r"Discovered open port (\d+)/(tcp|udp) on ([\d.]+)", line
+        )
+        if match:
+            return {
+                "port": int(match.group(1)),
+                "protocol": match.group(2),
+                "ip": match.group(3),
+                "status": "open",
+            }
+        return None
+
+    def aggregate(self, records: List[Dict[str, Any]]) -> Dict[str, Any]:
         return {
-            "open_ports": open_ports,
-            "count": len(open_ports),
+            "open_ports": records,
+            "count": len(records),
         }
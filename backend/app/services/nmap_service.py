@@ -3,14 +3,25 @@ NmapService - Enumeración profunda de servicios y versiones.
 Usa Nmap para detección de servicios, versiones y scripts NSE.
 """
 
+import logging
 import re
 import xml.etree.ElementTree as ET
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Iterator, Optional
 from app.services.base_scanner import BaseScanner
 
+logger = logging.getLogger(__name__)
+
+# Línea de puerto en la salida de texto de nmap
+TEXT_PORT_RE = re.compile(r"(\d+)/(tcp|udp)\s+(\w+)\s+(\S+)(?:\s+(.*))?")
+
+# Tamaño de bloque al parsear una salida XML ya capturada
+FEED_CHUNK_SIZE = 64 * 1024
+
 
 class NmapService(BaseScanner):
     tool_name = "nmap"
+    streaming = True
+    records_key = "hosts"
 
     def build_command(self, target: str, **options) -> List[str]:
         cmd = [self.binary_path]
@@ -38,96 +49,146 @@ class NmapService(BaseScanner):
 
         return cmd
 
+    def start_stream(self) -> None:
+        # Parser XML incremental: cada <host> se emite al cerrarse y se libera
+        self._parser = ET.XMLPullParser(events=("start", "end"))
+        self._root = None
+        self._hosts_seen = 0
+        self._xml_failed = False
+
+    def iter_records(self, line: str) -> Iterator[Dict[str, Any]]:
+        if self._xml_failed:
+            # La salida no es XML: parsear puertos en texto plano línea a línea
+            port = self._parse_text_line(line)
+            if port is not None:
+                yield {"ports": [port]}
+            return
+        yield from self._feed(line)
+
+    def _feed(self, data: str) -> Iterator[Dict[str, Any]]:
+        """Alimenta el parser XML y devuelve los hosts que se completaron"""
+        try:
+            self._parser.feed(data)
+            for event, elem in self._parser.read_events():
+                if event == "start":
+                    if self._root is None:
+                        self._root = elem
+                    continue
+                if elem.tag == "host":
+                    self._hosts_seen += 1
+                    yield self._host_record(elem)
+                    # Liberar el host ya procesado (memoria acotada a un host)
+                    self._root.clear()
+        except ET.ParseError as e:
+            self._xml_failed = True
+            if self._hosts_seen:
+                logger.warning(f"[nmap] XML truncado tras {self._hosts_seen} hosts: {e}")
+            else:
+                yield from self.iter_records(data)
+
     def parse_output(self, stdout: str, stderr: str) -> Dict[str, Any]:
+        self.start_stream()
         hosts = []
+        # Alimentar por bloques: la salida ya está completa en memoria
+        for i in range(0, len(stdout), FEED_CHUNK_SIZE):
+            if self._xml_failed:
+                break
+            hosts.extend(self._feed(stdout[i:i + FEED_CHUNK_SIZE]))
 
-        try:
-            root = ET.fromstring(stdout)
-
-            for host_elem in root.findall("host"):
-                host_data = {
-                    "status": "unknown",
-                    "addresses": [],
-                    "hostnames": [],
-                    "ports": [],
-                    "os": [],
-                }
-
-                # Estado del host
-                status = host_elem.find("status")
-                if status is not None:
-                    host_data["status"] = status.get("state", "unknown")
-
-                # Direcciones
-                for addr in host_elem.findall("address"):
-                    host_data["addresses"].append({
-                        "addr": addr.get("addr", ""),
-                        "type": addr.get("addrtype", ""),
-                    })
-
-                # Hostnames
-                hostnames_elem = host_elem.find("hostnames")
-                if hostnames_elem is not None:
-                    for hn in hostnames_elem.findall("hostname"):
-                        host_data["hostnames"].append({
-                            "name": hn.get("name", ""),
-                            "type": hn.get("type", ""),
-                        })
-
-                # Puertos y servicios
-                ports_elem = host_elem.find("ports")
-                if ports_elem is not None:
-                    for port in ports_elem.findall("port"):
-                        state = port.find("state")
-                        service = port.find("service")
-
-                        port_data = {
-                            "port": int(port.get("portid", 0)),
-                            "protocol": port.get("protocol", "tcp"),
-                            "state": state.get("state", "") if state is not None else "",
-                            "service": service.get("name", "") if service is not None else "",
-                            "version": service.get("version", "") if service is not None else "",
-                            "product": service.get("product", "") if service is not None else "",
-                        }
-                        host_data["ports"].append(port_data)
-
-                # Detección de SO
-                os_elem = host_elem.find("os")
-                if os_elem is not None:
-                    for osmatch in os_elem.findall("osmatch"):
-                        host_data["os"].append({
-                            "name": osmatch.get("name", ""),
-                            "accuracy": osmatch.get("accuracy", ""),
-                        })
-
-                hosts.append(host_data)
-
-        except ET.ParseError:
+        if self._xml_failed and not self._hosts_seen:
             # Fallback: parseo de texto plano
             return self._parse_text_output(stdout)
 
+        return self.aggregate(hosts)
+
+    def _host_record(self, host_elem: ET.Element) -> Dict[str, Any]:
+        """Convierte un elemento <host> en un registro"""
+        host_data = {
+            "status": "unknown",
+            "addresses": [],
+            "hostnames": [],
+            "ports": [],
+            "os": [],
+        }
+
+        # Estado del host
+        status = host_elem.find("status")
+        if status is not None:
+            host_data["status"] = status.get("state", "unknown")
+
+        # Direcciones
+        for addr in host_elem.findall("address"):
+            host_data["addresses"].append({
+                "addr": addr.get("addr", ""),
+                "type": addr.get("addrtype", ""),
+            })
+
+        # Hostnames
+        hostnames_elem = host_elem.find("hostnames")
+        if hostnames_elem is not None:
+            for hn in hostnames_elem.findall("hostname"):
+                host_data["hostnames"].append({
+                    "name": hn.get("name", ""),
+                    "type": hn.get("type", ""),
+                })
+
+        # Puertos y servicios
+        ports_elem = host_elem.find("ports")
+        if ports_elem is not None:
+            for port in ports_elem.findall("port"):
+                state = port.find("state")
+                service = port.find("service")
+
+                port_data = {
+                    "port": int(port.get("portid", 0)),
+                    "protocol": port.get("protocol", "tcp"),
+                    "state": state.get("state", "") if state is not None else "",
+                    "service": service.get("name", "") if service is not None else "",
+                    "version": service.get("version", "") if service is not None else "",
+                    "product": service.get("product", "") if service is not None else "",
+                }
+                host_data["ports"].append(port_data)
+
+        # Detección de SO
+        os_elem = host_elem.find("os")
+        if os_elem is not None:
+            for osmatch in os_elem.findall("osmatch"):
+                host_data["os"].append({
+                    "name": osmatch.get("name", ""),
+                    "accuracy": osmatch.get("accuracy", ""),
+                })
+
+        return host_data
+
+    def aggregate(self, records: List[Dict[str, Any]]) -> Dict[str, Any]:
         return {
-            "hosts": hosts,
-            "host_count": len(hosts),
+            "hosts": records,
+            "host_count": len(records),
         }
 
     def _parse_text_output(self, output: str) -> Dict[str, Any]:
         """Parseo fallback cuando el XML falla"""
         ports = []
         for line in output.split("\n"):
-            match = re.search(
-                r"(\d+)/(tcp|udp)\s+(\w+)\s+(\S+)(?:\s+(.*))?", line
-            )
-            if match:
-                ports.append({
-                    "port": int(match.group(1)),
-                    "protocol": match.group(2),
-                    "state": match.group(3),
-                    "service": match.group(4),
-                    "version": match.group(5) or "",
-                })
+            port = self._parse_text_line(line)
+            if port is not None:
+                ports.append(port)
 
         return {
             "hosts": [{"ports": ports}],
             "host_count": 1,
         }
+
+    @staticmethod
+    def _parse_text_line(line: str) -> Optional[Dict[str, Any]]:
+        """Puerto de una línea de la salida normal de nmap (80/tcp open http ...)"""
+        match = TEXT_PORT_RE.search(line)
+        if not match:
+            return None
+        return {
+            "port": int(match.group(1)),
+            "protocol": match.group(2),
+            "state": match.group(3),
+            "service": match.group(4),
+            "version": match.group(5) or "",
+        }
@@ -0,0 +1,236 @@
+"""
+Normalización de hallazgos.
+Convierte los registros que produce cada scanner en filas de las tablas
+normalizadas (app/models/findings.py) y los inserta por lotes junto con
+el registro crudo en ScanFinding.
+"""
+
+from collections import defaultdict
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, Tuple, Type
+from urllib.parse import urlsplit
+
+from sqlalchemy import String, insert
+from sqlalchemy.orm import Session
+
+from app.db.base import Base
+from app.models.findings import (
+    Host, OpenPort, Service, Subdomain, HttpEndpoint, Vulnerability, TlsFinding
+)
+from app.models.scan import ScanFinding
+from app.services.testssl_service import TestSSLService
+
+Row = Tuple[Type[Base], Dict[str, Any]]
+
+
+def _subfinder(record: Dict[str, Any]) -> List[Row]:
+    return [(Subdomain, {
+        "name": record["host"],
+        "domain": record.get("input"),
+        "source": record.get("source"),
+    })]
+
+
+def _amass(record: Dict[str, Any]) -> List[Row]:
+    rows: List[Row] = [(Subdomain, {
+        "name": record["name"],
+        "domain": record.get("domain") or None,
+        "source": record.get("source") or None,
+    })]
+    for address in record.get("addresses") or []:
+        ip = address.get("ip") if isinstance(address, dict) else None
+        if ip:
+            rows.append((Host, {"address": ip, "hostname": record["name"]}))
+    return rows
+
+
+def _open_port(record: Dict[str, Any]) -> List[Row]:
+    return [(OpenPort, {
+        "ip": record.get("ip", ""),
+        "port": int(record.get("port") or 0),
+        "protocol": record.get("protocol") or "tcp",
+        "state": record.get("status") or "open",
+    })]
+
+
+def _nmap(record: Dict[str, Any]) -> List[Row]:
+    addresses = record.get("addresses") or []
+    hostnames = record.get("hostnames") or []
+    os_matches = record.get("os") or []
+    ip = addresses[0]["addr"] if addresses else ""
+
+    rows: List[Row] = []
+    if ip:
+        rows.append((Host, {
+            "address": ip,
+            "hostname": hostnames[0]["name"] if hostnames else None,
+            "status": record.get("status"),
+            "os": os_matches[0]["name"] if os_matches else None,
+        }))
+
+    for port in record.get("ports") or []:
+        base = {
+            "ip": ip,
+            "port": int(port.get("port") or 0),
+            "protocol": port.get("protocol") or "tcp",
+        }
+        rows.append((OpenPort, {**base, "state": port.get("state") or "unknown"}))
+        if port.get("service"):
+            rows.append((Service, {
+                **base,
+                "name": port["service"],
+                "product": port.get("product") or None,
+                "version": port.get("version") or None,
+            }))
+    return rows
+
+
+def _httpx(record: Dict[str, Any]) -> List[Row]:
+    return [(HttpEndpoint, {
+        "url": record.get("url", ""),
+        "host": record.get("host") or urlsplit(record.get("url", "")).hostname,
+        "status_code": record.get("status_code") or None,
+        "title": record.get("title") or None,
+        "webserver": record.get("webserver") or None,
+        "content_type": record.get("content_type") or None,
+        "content_length": record.get("content_length") or None,
+        "tech": record.get("tech") or None,
+    })]
+
+
+def _ffuf(record: Dict[str, Any]) -> List[Row]:
+    return [(HttpEndpoint, {
+        "url": record.get("url", ""),
+        "host": urlsplit(record.get("url", "")).hostname,
+        "status_code": record.get("status") or None,
+        "content_type": record.get("content_type") or None,
+        "content_length": record.get("length") or None,
+    })]
+
+
+def _whatweb(record: Dict[str, Any]) -> List[Row]:
+    return [(HttpEndpoint, {
+        "url": record.get("target", ""),
+        "host": urlsplit(record.get("target", "")).hostname,
+        "status_code": record.get("http_status") or None,
+        "tech": [plugin["name"] for plugin in record.get("plugins") or []],
+    })]
+
+
+def _nuclei(record: Dict[str, Any]) -> List[Row]:
+    return [(Vulnerability, {
+        "template_id": record.get("template_id", ""),
+        "name": record.get("name") or None,
+        "severity": (record.get("severity") or "unknown").lower(),
+        "host": record.get("host") or None,
+        "matched_at": record.get("matched_at") or None,
+        "description": record.get("description") or None,
+        "tags": record.get("tags") or None,
+    })]
+
+
+def _testssl(record: Dict[str, Any]) -> List[Row]:
+    if "id" not in record:
+        # Salida en texto plano sin estructura
+        return []
+    return [(TlsFinding, {
+        "finding_id": record["id"],
+        "category": TestSSLService.classify(record),
+        "severity": record.get("severity") or None,
+        "finding": record.get("finding") or None,
+    })]
+
+
+NORMALIZERS: Dict[str, Callable[[Dict[str, Any]], List[Row]]] = {
+    "subfinder": _subfinder,
+    "amass": _amass,
+    "masscan": _open_port,
+    "rustscan": _open_port,
+    "nmap": _nmap,
+    "httpx": _httpx,
+    "whatweb": _whatweb,
+    "nuclei": _nuclei,
+    "ffuf": _ffuf,
+    "testssl": _testssl,
+}
+
+
+def normalize(tool_name: str, records: Iterable[Dict[str, Any]]) -> Dict[Type[Base], List[Dict[str, Any]]]:
+    """Agrupa por modelo las filas normalizadas de una lista de registros"""
+    normalizer = NORMALIZERS.get(tool_name)
+    rows: Dict[Type[Base], List[Dict[str, Any]]] = defaultdict(list)
+    if normalizer is None:
+        return rows
+
+    for record in records:
+        for model, values in normalizer(record):
+            rows[model].append(values)
+    return rows
+
+
+def strip_nul(value: Any) -> Any:
+    """
+    Copia de `value` sin caracteres NUL. PostgreSQL los rechaza en text y en
+    jsonb (\\u0000), y aparecen en banners y respuestas que controla el target.
+    """
+    if isinstance(value, str):
+        return value.replace("\x00", "") if "\x00" in value else value
+    if isinstance(value, dict):
+        return {strip_nul(key): strip_nul(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [strip_nul(item) for item in value]
+    return value
+
+
+@lru_cache(maxsize=None)
+def _column_limits(model: Type[Base]) -> Dict[str, int]:
+    """Longitud máxima de cada columna String(n) del modelo"""
+    return {
+        column.name: column.type.length
+        for column in model.__table__.columns
+        if isinstance(column.type, String) and column.type.length
+    }
+
+
+def _fit(model: Type[Base], row: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Recorta los valores que exceden su columna: banners, cabeceras Server o
+    ids de plantilla los controla el target, y uno demasiado largo haría
+    fallar el INSERT del lote entero (y con él el escaneo).
+    """
+    for name, limit in _column_limits(model).items():
+        value = row.get(name)
+        if isinstance(value, str) and len(value) > limit:
+            row[name] = value[:limit]
+    return row
+
+
+def insert_normalized(
+    session: Session, scan_id: int, tool_name: str, records: List[Dict[str, Any]]
+) -> None:
+    """Inserta por lotes las filas normalizadas de los registros, agrupadas por tabla"""
+    for model, rows in normalize(tool_name, records).items():
+        session.execute(insert(model), [_fit(model, {"scan_id": scan_id, **row}) for row in rows])
+
+
+def insert_records(
+    session: Session, scan_id: int, tool_name: str, records: List[Dict[str, Any]]
+) -> int:
+    """
+    Inserta por lotes los registros crudos (ScanFinding) y sus filas normalizadas.
+    No hace commit: la transacción la controla quien llama.
+    """
+    if not records:
+        return 0
+
+    records = strip_nul(records)
+    session.execute(insert(ScanFinding), [
+        {
+            "scan_id": scan_id,
+            "tool": tool_name,
+            "data": record,
+        }
+        for record in records
+    ])
+    insert_normalized(session, scan_id, tool_name, records)
+    return len(records)
@@ -4,12 +4,14 @@ Usa Nuclei de ProjectDiscovery para detectar CVEs, misconfigs, y vulnerabilidade
 """
 
 import json
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from app.services.base_scanner import BaseScanner
 
 
 class NucleiService(BaseScanner):
     tool_name = "nuclei"
+    streaming = True
+    records_key = "vulnerabilities"
 
     def build_command(self, target: str, **options) -> List[str]:
         cmd = [
@@ -43,34 +45,31 @@ class NucleiService(BaseScanner):
 
         return cmd
 
-    def parse_output(self, stdout: str, stderr: str) -> Dict[str, Any]:
-        vulnerabilities = []
+    def parse_record(self, line: str) -> Optional[Dict[str, Any]]:
+        line = line.strip()
+        if not line:
+            return None
+        try:
+            data = json.loads(line)
+        except json.JSONDecodeError:
+            return None
 
-        for line in stdout.strip().split("\n"):
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                data = json.loads(line)
-                info = data.get("info", {})
-
-                vuln = {
-                    "template_id": data.get("template-id", ""),
-                    "name": info.get("name", ""),
-                    "severity": info.get("severity", "unknown"),
-                    "description": info.get("description", ""),
-                    "tags": info.get("tags", []),
-                    "reference": info.get("reference", []),
-                    "matched_at": data.get("matched-at", ""),
-                    "matcher_name": data.get("matcher-name", ""),
-                    "type": data.get("type", ""),
-                    "host": data.get("host", ""),
-                    "curl_command": data.get("curl-command", ""),
-                }
-                vulnerabilities.append(vuln)
-            except json.JSONDecodeError:
-                continue
+        info = data.get("info", {})
+        return {
+            "template_id": data.get("template-id", ""),
+            "name": info.get("name", ""),
+            "severity": info.get("severity", "unknown"),
+            "description": info.get("description", ""),
+            "tags": info.get("tags", []),
+            "reference": info.get("reference", []),
+            "matched_at": data.get("matched-at", ""),
+            "matcher_name": data.get("matcher-name", ""),
+            "type": data.get("type", ""),
+            "host": data.get("host", ""),
+            "curl_command": data.get("curl-command", ""),
+        }
 
+    def aggregate(self, records: List[Dict[str, Any]]) -> Dict[str, Any]:
         # Agrupar por severidad
         by_severity = {
             "critical": [],
@@ -79,14 +78,14 @@ class NucleiService(BaseScanner):
             "low": [],
             "info": [],
         }
-        for v in vulnerabilities:
+        for v in records:
             sev = v.get("severity", "info").lower()
             if sev in by_severity:
                 by_severity[sev].append(v)
 
         return {
-            "vulnerabilities": vulnerabilities,
-            "count": len(vulnerabilities),
+            "vulnerabilities": records,
+            "count": len(records),
             "by_severity": {k: len(v) for k, v in by_severity.items()},
             "details_by_severity": by_severity,
         }
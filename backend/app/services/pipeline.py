@@ -0,0 +1,330 @@
+"""
+ReconPipeline - Escaneo completo (ScanType.FULL) como un DAG de etapas.
+subdominios → puertos → servicios → web → vulnerabilidades
+
+Cada etapa consume una cola y alimenta la siguiente en cuanto su herramienta
+emite un resultado (no espera a que termine la etapa anterior completa). Los
+puertos abiertos de cada host se agrupan en lotes (PIPELINE_PORT_BATCH_SIZE /
+PIPELINE_PORT_BATCH_WINDOW) y cada lote es una sola ejecución de nmap.
+El paralelismo de cada etapa se limita con PIPELINE_STAGE_CONCURRENCY, y cada
+herramienta respeta además su límite por proceso (SCANNER_CONCURRENCY).
+"""
+
+import asyncio
+import inspect
+import ipaddress
+import logging
+import socket
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+from app.core.scanner_config import (
+    DEFAULT_TIMEOUT_MODE,
+    PIPELINE_PORT_BATCH_SIZE,
+    PIPELINE_PORT_BATCH_WINDOW,
+    PIPELINE_STAGE_CONCURRENCY,
+)
+from app.services import worker_loop
+from app.services.base_scanner import BaseScanner
+
+logger = logging.getLogger(__name__)
+
+# Puertos que se consideran HTTP aunque nmap no identifique el servicio
+WEB_PORTS = {80, 443, 591, 3000, 5000, 8000, 8008, 8080, 8081, 8443, 8888, 9443}
+HTTPS_PORTS = {443, 8443, 9443}
+
+# Marca de fin de cola
+_DONE = object()
+
+# Opciones del usuario que acepta el pipeline; quien lo crea descarta el resto
+# (una clave como `on_record` chocaría con los argumentos del constructor)
+PIPELINE_OPTIONS = {
+    "subdomain_tool", "port_tool", "ports", "severity",
+    "include_vulns", "tool_options", "timeout_mode",
+}
+
+# Callback de persistencia: (herramienta, registro) -> None | awaitable
+PipelineRecordCallback = Callable[[str, Dict[str, Any]], Optional[Awaitable[None]]]
+
+
+class ReconPipeline:
+    """
+    Orquesta las herramientas de reconocimiento sobre un dominio o IP.
+    Los registros de todas las etapas se entregan a `on_record` junto con
+    el nombre de la herramienta que los produjo.
+    """
+
+    def __init__(
+        self,
+        target: str,
+        scanner_factory: Callable[[str], BaseScanner],
+        on_record: Optional[PipelineRecordCallback] = None,
+        **options,
+    ):
+        self.target = target
+        self.scanner_factory = scanner_factory
+        self.on_record = on_record
+
+        self.subdomain_tool = options.get("subdomain_tool", "subfinder")
+        self.port_tool = options.get("port_tool", "rustscan")
+        self.ports = options.get("ports")
+        self.severity = options.get("severity", "medium,high,critical")
+        self.include_vulns = options.get("include_vulns", True)
+        self.tool_options: Dict[str, Dict[str, Any]] = options.get("tool_options", {})
+        self.timeout_mode = options.get("timeout_mode", DEFAULT_TIMEOUT_MODE)
+
+        self.records: Dict[str, List[Dict[str, Any]]] = {}
+        self.errors: List[Dict[str, str]] = []
+        # Ejecuciones que vencieron su timeout y aportaron resultados parciales
+        self.timed_out: List[Dict[str, Any]] = []
+
+        # Colas de entrada de cada etapa y elementos ya encolados (deduplicación)
+        self.queues = {
+            "ports": asyncio.Queue(),
+            "services": asyncio.Queue(),
+            "web": asyncio.Queue(),
+            "vuln": asyncio.Queue(),
+        }
+        self.seen: Dict[str, Set[Any]] = {stage: set() for stage in self.queues}
+
+        # Puertos abiertos por host y lote pendiente de pasar a nmap
+        self.open_ports: Dict[str, Set[str]] = {}
+        self.port_batches: Dict[str, List[str]] = {}
+        self.batch_timers: Dict[str, asyncio.TimerHandle] = {}
+
+    # ─────────────── Ejecución ───────────────
+
+    async def run(self) -> Dict[str, Any]:
+        """Ejecuta todas las etapas y devuelve los resultados agregados"""
+        stages = [
+            ("ports", self._scan_ports, "services"),
+            ("services", self._scan_services, "web"),
+            ("web", self._probe_web, "vuln"),
+        ]
+        if self.include_vulns:
+            stages.append(("vuln", self._scan_vulns, None))
+
+        workers = [
+            asyncio.create_task(self._run_stage(stage, handler, downstream))
+            for stage, handler, downstream in stages
+        ]
+
+        # Etapa inicial: el propio target y sus subdominios
+        self._emit("ports", self.target)
+        if not self._is_ip(self.target):
+            await self._discover_subdomains()
+        self.queues["ports"].put_nowait(_DONE)
+
+        await asyncio.gather(*workers)
+        return self._build_result()
+
+    async def _run_stage(
+        self,
+        stage: str,
+        handler: Callable[[Any], Awaitable[None]],
+        downstream: Optional[str],
+    ) -> None:
+        """Lanza los workers de una etapa y propaga el fin de cola"""
+        inbox = self.queues[stage]
+
+        async def worker():
+            while True:
+                item = await inbox.get()
+                if item is _DONE:
+                    # Devolver la marca para el resto de workers de la etapa
+                    inbox.put_nowait(_DONE)
+                    return
+                try:
+                    await handler(item)
+                except Exception as e:
+                    logger.warning(f"[pipeline:{stage}] Error procesando {item}: {e}")
+                    self.errors.append({"stage": stage, "item": str(item), "error": str(e)})
+
+        concurrency = PIPELINE_STAGE_CONCURRENCY.get(stage, 1)
+        await asyncio.gather(*[worker() for _ in range(concurrency)])
+
+        if downstream is not None and downstream in self.queues:
+            self.queues[downstream].put_nowait(_DONE)
+
+    def _emit(self, stage: str, item: Any) -> None:
+        """Encola un elemento en una etapa si no se había encolado antes"""
+        if stage not in self.queues or item in self.seen[stage]:
+            return
+        self.seen[stage].add(item)
+        self.queues[stage].put_nowait(item)
+
+    async def _run_tool(
+        self,
+        tool: str,
+        target: str,
+        on_record: Optional[Callable[[Dict[str, Any]], None]] = None,
+        **options,
+    ) -> Dict[str, Any]:
+        """Ejecuta una herramienta guardando y reenviando cada registro"""
+        scanner = self.scanner_factory(tool)
+        records = self.records.setdefault(tool, [])
+
+        async def collect(record: Dict[str, Any]) -> None:
+            records.append(record)
+            if self.on_record is not None:
+                ret = self.on_record(tool, record)
+                if inspect.isawaitable(ret):
+                    await ret
+            if on_record is not None:
+                on_record(record)
+
+        options = {"timeout_mode": self.timeout_mode, **self.tool_options.get(tool, {}), **options}
+        # Mismo límite por herramienta que las tareas de escaneo del proceso
+        result = await worker_loop.supervised(
+            tool, scanner.execute(target, on_record=collect, **options)
+        )
+
+        meta = result.get("_meta", {})
+        if meta.get("partial"):
+            self.timed_out.append({"tool": tool, "target": target, **meta.get("coverage", {})})
+        return result
+
+    # ─────────────── Etapas ───────────────
+
+    async def _discover_subdomains(self) -> None:
+        def forward(record):
+            host = record.get("host") or record.get("name")
+            if host:
+                self._emit("ports", host)
+
+        try:
+            await self._run_tool(self.subdomain_tool, self.target, forward)
+        except Exception as e:
+            logger.warning(f"[pipeline:subdomain] Error en {self.target}: {e}")
+            self.errors.append({"stage": "subdomain", "item": self.target, "error": str(e)})
+
+    async def _scan_ports(self, host: str) -> None:
+        target = host
+        if self.port_tool == "masscan" and not self._is_ip(host):
+            # masscan solo acepta direcciones IP
+            target = await self._resolve(host)
+            if target is None:
+                return
+
+        def forward(record):
+            if record.get("port"):
+                self._add_port(host, str(int(record["port"])))
+
+        options = {"ports": self.ports} if self.ports else {}
+        try:
+            await self._run_tool(self.port_tool, target, forward, **options)
+        finally:
+            # El resto de puertos del host no espera a que venza la ventana
+            self._flush_ports(host)
+
+    def _add_port(self, host: str, port: str) -> None:
+        """Añade un puerto abierto al lote del host y lo lanza si se llena"""
+        ports = self.open_ports.setdefault(host, set())
+        if port in ports:
+            return
+        ports.add(port)
+
+        batch = self.port_batches.setdefault(host, [])
+        batch.append(port)
+        if len(batch) >= PIPELINE_PORT_BATCH_SIZE:
+            self._flush_ports(host)
+        elif host not in self.batch_timers:
+            loop = asyncio.get_running_loop()
+            self.batch_timers[host] = loop.call_later(
+                PIPELINE_PORT_BATCH_WINDOW, self._flush_ports, host
+            )
+
+    def _flush_ports(self, host: str) -> None:
+        """Encola el lote pendiente del host como una ejecución de nmap"""
+        timer = self.batch_timers.pop(host, None)
+        if timer is not None:
+            timer.cancel()
+        batch = self.port_batches.pop(host, None)
+        if batch:
+            self.queues["services"].put_nowait((host, ",".join(batch)))
+
+    async def _scan_services(self, item) -> None:
+        host, ports = item
+
+        def forward(record):
+            for port in record.get("ports", []):
+                if port.get("state") != "open":
+                    continue
+                url = self._web_url(host, port)
+                if url:
+                    self._emit("web", url)
+
+        await self._run_tool("nmap", host, forward, ports=ports, scan_type="version")
+
+    async def _probe_web(self, url: str) -> None:
+        def forward(record):
+            if record.get("status_code") and record.get("url"):
+                self._emit("vuln", record["url"])
+
+        await self._run_tool("httpx", url, forward)
+
+    async def _scan_vulns(self, url: str) -> None:
+        await self._run_tool("nuclei", url, severity=self.severity)
+
+    # ─────────────── Utilidades ───────────────
+
+    @staticmethod
+    def _is_ip(value: str) -> bool:
+        try:
+            ipaddress.ip_address(value)
+            return True
+        except ValueError:
+            return False
+
+    @staticmethod
+    async def _resolve(host: str) -> Optional[str]:
+        loop = asyncio.get_running_loop()
+        try:
+            infos = await loop.getaddrinfo(host, None)
+        except OSError:
+            return None
+        for family, _, _, _, sockaddr in infos:
+            if family == socket.AF_INET:
+                return sockaddr[0]
+        return None
+
+    @staticmethod
+    def _web_url(host: str, port: Dict[str, Any]) -> Optional[str]:
+        """Construye la URL de un puerto HTTP(S), o None si no lo es"""
+        number = port.get("port")
+        service = (port.get("service") or "").lower()
+        if "http" not in service and number not in WEB_PORTS:
+            return None
+
+        https = number in HTTPS_PORTS or "https" in service or "ssl" in service
+        scheme = "https" if https else "http"
+        if (scheme, number) in (("http", 80), ("https", 443)):
+            return f"{scheme}://{host}"
+        return f"{scheme}://{host}:{number}"
+
+    def _build_result(self) -> Dict[str, Any]:
+        stages = {
+            tool: self.scanner_factory(tool).aggregate(records)
+            for tool, records in self.records.items()
+        }
+        meta = {
+            "tool": "pipeline",
+            "target": self.target,
+            "timestamp": datetime.utcnow().isoformat(),
+        }
+        if self.timed_out:
+            meta["partial"] = True
+            meta["coverage"] = {"reason": "timeout", "timed_out": self.timed_out}
+
+        return {
+            "stages": stages,
+            "summary": {
+                "hosts": len(self.seen["ports"]),
+                "hosts_with_open_ports": len(self.open_ports),
+                "web_services": len(self.seen["web"]),
+                "live_endpoints": len(self.seen["vuln"]),
+                "vulnerabilities": len(self.records.get("nuclei", [])),
+            },
+            "errors": self.errors,
+            "_meta": meta,
+        }
@@ -4,12 +4,14 @@ Usa RustScan para descubrimiento ultrarrápido de puertos.
 """
 
 import re
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Iterator
 from app.services.base_scanner import BaseScanner
 
 
 class RustScanService(BaseScanner):
     tool_name = "rustscan"
+    streaming = True
+    records_key = "open_ports"
 
     def build_command(self, target: str, **options) -> List[str]:
         cmd = [
@@ -33,30 +35,28 @@ class RustScanService(BaseScanner):
 
         return cmd
 
-    def parse_output(self, stdout: str, stderr: str) -> Dict[str, Any]:
-        open_ports = []
-
-        for line in stdout.strip().split("\n"):
-            line = line.strip()
-            if not line:
-                continue
-
-            # Formato greppable: IP -> [ports]
-            match = re.search(r"([\d.]+)\s*->\s*\[(.+)\]", line)
-            if match:
-                ip = match.group(1)
-                ports_str = match.group(2)
-                for port in ports_str.split(","):
-                    port = port.strip()
-                    if port.isdigit():
-                        open_ports.append({
-                            "ip": ip,
-                            "port": int(port),
-                            "protocol": "tcp",
-                            "status": "open",
-                        })
-
+    def iter_records(self, line: str) -> Iterator[Dict[str, Any]]:
+        line = line.strip()
+        if not line:
+            return
+
+        # Formato greppable: IP -> [ports]
+        match = re.search(r"([\d.]+)\s*->\s*\[(.+)\]", line)
+        if match:
+            ip = match.group(1)
+            ports_str = match.group(2)
+            for port in ports_str.split(","):
+                port = port.strip()
+                if port.isdigit():
+                    yield {
+                        "ip": ip,
+                        "port": int(port),
+                        "protocol": "tcp",
+                        "status": "open",
+                    }
+
+    def aggregate(self, records: List[Dict[str, Any]]) -> Dict[str, Any]:
         return {
-            "open_ports": open_ports,
-            "count": len(open_ports),
+            "open_ports": records,
+            "count": len(records),
         }
@@ -0,0 +1,85 @@
+"""
+Caché de resultados direccionada por contenido.
+Dos escaneos con la misma herramienta, target normalizado, opciones y binario
+comparten clave: la API reutiliza un escaneo completado dentro del TTL de la
+herramienta o se une a uno idéntico que sigue en curso. Entre usuarios distintos
+el escaneo se comparte con una fila propia que apunta al original
+(Scan.source_scan_id).
+"""
+
+import hashlib
+import ipaddress
+import json
+import os
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit, urlunsplit
+
+from app.core.scanner_config import SCANNER_BINARIES, SCANNER_CACHE_TTL
+
+
+def normalize_target(target: str) -> str:
+    """Forma canónica de un target: IP/CIDR, URL o dominio"""
+    value = target.strip()
+
+    try:
+        if "/" in value and "://" not in value:
+            return str(ipaddress.ip_network(value, strict=False))
+        return str(ipaddress.ip_address(value))
+    except ValueError:
+        pass
+
+    if "://" in value:
+        parts = urlsplit(value)
+        return urlunsplit((
+            parts.scheme.lower(),
+            parts.netloc.lower(),
+            parts.path.rstrip("/"),
+            parts.query,
+            "",
+        ))
+
+    return value.lower().rstrip(".")
+
+
+def tool_fingerprint(tool_name: str) -> str:
+    """
+    Identifica la versión instalada de la herramienta por el tamaño y la fecha
+    de modificación del binario (actualizar la herramienta invalida la caché).
+    """
+    tools = sorted(SCANNER_BINARIES) if tool_name == "pipeline" else [tool_name]
+    parts = []
+    for tool in tools:
+        try:
+            stat = os.stat(SCANNER_BINARIES[tool])
+            parts.append(f"{tool}:{stat.st_size}:{int(stat.st_mtime)}")
+        except (KeyError, OSError):
+            parts.append(f"{tool}:missing")
+    return ",".join(parts)
+
+
+def cache_key(tool_name: str, target: str, options: Optional[Dict[str, Any]] = None) -> str:
+    """Hash sha256 canónico de (herramienta, target, opciones, versión)"""
+    options = {k: v for k, v in (options or {}).items() if v is not None}
+    payload = json.dumps(
+        {
+            "tool": tool_name,
+            "target": normalize_target(target),
+            "options": options,
+            "version": tool_fingerprint(tool_name),
+        },
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def results_digest(results: Any) -> str:
+    """Hash sha256 canónico de un documento de resultados (ETag de /results)"""
+    payload = json.dumps(results, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def cache_ttl(tool_name: str) -> int:
+    """Segundos durante los que se reutiliza un resultado (0 = sin caché)"""
+    return SCANNER_CACHE_TTL.get(tool_name, 0)
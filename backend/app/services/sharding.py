@@ -0,0 +1,37 @@
+"""
+División de rangos CIDR grandes en shards de espacio de direcciones.
+Cada shard se ejecuta como una tarea Celery independiente y sus hallazgos
+se guardan en el mismo Scan, de modo que el escaneo escala con los workers.
+"""
+
+import ipaddress
+import math
+from typing import List
+
+from app.core.scanner_config import SHARD_PREFIXLEN, SHARD_MAX_COUNT
+
+
+def split_target(tool_name: str, target: str) -> List[str]:
+    """
+    Divide un target CIDR en subredes del tamaño configurado para la herramienta.
+    Devuelve [target] si la herramienta no se fragmenta o el rango ya es pequeño.
+    """
+    prefixlen = SHARD_PREFIXLEN.get(tool_name)
+    if prefixlen is None or "/" not in target:
+        return [target]
+
+    try:
+        network = ipaddress.ip_network(target.strip(), strict=False)
+    except ValueError:
+        return [target]
+
+    if network.version != 4 or network.prefixlen >= prefixlen:
+        return [target]
+
+    # Limitar el número de shards ampliando el tamaño de cada uno
+    max_extra_bits = int(math.log2(SHARD_MAX_COUNT))
+    new_prefix = min(prefixlen, network.prefixlen + max_extra_bits)
+    if new_prefix <= network.prefixlen:
+        return [target]
+
+    return [str(subnet) for subnet in network.subnets(new_prefix=new_prefix)]
@@ -4,12 +4,14 @@ Usa subfinder de ProjectDiscovery para enumerar subdominios de un dominio objeti
 """
 
 import json
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from app.services.base_scanner import BaseScanner
 
 
 class SubfinderService(BaseScanner):
     tool_name = "subfinder"
+    streaming = True
+    records_key = "sources"
 
     def build_command(self, target: str, **options) -> List[str]:
         cmd = [
@@ -31,35 +33,28 @@ class SubfinderService(BaseScanner):
 
         return cmd
 
-    def parse_output(self, stdout: str, stderr: str) -> Dict[str, Any]:
-        subdomains = []
-        raw_entries = []
-
-        for line in stdout.strip().split("\n"):
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                data = json.loads(line)
-                host = data.get("host", "")
-                if host:
-                    subdomains.append(host)
-                    raw_entries.append(data)
-            except json.JSONDecodeError:
-                # Si no es JSON, tratar como texto plano
-                if line and "." in line:
-                    subdomains.append(line)
-
+    def parse_record(self, line: str) -> Optional[Dict[str, Any]]:
+        line = line.strip()
+        if not line:
+            return None
+        try:
+            data = json.loads(line)
+        except json.JSONDecodeError:
+            # Si no es JSON, tratar como texto plano
+            if "." in line:
+                return {"host": line}
+            return None
+
+        if isinstance(data, dict) and data.get("host"):
+            return data
+        return None
+
+    def aggregate(self, records: List[Dict[str, Any]]) -> Dict[str, Any]:
         # Eliminar duplicados manteniendo orden
-        seen = set()
-        unique = []
-        for s in subdomains:
-            if s not in seen:
-                seen.add(s)
-                unique.append(s)
+        unique = list(dict.fromkeys(r["host"] for r in records))
 
         return {
             "subdomains": unique,
             "count": len(unique),
-            "sources": raw_entries,
+            "sources": records,
         }
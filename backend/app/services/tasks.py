@@ -3,24 +3,36 @@ Tareas Celery para ejecución asíncrona de escaneos.
 Cada tarea invoca el servicio correspondiente y guarda resultados en la BD.
 """
 
+import asyncio
 import json
 import logging
+import time
 from datetime import datetime, timezone
+from typing import Any, Awaitable, Dict, List, Optional, Sequence, Tuple
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from celery import Signature, chord, group, uuid
+from celery.signals import worker_process_shutdown, worker_shutdown
+from sqlalchemy import DateTime, func, literal, select, update
 
 from app.core.celery_app import celery_app
-from app.core.config import settings
-from app.models.scan import ScanStatus
-
-# Crear engine síncrono para Celery (Celery no soporta async directamente)
-# Reemplazar asyncpg por psycopg2 para conexión síncrona
-sync_db_url = settings.DATABASE_URL.replace(
-    "postgresql+asyncpg", "postgresql+psycopg2"
+from app.core.events import is_scan_cancelled, publish_scan_event, request_scan_cancel
+from app.core.scan_read_cache import invalidate_scan
+from app.core.scanner_config import (
+    FINDINGS_BATCH_SIZE,
+    FINDINGS_FLUSH_INTERVAL,
+    FINDINGS_MERGE_BATCH_SIZE,
+    SCANNER_TIMEOUTS,
+    TASK_TIME_LIMIT_MARGIN,
 )
-sync_engine = create_engine(sync_db_url)
-SyncSession = sessionmaker(bind=sync_engine)
+from app.db.sync_session import SyncSession
+from app.models.scan import ScanStatus
+from app.services import worker_loop
+from app.services.base_scanner import kill_all_processes
+from app.services.normalizer import insert_records, strip_nul
+from app.services.pipeline import PIPELINE_OPTIONS, ReconPipeline
+from app.services.scan_cache import results_digest
+from app.services.sharding import split_target
+from app.services.worker_loop import ScanCancelled
 
 logger = logging.getLogger(__name__)
 
@@ -50,60 +62,248 @@ def _get_scanner(tool_name: str):
     return scanner_class()
 
 
-def _update_scan_status(scan_id: int, status: ScanStatus, **kwargs):
-    """Actualiza el estado de un scan en la BD"""
+def _update_scan_status(
+    scan_id: int,
+    status: ScanStatus,
+    findings: Sequence["FindingBuffer"] = (),
+    **kwargs,
+) -> bool:
+    """
+    Actualiza el estado de un scan con un único UPDATE, sin cargar la fila.
+    Los hallazgos pendientes de `findings` se insertan en la misma transacción.
+    Un scan cancelado por el usuario no se sobreescribe: devuelve False.
+    """
     from app.models.scan import Scan
 
-    session = SyncSession()
-    try:
-        scan = session.query(Scan).filter(Scan.id == scan_id).first()
-        if scan:
-            scan.status = status
-            for key, value in kwargs.items():
-                if hasattr(scan, key):
-                    setattr(scan, key, value)
+    values = {key: strip_nul(value) for key, value in kwargs.items() if key in Scan.__table__.c}
+    values["status"] = status
+    if values.get("results") is not None:
+        values["results_hash"] = results_digest(values["results"])
+    completed_at = values.get("completed_at")
+    if status in (ScanStatus.COMPLETED, ScanStatus.PARTIAL) and completed_at is not None:
+        # Historial para predecir duraciones (app/services/duration_model.py)
+        values["duration"] = func.extract(
+            "epoch", literal(completed_at, DateTime(timezone=True)) - Scan.started_at
+        )
+
+    batches = [(buffer, buffer._take()) for buffer in findings]
+    with SyncSession() as session:
+        progress = [buffer._insert(session, batch) for buffer, batch in batches]
+        updated = session.execute(
+            update(Scan)
+            .where(Scan.id == scan_id, Scan.status != ScanStatus.CANCELLED)
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        session.commit()
+
+    for (buffer, batch), count in zip(batches, progress):
+        buffer._publish(batch, count)
+    if not updated:
+        return False
+
+    invalidate_scan(scan_id)
+    event = {"status": status.value}
+    if "error_message" in kwargs:
+        event["error_message"] = kwargs["error_message"]
+    publish_scan_event(scan_id, "status", event)
+    return True
+
+
+def _cancel_check(scan_id: int):
+    """Consulta de cancelación para el watchdog del event loop"""
+    return lambda: is_scan_cancelled(scan_id)
+
+
+def _task_deadline(task) -> Optional[float]:
+    """
+    Límite blando de la tarea: el propio (_time_limits, llega en
+    request.timelimit como (hard, soft)) o el global de celery_app. Se impone
+    dentro del event loop (worker_loop.run_coroutine) porque el pool `threads`
+    de Celery no aplica soft_time_limit/time_limit.
+    """
+    limits = getattr(task.request, "timelimit", None) or ()
+    soft = limits[1] if len(limits) > 1 else None
+    return soft or celery_app.conf.task_soft_time_limit
+
+
+def cancel_scan_execution(scan_id: int, task_id: Optional[str]) -> None:
+    """
+    Detiene un scan ya marcado como CANCELLED en la BD: revoca su tarea
+    (si sigue en cola no llega a ejecutarse) y guarda la marca de cancelación
+    que el watchdog del worker usa para terminar la herramienta.
+    """
+    request_scan_cancel(scan_id)
+    invalidate_scan(scan_id)
+    if task_id:
+        celery_app.control.revoke(task_id)
+    publish_scan_event(scan_id, "status", {"status": ScanStatus.CANCELLED.value})
+
+
+class FindingBuffer:
+    """
+    Acumula los registros que emite un scanner en streaming y los vuelca
+    a la BD por lotes, actualizando el contador de progreso del Scan.
+    """
+
+    def __init__(self, scan_id: int, tool_name: str):
+        self.scan_id = scan_id
+        self.tool_name = tool_name
+        self.pending: List[Dict[str, Any]] = []
+        self.total = 0
+        self.last_flush = time.monotonic()
+
+    def add(self, record: Dict[str, Any]) -> Optional[Awaitable[None]]:
+        """
+        Callback on_record: agrega un registro. Cuando toca volcar el lote
+        devuelve la escritura como awaitable en un hilo, para no bloquear el
+        event loop compartido con otros escaneos.
+        """
+        self.pending.append(record)
+        if (
+            len(self.pending) >= FINDINGS_BATCH_SIZE
+            or time.monotonic() - self.last_flush >= FINDINGS_FLUSH_INTERVAL
+        ):
+            return asyncio.to_thread(self._write, self._take())
+        return None
+
+    def flush(self) -> None:
+        """Inserta de forma síncrona los registros pendientes"""
+        self._write(self._take())
+
+    def _take(self) -> List[Dict[str, Any]]:
+        """Extrae el lote pendiente (siempre desde el hilo del productor)"""
+        self.last_flush = time.monotonic()
+        batch = self.pending
+        self.pending = []
+        return batch
+
+    def _write(self, batch: List[Dict[str, Any]]) -> None:
+        """Inserta un lote de hallazgos en su propia transacción"""
+        if not batch:
+            return
+
+        with SyncSession() as session:
+            progress = self._insert(session, batch)
             session.commit()
-    finally:
-        session.close()
+        self._publish(batch, progress)
+
+    def _insert(self, session, batch: List[Dict[str, Any]]) -> Optional[int]:
+        """
+        Inserta un lote de hallazgos (crudos y normalizados) y suma su tamaño
+        al progreso del Scan, sin commit. Devuelve el progreso resultante.
+        """
+        from app.models.scan import Scan
+
+        if not batch:
+            return None
+
+        count = insert_records(session, self.scan_id, self.tool_name, batch)
+        progress = session.execute(
+            update(Scan)
+            .where(Scan.id == self.scan_id)
+            .values(
+                progress=Scan.progress + count,
+                progress_updated_at=datetime.now(timezone.utc),
+            )
+            .returning(Scan.progress)
+        ).scalar()
+        self.total += count
+        return progress
+
+    def _publish(self, batch: List[Dict[str, Any]], progress: Optional[int]) -> None:
+        """Notifica el lote ya guardado a los clientes en vivo"""
+        if not batch:
+            return
+
+        logger.debug(f"[Scan {self.scan_id}] {self.total} hallazgos de {self.tool_name} guardados")
+        publish_scan_event(
+            self.scan_id,
+            "findings",
+            {"tool": self.tool_name, "progress": progress, "findings": batch},
+        )
+
+
+def _completion(result: Dict[str, Any]) -> Tuple[ScanStatus, Optional[str]]:
+    """
+    Estado final de un escaneo terminado: PARTIAL si alguna herramienta
+    venció su timeout (sus resultados son parciales), COMPLETED si no.
+    """
+    meta = result.get("_meta", {})
+    if not meta.get("partial"):
+        return ScanStatus.COMPLETED, None
+
+    coverage = meta.get("coverage", {})
+    if "timed_out" in coverage:
+        tools = sorted({item["tool"] for item in coverage["timed_out"]})
+        return ScanStatus.PARTIAL, (
+            f"Resultados parciales: timeout en {', '.join(tools)} "
+            f"({len(coverage['timed_out'])} ejecuciones)"
+        )
+    return ScanStatus.PARTIAL, (
+        f"Resultados parciales: timeout tras {coverage.get('timeout')}s "
+        f"({coverage.get('records', 0)} registros)"
+    )
 
 
 @celery_app.task(bind=True, name="run_scan")
-def run_scan_task(self, scan_id: int, tool_name: str, target: str, options: dict = None):
+def run_scan_task(
+    self, scan_id: int, tool_name: str, target: str, options: dict = None, timeout: int = None
+):
     """
     Tarea Celery principal para ejecutar un escaneo.
     Se ejecuta en un worker separado del servidor FastAPI.
+    `timeout` es el predicho a partir del historial (por defecto, SCANNER_TIMEOUTS).
     """
-    import asyncio
-
     options = options or {}
     logger.info(f"[Task {self.request.id}] Iniciando {tool_name} scan en {target}")
 
-    # Marcar como running
-    _update_scan_status(
+    # Marcar como running (salvo que se haya cancelado mientras estaba en cola)
+    if not _update_scan_status(
         scan_id,
         ScanStatus.RUNNING,
         celery_task_id=self.request.id,
         started_at=datetime.now(timezone.utc),
-    )
+    ):
+        return {"status": "cancelled", "scan_id": scan_id}
 
+    findings = FindingBuffer(scan_id, tool_name)
     try:
         # Obtener el scanner
         scanner = _get_scanner(tool_name)
+        if timeout:
+            scanner.timeout = timeout
 
-        # Ejecutar (asyncio.run porque Celery no es async)
-        result = asyncio.run(scanner.execute(target, **options))
-
-        # Guardar resultados
+        # Ejecutar en el event loop persistente del proceso; los hallazgos
+        # se guardan por lotes mientras la herramienta sigue corriendo
+        result = worker_loop.run_scan_coroutine(
+            tool_name,
+            scanner.execute(target, on_record=findings.add, **options),
+            should_cancel=_cancel_check(scan_id),
+            deadline=_task_deadline(self),
+        )
+        # Guardar resultados (parciales si la herramienta venció su timeout)
+        # junto con el último lote de hallazgos, en una sola transacción
+        status, note = _completion(result)
         _update_scan_status(
             scan_id,
-            ScanStatus.COMPLETED,
-            results=json.dumps(result, default=str),
+            status,
+            findings=[findings],
+            results=result,
             raw_output=json.dumps(result.get("_meta", {}), default=str),
+            error_message=note,
+            findings_indexed=True,
             completed_at=datetime.now(timezone.utc),
         )
 
-        logger.info(f"[Task {self.request.id}] {tool_name} completado exitosamente")
-        return {"status": "completed", "scan_id": scan_id}
+        logger.info(f"[Task {self.request.id}] {tool_name} terminado ({status.value})")
+        return {"status": status.value, "scan_id": scan_id}
+
+    except ScanCancelled:
+        # Conservar lo que la herramienta alcanzó a emitir
+        findings.flush()
+        logger.info(f"[Task {self.request.id}] {tool_name} cancelado en scan {scan_id}")
+        return {"status": "cancelled", "scan_id": scan_id}
 
     except Exception as e:
         error_msg = str(e)
@@ -117,3 +317,321 @@ def run_scan_task(self, scan_id: int, tool_name: str, target: str, options: dict
         )
 
         return {"status": "failed", "scan_id": scan_id, "error": error_msg}
+
+
+@celery_app.task(bind=True, name="run_pipeline")
+def run_pipeline_task(self, scan_id: int, target: str, options: dict = None):
+    """
+    Tarea Celery del escaneo completo (ScanType.FULL).
+    Encadena subdominios → puertos → servicios → web → vulnerabilidades.
+    """
+    options = options or {}
+    logger.info(f"[Task {self.request.id}] Iniciando pipeline en {target}")
+
+    if not _update_scan_status(
+        scan_id,
+        ScanStatus.RUNNING,
+        celery_task_id=self.request.id,
+        started_at=datetime.now(timezone.utc),
+    ):
+        return {"status": "cancelled", "scan_id": scan_id}
+
+    # Un buffer de hallazgos por herramienta del pipeline
+    buffers: Dict[str, FindingBuffer] = {}
+    try:
+        def on_record(tool: str, record: Dict[str, Any]):
+            if tool not in buffers:
+                buffers[tool] = FindingBuffer(scan_id, tool)
+            return buffers[tool].add(record)
+
+        pipeline_options = {k: v for k, v in options.items() if k in PIPELINE_OPTIONS}
+        pipeline = ReconPipeline(target, _get_scanner, on_record=on_record, **pipeline_options)
+        result = worker_loop.run_coroutine(
+            pipeline.run(),
+            should_cancel=_cancel_check(scan_id),
+            deadline=_task_deadline(self),
+        )
+        status, note = _completion(result)
+        _update_scan_status(
+            scan_id,
+            status,
+            findings=list(buffers.values()),
+            results=result,
+            raw_output=json.dumps(result.get("_meta", {}), default=str),
+            error_message=note,
+            findings_indexed=True,
+            completed_at=datetime.now(timezone.utc),
+        )
+
+        logger.info(f"[Task {self.request.id}] Pipeline terminado en {target} ({status.value})")
+        return {"status": status.value, "scan_id": scan_id}
+
+    except ScanCancelled:
+        for buffer in buffers.values():
+            buffer.flush()
+        logger.info(f"[Task {self.request.id}] Pipeline cancelado en scan {scan_id}")
+        return {"status": "cancelled", "scan_id": scan_id}
+
+    except Exception as e:
+        error_msg = str(e)
+        logger.error(f"[Task {self.request.id}] Error en pipeline: {error_msg}")
+
+        _update_scan_status(
+            scan_id,
+            ScanStatus.FAILED,
+            error_message=error_msg,
+            completed_at=datetime.now(timezone.utc),
+        )
+
+        return {"status": "failed", "scan_id": scan_id, "error": error_msg}
+
+
+def _mark_running_once(scan_id: int) -> None:
+    """Pasa un scan a RUNNING solo la primera vez (el primer shard que arranca)"""
+    from app.models.scan import Scan
+
+    session = SyncSession()
+    try:
+        updated = session.execute(
+            update(Scan)
+            .where(Scan.id == scan_id, Scan.status == ScanStatus.PENDING)
+            .values(status=ScanStatus.RUNNING, started_at=datetime.now(timezone.utc))
+        ).rowcount
+        session.commit()
+    finally:
+        session.close()
+
+    if updated:
+        invalidate_scan(scan_id)
+        publish_scan_event(scan_id, "status", {"status": ScanStatus.RUNNING.value})
+
+
+@celery_app.task(bind=True, name="run_scan_shard")
+def run_scan_shard_task(
+    self, scan_id: int, tool_name: str, shard: str, options: dict = None
+):
+    """
+    Ejecuta un shard de un escaneo fragmentado. Los hallazgos se guardan
+    en el Scan padre; el error de un shard no detiene al resto.
+    """
+    options = options or {}
+    logger.info(f"[Task {self.request.id}] Shard {shard} de scan {scan_id} ({tool_name})")
+    if is_scan_cancelled(scan_id):
+        return {"shard": shard, "status": "cancelled"}
+    _mark_running_once(scan_id)
+
+    findings = FindingBuffer(scan_id, tool_name)
+    try:
+        scanner = _get_scanner(tool_name)
+        result = worker_loop.run_scan_coroutine(
+            tool_name,
+            scanner.execute(shard, on_record=findings.add, **options),
+            should_cancel=_cancel_check(scan_id),
+            deadline=_task_deadline(self),
+        )
+        findings.flush()
+        outcome = {"shard": shard, "status": "completed", "count": findings.total}
+        if result.get("_meta", {}).get("partial"):
+            outcome["status"] = "partial"
+            outcome["coverage"] = result["_meta"].get("coverage", {})
+    except ScanCancelled:
+        findings.flush()
+        return {"shard": shard, "status": "cancelled"}
+    except Exception as e:
+        findings.flush()
+        logger.error(f"[Task {self.request.id}] Error en shard {shard}: {e}")
+        outcome = {"shard": shard, "status": "failed", "error": str(e)}
+
+    publish_scan_event(scan_id, "shard", outcome)
+    return outcome
+
+
+@celery_app.task(bind=True, name="merge_scan_shards")
+def merge_scan_shards_task(
+    self, shard_results: List[Dict[str, Any]], scan_id: int, tool_name: str, target: str
+):
+    """
+    Callback del chord: agrega los hallazgos de todos los shards
+    en el resultado único del Scan.
+    """
+    from app.models.scan import ScanFinding
+
+    if is_scan_cancelled(scan_id):
+        return {"status": "cancelled", "scan_id": scan_id}
+
+    failed = [r for r in shard_results if r.get("status") not in ("completed", "partial")]
+    partial = [r for r in shard_results if r.get("status") == "partial"]
+
+    if failed and len(failed) == len(shard_results):
+        _update_scan_status(
+            scan_id,
+            ScanStatus.FAILED,
+            error_message=f"Fallaron los {len(failed)} shards: {failed[0].get('error', '')}",
+            completed_at=datetime.now(timezone.utc),
+        )
+        return {"status": "failed", "scan_id": scan_id}
+
+    # Cursor de servidor: solo se materializan los registros, no el lote
+    # entero del driver además de la lista
+    records: List[Dict[str, Any]] = []
+    with SyncSession() as session:
+        rows = session.execute(
+            select(ScanFinding.data)
+            .where(ScanFinding.scan_id == scan_id)
+            .order_by(ScanFinding.id)
+            .execution_options(yield_per=FINDINGS_MERGE_BATCH_SIZE)
+        ).scalars()
+        for partition in rows.partitions():
+            records.extend(partition)
+
+    result = _get_scanner(tool_name).aggregate(records)
+    result["_meta"] = {
+        "tool": tool_name,
+        "target": target,
+        "shards": len(shard_results),
+        "failed_shards": failed,
+        "timestamp": datetime.utcnow().isoformat(),
+    }
+    if partial:
+        result["_meta"]["partial"] = True
+        result["_meta"]["coverage"] = {
+            "reason": "timeout",
+            "timed_out": [
+                {"tool": tool_name, "target": r["shard"], **r.get("coverage", {})}
+                for r in partial
+            ],
+        }
+
+    status, note = _completion(result)
+    _update_scan_status(
+        scan_id,
+        status,
+        results=result,
+        raw_output=json.dumps(result["_meta"], default=str),
+        error_message=note,
+        findings_indexed=True,
+        completed_at=datetime.now(timezone.utc),
+    )
+
+    logger.info(
+        f"[Task {self.request.id}] Scan {scan_id}: {len(shard_results)} shards "
+        f"agregados ({len(failed)} con error, {len(partial)} parciales)"
+    )
+    return {"status": status.value, "scan_id": scan_id}
+
+
+@celery_app.task(name="fail_sharded_scan")
+def fail_sharded_scan_task(request, exc, traceback, scan_id: int):
+    """
+    Errback del chord: un shard murió sin devolver resultado (límite duro,
+    worker perdido) o falló la agregación. Sin él el Scan se quedaría en
+    RUNNING para siempre. Los hallazgos ya volcados se conservan en ScanFinding.
+    """
+    logger.error(f"[Scan {scan_id}] Chord de shards fallido ({request.id}): {exc!r}")
+    _update_scan_status(
+        scan_id,
+        ScanStatus.FAILED,
+        error_message=f"Error en la ejecución de los shards: {exc}",
+        completed_at=datetime.now(timezone.utc),
+    )
+
+
+def _time_limits(timeout: Optional[int]) -> Dict[str, int]:
+    """
+    Límites de la tarea Celery a partir del timeout de la herramienta: margen
+    para la parada ordenada, el parseo y el volcado de hallazgos.
+    Sin timeout se aplican los globales de celery_app. Con el pool `threads`
+    los impone _task_deadline en el event loop, no Celery.
+    """
+    if not timeout:
+        return {}
+    soft = int(timeout) + TASK_TIME_LIMIT_MARGIN
+    return {"soft_time_limit": soft, "time_limit": soft + TASK_TIME_LIMIT_MARGIN}
+
+
+def new_task_id() -> str:
+    """Id de tarea generado antes de encolar (se guarda en el Scan al crearlo)"""
+    return uuid()
+
+
+def scan_signature(
+    scan_id: int,
+    tool_name: str,
+    target: str,
+    options: dict = None,
+    timeout: int = None,
+    task_id: str = None,
+) -> Signature:
+    """
+    Firma Celery de un scan: pipeline, chord de shards o tarea única.
+    Los rangos CIDR grandes se reparten en shards (chord) entre los workers.
+    `timeout` (predicho del historial) fija el de la herramienta y los límites
+    de la tarea; los shards, de tamaño acotado, usan SCANNER_TIMEOUTS.
+    `task_id` es el id de la tarea principal (en un chord, la de agregación).
+    """
+    options = options or {}
+
+    if tool_name == "pipeline":
+        return run_pipeline_task.signature(
+            (scan_id, target, options), task_id=task_id, **_time_limits(timeout)
+        )
+
+    shards = split_target(tool_name, target)
+    if len(shards) > 1:
+        logger.info(f"[Scan {scan_id}] {target} dividido en {len(shards)} shards")
+        header = [
+            run_scan_shard_task.s(scan_id, tool_name, shard, options).set(
+                **_time_limits(SCANNER_TIMEOUTS.get(tool_name))
+            )
+            for shard in shards
+        ]
+        merge = merge_scan_shards_task.s(scan_id, tool_name, target)
+        if task_id:
+            merge.set(task_id=task_id)
+        merge.on_error(fail_sharded_scan_task.s(scan_id))
+        return chord(header, merge)
+
+    return run_scan_task.signature(
+        (scan_id, tool_name, target, options),
+        {"timeout": timeout},
+        task_id=task_id,
+        **_time_limits(timeout or SCANNER_TIMEOUTS.get(tool_name)),
+    )
+
+
+def dispatch_scan(
+    scan_id: int,
+    tool_name: str,
+    target: str,
+    options: dict = None,
+    timeout: int = None,
+    task_id: str = None,
+) -> str:
+    """
+    Encola la tarea adecuada para un scan y devuelve el id de tarea Celery.
+    Publica en el broker de forma síncrona: desde la API se llama fuera del
+    event loop (asyncio.to_thread).
+    """
+    return scan_signature(
+        scan_id, tool_name, target, options, timeout, task_id
+    ).apply_async().id
+
+
+def dispatch_scans(scans: List[Tuple[int, str, str, dict, Optional[int], Optional[str]]]) -> List[str]:
+    """
+    Encola varios scans (scan_id, herramienta, target, opciones, timeout,
+    task_id) como un único group de Celery. Devuelve sus task ids en el mismo orden.
+    """
+    result = group([scan_signature(*scan) for scan in scans]).apply_async()
+    return [child.id for child in result.results]
+
+
+@worker_shutdown.connect
+@worker_process_shutdown.connect
+def _stop_worker_loop(**kwargs):
+    """
+    Al apagar el worker termina los árboles de procesos de las herramientas
+    en ejecución (no quedan huérfanos) y detiene el event loop del proceso.
+    """
+    kill_all_processes()
+    worker_loop.shutdown()
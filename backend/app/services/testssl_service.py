@@ -5,12 +5,13 @@ Usa testssl.sh para analizar la configuración SSL/TLS de un servidor.
 
 import json
 import re
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Iterator
 from app.services.base_scanner import BaseScanner
 
 
 class TestSSLService(BaseScanner):
     tool_name = "testssl"
+    streaming = True
 
     def build_command(self, target: str, **options) -> List[str]:
         cmd = [
@@ -37,39 +38,104 @@ class TestSSLService(BaseScanner):
 
         return cmd
 
-    def parse_output(self, stdout: str, stderr: str) -> Dict[str, Any]:
-        findings = []
-        certificates = []
-        vulnerabilities = []
+    def start_stream(self) -> None:
+        # Líneas del objeto JSON en curso (testssl escribe cada entrada en varias líneas)
+        self._pending: List[str] = []
 
+    def iter_records(self, line: str) -> Iterator[Dict[str, Any]]:
+        # testssl separa las entradas con la coma al inicio de la siguiente
+        # (",         {"), y el array abre con "[" en su propia línea o pegado
+        line = line.strip()
+        start = line.lstrip(",[").lstrip()
+        if start.startswith("{"):
+            # Las entradas son objetos planos: una "{" siempre abre una nueva
+            self._pending = [start]
+        elif self._pending:
+            self._pending.append(line)
+        else:
+            return
+
+        if not line.rstrip(",").endswith("}"):
+            return
+
+        text = " ".join(self._pending).rstrip(",")
         try:
-            data = json.loads(stdout)
+            entry = json.loads(text)
+        except json.JSONDecodeError:
+            return  # Objeto aún incompleto: seguir acumulando
+        self._pending = []
+
+        if isinstance(entry, dict):
+            yield self._record(entry)
 
-            if isinstance(data, list):
-                for entry in data:
-                    finding = {
-                        "id": entry.get("id", ""),
-                        "severity": entry.get("severity", ""),
-                        "finding": entry.get("finding", ""),
-                    }
-
-                    # Clasificar hallazgos
-                    entry_id = finding["id"].lower()
-                    if "cert" in entry_id or "chain" in entry_id:
-                        certificates.append(finding)
-                    elif entry.get("severity", "").upper() in [
-                        "CRITICAL", "HIGH", "MEDIUM", "LOW"
-                    ]:
-                        vulnerabilities.append(finding)
-                    else:
-                        findings.append(finding)
+    @staticmethod
+    def _record(entry: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "id": entry.get("id", ""),
+            "severity": entry.get("severity", ""),
+            "finding": entry.get("finding", ""),
+        }
 
+    def parse_output(self, stdout: str, stderr: str) -> Dict[str, Any]:
+        # Salida completa: el array JSON entero
+        try:
+            data = json.loads(stdout)
         except json.JSONDecodeError:
-            # Parseo texto si JSON falla
-            for line in stdout.split("\n"):
-                line = line.strip()
-                if line and not line.startswith("#"):
-                    findings.append({"raw": line})
+            data = None
+        if isinstance(data, list):
+            return self.aggregate([self._record(e) for e in data if isinstance(e, dict)])
+
+        # Salida truncada (timeout): las entradas completas, línea a línea
+        records = self.records_from_text(stdout)
+        if records or not stdout.strip():
+            return self.aggregate(records)
+
+        # Parseo texto si JSON falla
+        findings = []
+        for line in stdout.split("\n"):
+            line = line.strip()
+            if line and not line.startswith("#"):
+                findings.append({"raw": line})
+
+        return {
+            "findings": findings,
+            "certificates": [],
+            "vulnerabilities": [],
+            "total_findings": len(findings),
+            "total_vulnerabilities": 0,
+        }
+
+    def result_records(self, result: Dict[str, Any]) -> List[Dict[str, Any]]:
+        return (
+            result.get("certificates", [])
+            + result.get("vulnerabilities", [])
+            + result.get("findings", [])
+        )
+
+    @staticmethod
+    def classify(finding: Dict[str, Any]) -> str:
+        """Clasifica un hallazgo en certificate, vulnerability o finding"""
+        entry_id = finding["id"].lower()
+        if "cert" in entry_id or "chain" in entry_id:
+            return "certificate"
+        if finding["severity"].upper() in ["CRITICAL", "HIGH", "MEDIUM", "LOW"]:
+            return "vulnerability"
+        return "finding"
+
+    def aggregate(self, records: List[Dict[str, Any]]) -> Dict[str, Any]:
+        findings = []
+        certificates = []
+        vulnerabilities = []
+
+        for finding in records:
+            # Clasificar hallazgos
+            category = self.classify(finding)
+            if category == "certificate":
+                certificates.append(finding)
+            elif category == "vulnerability":
+                vulnerabilities.append(finding)
+            else:
+                findings.append(finding)
 
         return {
             "findings": findings,
@@ -5,12 +5,14 @@ Usa WhatWeb para detectar CMS, frameworks, servidores y plugins de un sitio web.
 
 import json
 import re
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Iterator
 from app.services.base_scanner import BaseScanner
 
 
 class WhatWebService(BaseScanner):
     tool_name = "whatweb"
+    streaming = True
+    records_key = "technologies"
 
     def build_command(self, target: str, **options) -> List[str]:
         cmd = [
@@ -26,26 +28,30 @@ class WhatWebService(BaseScanner):
 
         return cmd
 
-    def parse_output(self, stdout: str, stderr: str) -> Dict[str, Any]:
-        technologies = []
-
-        for line in stdout.strip().split("\n"):
-            line = line.strip()
-            if not line:
-                continue
+    def iter_records(self, line: str) -> Iterator[Dict[str, Any]]:
+        line = line.strip()
+        if not line:
+            return
+        try:
+            data = json.loads(line)
+        except json.JSONDecodeError:
+            # Entradas del array JSON en líneas separadas: "[{...}," / "{...}]"
             try:
-                data = json.loads(line)
-                if isinstance(data, list):
-                    for item in data:
-                        technologies.append(self._extract_tech(item))
-                elif isinstance(data, dict):
-                    technologies.append(self._extract_tech(data))
+                data = json.loads(line.strip("[],"))
             except json.JSONDecodeError:
-                continue
+                return
+
+        if isinstance(data, list):
+            for item in data:
+                if isinstance(item, dict):
+                    yield self._extract_tech(item)
+        elif isinstance(data, dict):
+            yield self._extract_tech(data)
 
+    def aggregate(self, records: List[Dict[str, Any]]) -> Dict[str, Any]:
         return {
-            "technologies": technologies,
-            "count": len(technologies),
+            "technologies": records,
+            "count": len(records),
         }
 
     def _extract_tech(self, data: dict) -> dict:
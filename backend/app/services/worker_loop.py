@@ -0,0 +1,176 @@
+"""
+Event loop persistente por proceso worker.
+En lugar de crear y destruir un loop con asyncio.run() en cada tarea, cada
+proceso mantiene un loop en un hilo dedicado. Las tareas Celery (que corren en
+hilos del pool) le envían sus corrutinas, de modo que un mismo proceso puede
+supervisar varios subprocesos de escaneo a la vez, limitados por herramienta.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from app.core.scanner_config import SCANNER_CONCURRENCY, CANCEL_POLL_INTERVAL
+
+logger = logging.getLogger(__name__)
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_thread: Optional[threading.Thread] = None
+_lock = threading.Lock()
+
+# Semáforos por herramienta (solo se usan desde el hilo del loop)
+_semaphores: Dict[str, asyncio.Semaphore] = {}
+
+# Consulta (síncrona) de si el escaneo fue cancelado por el usuario
+CancelCheck = Callable[[], bool]
+
+
+class ScanCancelled(Exception):
+    """El escaneo se canceló mientras esperaba turno o se ejecutaba"""
+
+
+class ScanTimeLimitExceeded(Exception):
+    """El escaneo superó el límite de tiempo de su tarea Celery"""
+
+
+def get_loop() -> asyncio.AbstractEventLoop:
+    """Devuelve el loop del proceso, arrancándolo la primera vez"""
+    global _loop, _thread
+
+    with _lock:
+        if _loop is None or not _thread.is_alive():
+            _loop = asyncio.new_event_loop()
+            _thread = threading.Thread(
+                target=_loop.run_forever, name="scan-event-loop", daemon=True
+            )
+            _thread.start()
+            logger.info(f"[pid {os.getpid()}] Event loop de escaneo iniciado")
+    return _loop
+
+
+def run_coroutine(
+    coro: Awaitable[Any],
+    should_cancel: Optional[CancelCheck] = None,
+    deadline: Optional[float] = None,
+) -> Any:
+    """
+    Ejecuta una corrutina en el loop del proceso y espera su resultado.
+    Con `should_cancel`, la corrutina se cancela (y sus herramientas se
+    terminan) en cuanto la consulta devuelve True; se lanza ScanCancelled.
+    Con `deadline` (segundos), se cancela al agotarlo y se lanza
+    ScanTimeLimitExceeded: el pool `threads` de Celery no aplica
+    soft_time_limit/time_limit, así que el límite se impone aquí.
+    """
+    if should_cancel is not None:
+        coro = _cancellable(coro, should_cancel)
+    if deadline:
+        coro = _bounded(coro, deadline)
+    future = asyncio.run_coroutine_threadsafe(coro, get_loop())
+    try:
+        return future.result()
+    except BaseException:
+        # p. ej. SoftTimeLimitExceeded de prefork en este hilo: sin cancelar,
+        # la corrutina y sus herramientas seguirían corriendo en el loop
+        future.cancel()
+        raise
+
+
+def run_scan_coroutine(
+    tool_name: str,
+    coro: Awaitable[Any],
+    should_cancel: Optional[CancelCheck] = None,
+    deadline: Optional[float] = None,
+) -> Any:
+    """
+    Ejecuta la corrutina de un escaneo respetando el límite de
+    subprocesos concurrentes de la herramienta en este proceso.
+    """
+    return run_coroutine(supervised(tool_name, coro), should_cancel, deadline)
+
+
+async def _bounded(coro: Awaitable[Any], deadline: float) -> Any:
+    """Cancela la corrutina (y termina sus herramientas) al agotar `deadline`"""
+    task = asyncio.ensure_future(coro)
+    try:
+        done, _ = await asyncio.wait({task}, timeout=deadline)
+    except asyncio.CancelledError:
+        await _cancel_and_wait(task)
+        raise
+    if done:
+        return task.result()
+    await _cancel_and_wait(task)
+    raise ScanTimeLimitExceeded(
+        f"El escaneo superó el límite de tiempo de la tarea ({int(deadline)}s)"
+    )
+
+
+async def _cancel_and_wait(task: asyncio.Future) -> None:
+    """Cancela una tarea y espera a que termine (BaseScanner mata el árbol de procesos)"""
+    task.cancel()
+    try:
+        await task
+    except (asyncio.CancelledError, Exception):
+        pass
+
+
+async def _cancellable(coro: Awaitable[Any], should_cancel: CancelCheck) -> Any:
+    """Vigila la marca de cancelación mientras la corrutina se ejecuta"""
+    task = asyncio.ensure_future(coro)
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=CANCEL_POLL_INTERVAL)
+            if done:
+                return task.result()
+            if await asyncio.to_thread(should_cancel):
+                # La cancelación llega a BaseScanner, que termina el árbol de procesos
+                await _cancel_and_wait(task)
+                raise ScanCancelled("Escaneo cancelado por el usuario")
+    except asyncio.CancelledError:
+        # Cancelado desde fuera (run_coroutine o _bounded): propagar a la corrutina
+        await _cancel_and_wait(task)
+        raise
+
+
+async def supervised(tool_name: str, coro: Awaitable[Any]) -> Any:
+    """
+    Espera turno en el semáforo de la herramienta (SCANNER_CONCURRENCY) y
+    ejecuta la corrutina. Debe llamarse desde el loop del proceso; el
+    pipeline lo usa para que sus etapas compartan el límite con las tareas.
+    """
+    semaphore = _semaphores.get(tool_name)
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(SCANNER_CONCURRENCY.get(tool_name, 1))
+        _semaphores[tool_name] = semaphore
+
+    async with semaphore:
+        return await coro
+
+
+def shutdown() -> None:
+    """Detiene el loop del proceso (apagado del worker)"""
+    global _loop, _thread
+
+    with _lock:
+        if _loop is not None and _loop.is_running():
+            _loop.call_soon_threadsafe(_loop.stop)
+        if _thread is not None:
+            _thread.join(timeout=5)
+        _loop = None
+        _thread = None
+        _semaphores.clear()
+
+
+def _reset_after_fork() -> None:
+    """Un proceso hijo no hereda el hilo del loop: empezar de cero"""
+    global _loop, _thread, _lock
+
+    _loop = None
+    _thread = None
+    _lock = threading.Lock()
+    _semaphores.clear()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
@@ -0,0 +1,214 @@
+"""
+Generadores de salidas sintéticas para los benchmarks de parsers.
+Cada generador produce el texto que la herramienta escribe en stdout con el
+formato que usa BlitzScan (ver build_command de cada servicio), con valores
+deterministas a partir de una semilla.
+
+El tamaño es el número de registros que el parser debe producir:
+hosts en nmap, puertos en masscan/rustscan, resultados en nuclei/ffuf y
+entradas en testssl.
+"""
+
+import json
+import random
+from typing import Callable, Dict, List
+
+SEED = 1337
+
+SERVICES = [
+    (21, "ftp", "vsftpd", "3.0.5"),
+    (22, "ssh", "OpenSSH", "8.9p1 Ubuntu 3ubuntu0.6"),
+    (25, "smtp", "Postfix smtpd", ""),
+    (53, "domain", "ISC BIND", "9.18.18"),
+    (80, "http", "nginx", "1.24.0"),
+    (443, "https", "nginx", "1.24.0"),
+    (3306, "mysql", "MySQL", "8.0.36"),
+    (5432, "postgresql", "PostgreSQL DB", "15.4"),
+    (8080, "http-proxy", "Apache Tomcat", "9.0.82"),
+]
+
+SEVERITIES = ["info", "info", "info", "low", "medium", "medium", "high", "critical"]
+
+WORDS = [
+    "admin", "api", "backup", "config", "dashboard", "login", "static",
+    "uploads", "v1", "v2", "wp-admin", ".git", "server-status", "graphql",
+]
+
+TESTSSL_IDS = [
+    ("SSLv2", "OK", "not offered"),
+    ("SSLv3", "OK", "not offered"),
+    ("TLS1", "LOW", "offered (deprecated)"),
+    ("TLS1_2", "OK", "offered"),
+    ("TLS1_3", "OK", "offered with final"),
+    ("cert_signatureAlgorithm", "OK", "SHA256 with RSA"),
+    ("cert_expirationStatus", "OK", "60 >= 30 days"),
+    ("cert_chain_of_trust", "OK", "passed."),
+    ("heartbleed", "OK", "not vulnerable, no heartbeat extension"),
+    ("ROBOT", "OK", "not vulnerable, no RSA key transport cipher"),
+    ("BREACH", "MEDIUM", "potentially NOT ok, \"gzip\" HTTP compression detected."),
+    ("LUCKY13", "LOW", "potentially vulnerable, uses TLS CBC ciphers"),
+    ("BEAST", "HIGH", "VULNERABLE -- but also supports higher protocols"),
+    ("HSTS", "OK", "730 days=63072000 s"),
+]
+
+
+def _ip(i: int) -> str:
+    return f"10.{(i >> 16) & 255}.{(i >> 8) & 255}.{i & 255}"
+
+
+def nmap_xml(size: int, seed: int = SEED) -> str:
+    """Salida -oX de nmap -sV con `size` hosts de 1 a 5 puertos cada uno"""
+    rng = random.Random(seed)
+    parts = [
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<!DOCTYPE nmaprun>\n'
+        '<nmaprun scanner="nmap" args="nmap -sV -oX - 10.0.0.0/8" start="1700000000" '
+        'version="7.94" xmloutputversion="1.05">\n'
+        '<scaninfo type="syn" protocol="tcp" numservices="1000" services="1-1000"/>\n'
+    ]
+    for i in range(size):
+        ip = _ip(i)
+        parts.append(
+            f'<host starttime="1700000000" endtime="1700000042">'
+            f'<status state="up" reason="syn-ack" reason_ttl="0"/>\n'
+            f'<address addr="{ip}" addrtype="ipv4"/>\n'
+            f'<hostnames><hostname name="host-{i}.example.com" type="PTR"/></hostnames>\n'
+            f'<ports><extraports state="closed" count="995"/>\n'
+        )
+        for port, name, product, version in rng.sample(SERVICES, rng.randint(1, 5)):
+            parts.append(
+                f'<port protocol="tcp" portid="{port}">'
+                f'<state state="open" reason="syn-ack" reason_ttl="64"/>'
+                f'<service name="{name}" product="{product}" version="{version}" '
+                f'method="probed" conf="10"><cpe>cpe:/a:{name}</cpe></service></port>\n'
+            )
+        parts.append(
+            '</ports>\n'
+            '<os><osmatch name="Linux 5.0 - 5.14" accuracy="95" line="67000"/></os>\n'
+            '<times srtt="312" rttvar="121" to="100000"/>\n'
+            '</host>\n'
+        )
+    parts.append(
+        f'<runstats><finished time="1700000600" elapsed="600" exit="success"/>'
+        f'<hosts up="{size}" down="0" total="{size}"/></runstats>\n</nmaprun>\n'
+    )
+    return "".join(parts)
+
+
+def nuclei_jsonl(size: int, seed: int = SEED) -> str:
+    """Salida -jsonl de nuclei: un resultado por línea"""
+    rng = random.Random(seed)
+    lines = []
+    for i in range(size):
+        host = f"https://host-{i % 5000}.example.com"
+        severity = rng.choice(SEVERITIES)
+        lines.append(json.dumps({
+            "template": f"http/misconfiguration/template-{i % 700}.yaml",
+            "template-id": f"template-{i % 700}",
+            "template-path": f"/root/nuclei-templates/http/template-{i % 700}.yaml",
+            "info": {
+                "name": f"Detected misconfiguration {i % 700}",
+                "author": ["pdteam"],
+                "tags": ["misconfig", "exposure", severity],
+                "description": "Synthetic finding used for parser benchmarks.",
+                "reference": [f"https://example.com/advisory/{i % 700}"],
+                "severity": severity,
+            },
+            "type": "http",
+            "host": host,
+            "matched-at": f"{host}/{rng.choice(WORDS)}",
+            "matcher-name": "status",
+            "ip": _ip(i % 5000),
+            "timestamp": "2026-10-17T10:00:00.000000000Z",
+            "curl-command": f"curl -X 'GET' -H 'User-Agent: Mozilla/5.0' '{host}'",
+            "matcher-status": True,
+        }))
+    return "\n".join(lines) + "\n"
+
+
+def masscan_json(size: int, seed: int = SEED) -> str:
+    """Salida --output-format json de masscan: array con un puerto por línea"""
+    rng = random.Random(seed)
+    lines = ["["]
+    for i in range(size):
+        port = rng.choice(SERVICES)[0]
+        lines.append(
+            f'{{   "ip": "{_ip(i // 3)}",   "timestamp": "1700000000", "ports": '
+            f'[ {{"port": {port}, "proto": "tcp", "status": "open", '
+            f'"reason": "syn-ack", "ttl": 64}} ] }},'
+        )
+    lines.append("]")
+    return "\n".join(lines) + "\n"
+
+
+def ffuf_jsonl(size: int, seed: int = SEED) -> str:
+    """Salida -json de ffuf: un resultado por línea"""
+    rng = random.Random(seed)
+    lines = []
+    for i in range(size):
+        word = f"{rng.choice(WORDS)}{i}"
+        status = rng.choice([200, 200, 301, 302, 403])
+        lines.append(json.dumps({
+            "input": {"FUZZ": word},
+            "position": i + 1,
+            "status": status,
+            "length": rng.randint(100, 50000),
+            "words": rng.randint(10, 5000),
+            "lines": rng.randint(1, 800),
+            "content-type": "text/html; charset=utf-8",
+            "redirectlocation": f"/{word}/" if status in (301, 302) else "",
+            "scraper": {},
+            "duration": rng.randint(1_000_000, 900_000_000),
+            "resultfile": "",
+            "url": f"https://example.com/{word}",
+            "host": "example.com",
+        }))
+    return "\n".join(lines) + "\n"
+
+
+def rustscan_greppable(size: int, seed: int = SEED) -> str:
+    """Salida -g de rustscan: `IP -> [puertos]`, 10 puertos por host"""
+    rng = random.Random(seed)
+    lines = []
+    for host in range(-(-size // 10)):
+        count = min(10, size - host * 10)
+        ports = sorted(rng.sample(range(1, 65536), count))
+        lines.append(f"{_ip(host)} -> [{','.join(str(p) for p in ports)}]")
+    return "\n".join(lines) + "\n"
+
+
+def testssl_json(size: int, seed: int = SEED) -> str:
+    """
+    Salida --jsonfile de testssl.sh: array de objetos en varias líneas, con la
+    coma separadora al inicio de la entrada siguiente (",         {")
+    """
+    rng = random.Random(seed)
+    blocks = []
+    for i in range(size):
+        finding_id, severity, finding = rng.choice(TESTSSL_IDS)
+        opening = "          {\n" if i == 0 else ",         {\n"
+        blocks.append(
+            opening +
+            f'               "id"           : "{finding_id}",\n'
+            f'               "ip"           : "host-{i % 1000}.example.com/{_ip(i % 1000)}",\n'
+            '               "port"         : "443",\n'
+            f'               "severity"     : "{severity}",\n'
+            f'               "finding"      : {json.dumps(finding)}\n'
+            "          }"
+        )
+    return "[\n" + "\n".join(blocks) + "\n]\n"
+
+
+# Herramienta → generador de su salida
+GENERATORS: Dict[str, Callable[[int], str]] = {
+    "nmap": nmap_xml,
+    "nuclei": nuclei_jsonl,
+    "masscan": masscan_json,
+    "ffuf": ffuf_jsonl,
+    "rustscan": rustscan_greppable,
+    "testssl": testssl_json,
+}
+
+
+def available_tools() -> List[str]:
+    return list(GENERATORS)
@@ -0,0 +1,136 @@
+"""
+Benchmark del login: throughput de verificación de contraseñas (bcrypt) y
+latencia del event loop durante una ráfaga de logins, que es lo que nota un
+cliente que consulta el estado de un scan mientras otros inician sesión.
+
+Compara la verificación directa en el loop (`inline`) con el pool de hashing de
+app/core/security.py para varios tamaños de pool.
+
+Uso (desde backend/):
+    python -m benchmarks.login                          # 32 logins, pools 1,2,4,8
+    python -m benchmarks.login --logins 200 --workers 4,8
+    python -m benchmarks.login --pool process --rounds 10
+    python -m benchmarks.login --output login.json      # Guardar resultados
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from app.core import security
+from app.core.config import settings
+
+PASSWORD = "benchmark-password"
+
+# Intervalo del sondeo que simula las consultas de estado (segundos)
+PROBE_INTERVAL = 0.01
+
+
+async def probe_loop(lags: List[float], stop: asyncio.Event) -> None:
+    """Mide cuánto tarda el loop en atender un temporizador de PROBE_INTERVAL"""
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(PROBE_INTERVAL)
+        lags.append(time.perf_counter() - start - PROBE_INTERVAL)
+
+
+async def login_burst(mode: str, logins: int, hashed: str) -> Dict[str, Any]:
+    """Lanza `logins` verificaciones a la vez mientras se sondea el loop"""
+    async def login_inline() -> bool:
+        return security.verify_password(PASSWORD, hashed)
+
+    async def login_pool() -> bool:
+        return await security.verify_password_async(PASSWORD, hashed)
+
+    login = login_inline if mode == "inline" else login_pool
+
+    lags: List[float] = []
+    stop = asyncio.Event()
+    probe = asyncio.create_task(probe_loop(lags, stop))
+    await asyncio.sleep(PROBE_INTERVAL * 5)  # Línea base antes de la ráfaga
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*[login() for _ in range(logins)])
+    elapsed = time.perf_counter() - start
+
+    stop.set()
+    await probe
+    if not all(results):
+        raise RuntimeError("Una verificación devolvió False")
+
+    lags_ms = sorted(lag * 1000 for lag in lags) or [0.0]
+    return {
+        "mode": mode,
+        "logins": logins,
+        "seconds": round(elapsed, 3),
+        "logins_per_s": round(logins / elapsed, 1),
+        "lag_p50_ms": round(statistics.median(lags_ms), 1),
+        "lag_p99_ms": round(lags_ms[min(len(lags_ms) - 1, int(len(lags_ms) * 0.99))], 1),
+        "lag_max_ms": round(lags_ms[-1], 1),
+    }
+
+
+def run_mode(mode: str, logins: int, hashed: str, workers: Optional[int], pool: str) -> Dict[str, Any]:
+    """Ejecuta una ráfaga con un pool de hashing recién creado"""
+    security.shutdown_password_hashing()
+    if workers is not None:
+        settings.PASSWORD_HASH_WORKERS = workers
+        settings.PASSWORD_HASH_POOL = pool
+    try:
+        return asyncio.run(login_burst(mode, logins, hashed))
+    finally:
+        security.shutdown_password_hashing()
+
+
+def print_row(row: Dict[str, Any]) -> None:
+    print(
+        f"{row['mode']:<12} {row['logins']:>7} {row['seconds']:>9.3f} {row['logins_per_s']:>10.1f} "
+        f"{row['lag_p50_ms']:>10.1f} {row['lag_p99_ms']:>10.1f} {row['lag_max_ms']:>10.1f}",
+        flush=True,
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark de login (bcrypt y latencia del loop)")
+    parser.add_argument("--logins", type=int, default=32, help="Logins simultáneos por ráfaga")
+    parser.add_argument("--workers", default="1,2,4,8", help="Tamaños de pool separados por coma")
+    parser.add_argument(
+        "--pool", choices=["thread", "process"], default=settings.PASSWORD_HASH_POOL,
+        help="Tipo de pool de hashing",
+    )
+    parser.add_argument("--rounds", type=int, default=None, help="Coste bcrypt (por defecto el de la app)")
+    parser.add_argument("--skip-inline", action="store_true", help="No medir la verificación en el loop")
+    parser.add_argument("--output", type=Path, default=None, help="Guardar resultados en JSON")
+    args = parser.parse_args()
+
+    context = security.pwd_context
+    if args.rounds is not None:
+        context = context.using(bcrypt__rounds=args.rounds)
+    hashed = context.hash(PASSWORD)
+
+    workers = [int(w) for w in args.workers.split(",") if w.strip()]
+    modes = [] if args.skip_inline else [("inline", None)]
+    modes += [(f"{args.pool}-{w}", w) for w in workers]
+
+    print(
+        f"{'mode':<12} {'logins':>7} {'seconds':>9} {'logins/s':>10} "
+        f"{'lag p50':>10} {'lag p99':>10} {'lag max':>10}"
+    )
+    results = []
+    for mode, size in modes:
+        row = run_mode(mode, args.logins, hashed, size, args.pool)
+        results.append(row)
+        print_row(row)
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2), encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
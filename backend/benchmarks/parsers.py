@@ -0,0 +1,265 @@
+"""
+Benchmark de los parsers de salida de cada scanner.
+Mide el throughput (registros/s y MB/s) y el pico de memoria (tracemalloc)
+de cada parser sobre salidas sintéticas de 1K/100K/1M registros, en dos modos:
+
+- buffered: parse_output() sobre la salida completa (herramientas sin streaming).
+- streaming: línea a línea con iter_records() y aggregate() al final, como
+  BaseScanner._run_streaming en producción.
+
+Uso (desde backend/):
+    python -m benchmarks.parsers                           # Todo (1k,100k,1m)
+    python -m benchmarks.parsers --tools nmap,nuclei --sizes 1k,100k
+    python -m benchmarks.parsers --modes streaming         # Solo el camino de producción
+    python -m benchmarks.parsers --fixtures-dir /tmp/fx    # Guardar/reutilizar fixtures
+    python -m benchmarks.parsers --fixture nmap=scan.xml   # Salida real grabada
+    python -m benchmarks.parsers --fixture testssl=benchmarks/fixtures/testssl.json
+    python -m benchmarks.parsers --output base.json        # Guardar resultados
+    python -m benchmarks.parsers --baseline base.json      # Detectar regresiones
+"""
+
+import argparse
+import gc
+import json
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from app.services.base_scanner import BaseScanner
+from app.services.ffuf_service import FfufService
+from app.services.masscan_service import MasscanService
+from app.services.nmap_service import NmapService
+from app.services.nuclei_service import NucleiService
+from app.services.rustscan_service import RustScanService
+from app.services.testssl_service import TestSSLService
+from benchmarks.generators import GENERATORS
+
+PARSERS = {
+    "nmap": NmapService,
+    "nuclei": NucleiService,
+    "masscan": MasscanService,
+    "ffuf": FfufService,
+    "rustscan": RustScanService,
+    "testssl": TestSSLService,
+}
+
+FIXTURE_EXT = {
+    "nmap": "xml",
+    "nuclei": "jsonl",
+    "masscan": "json",
+    "ffuf": "jsonl",
+    "rustscan": "txt",
+    "testssl": "json",
+}
+
+DEFAULT_SIZES = "1k,100k,1m"
+
+MODES = ("buffered", "streaming")
+
+
+def parse_size(value: str) -> int:
+    """Convierte '1k', '100k', '1m' o '2500' en número de registros"""
+    value = value.strip().lower()
+    multiplier = {"k": 1_000, "m": 1_000_000}.get(value[-1:], 1)
+    number = value[:-1] if multiplier > 1 else value
+    return int(float(number) * multiplier)
+
+
+def load_output(
+    tool: str, size: int, fixtures_dir: Optional[Path]
+) -> str:
+    """Genera la salida sintética, reutilizando el fixture guardado si existe"""
+    if fixtures_dir is None:
+        return GENERATORS[tool](size)
+
+    path = fixtures_dir / f"{tool}_{size}.{FIXTURE_EXT[tool]}"
+    if path.exists():
+        return path.read_text(encoding="utf-8")
+
+    stdout = GENERATORS[tool](size)
+    fixtures_dir.mkdir(parents=True, exist_ok=True)
+    path.write_text(stdout, encoding="utf-8")
+    return stdout
+
+
+def iter_lines(stdout: str) -> Iterator[str]:
+    """Líneas con su salto final, como las entrega BaseScanner._iter_lines"""
+    start = 0
+    while start < len(stdout):
+        end = stdout.find("\n", start)
+        if end == -1:
+            yield stdout[start:]
+            return
+        yield stdout[start:end + 1]
+        start = end + 1
+
+
+def parse_buffered(scanner: BaseScanner, stdout: str) -> Dict[str, Any]:
+    return scanner.parse_output(stdout, "")
+
+
+def parse_streaming(scanner: BaseScanner, stdout: str) -> Dict[str, Any]:
+    """Parser incremental línea a línea y aggregate() al final"""
+    scanner.start_stream()
+    records = []
+    for line in iter_lines(stdout):
+        records.extend(scanner.iter_records(line))
+    return scanner.aggregate(records)
+
+
+PARSE_MODES: Dict[str, Callable[[BaseScanner, str], Dict[str, Any]]] = {
+    "buffered": parse_buffered,
+    "streaming": parse_streaming,
+}
+
+
+def measure(scanner: BaseScanner, stdout: str, repeat: int, mode: str) -> Dict[str, Any]:
+    """Mejor tiempo de `repeat` ejecuciones y pico de memoria de una más"""
+    parse = PARSE_MODES[mode]
+    best = float("inf")
+    records = 0
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        result = parse(scanner, stdout)
+        best = min(best, time.perf_counter() - start)
+        records = len(scanner.result_records(result))
+        del result
+
+    # Pico de memoria en una ejecución aparte: tracemalloc ralentiza el parseo
+    gc.collect()
+    tracemalloc.start()
+    result = parse(scanner, stdout)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+
+    input_mb = len(stdout.encode("utf-8")) / 1_048_576
+    return {
+        "records": records,
+        "input_mb": round(input_mb, 2),
+        "seconds": round(best, 4),
+        "records_per_s": round(records / best) if best else 0,
+        "mb_per_s": round(input_mb / best, 2) if best else 0,
+        "peak_mb": round(peak / 1_048_576, 2),
+    }
+
+
+def compare(
+    results: List[Dict[str, Any]], baseline: List[Dict[str, Any]], threshold: float
+) -> List[str]:
+    """Regresiones de throughput o memoria respecto a una ejecución anterior"""
+    # Los resultados anteriores a los modos son todos de parse_output()
+    previous = {(r["tool"], r["size"], r.get("mode", "buffered")): r for r in baseline}
+    regressions = []
+    for r in results:
+        base = previous.get((r["tool"], r["size"], r["mode"]))
+        if base is None:
+            continue
+        label = f"{r['tool']} {r['size']} ({r['mode']})"
+        if r["records_per_s"] < base["records_per_s"] * (1 - threshold):
+            regressions.append(
+                f"{label}: throughput {r['records_per_s']:,} reg/s "
+                f"(antes {base['records_per_s']:,})"
+            )
+        if r["peak_mb"] > base["peak_mb"] * (1 + threshold):
+            regressions.append(
+                f"{label}: pico de memoria {r['peak_mb']} MB "
+                f"(antes {base['peak_mb']} MB)"
+            )
+    return regressions
+
+
+def print_row(row: Dict[str, Any]) -> None:
+    print(
+        f"{row['tool']:<9} {row['mode']:<9} {row['size']:>9} {row['records']:>9} {row['input_mb']:>9.2f} "
+        f"{row['seconds']:>9.3f} {row['records_per_s']:>12,} {row['mb_per_s']:>8.2f} "
+        f"{row['peak_mb']:>9.2f}",
+        flush=True,
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark de parsers de scanners")
+    parser.add_argument("--tools", default=",".join(PARSERS), help="Herramientas separadas por coma")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help="Registros por salida (ej: 1k,100k,1m)")
+    parser.add_argument(
+        "--modes", default=",".join(MODES),
+        help="buffered (parse_output) y/o streaming (iter_records + aggregate)",
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Repeticiones por medición")
+    parser.add_argument("--fixtures-dir", type=Path, default=None, help="Guardar/reutilizar fixtures")
+    parser.add_argument(
+        "--fixture", action="append", default=[], metavar="TOOL=PATH",
+        help="Medir una salida real grabada (se puede repetir)",
+    )
+    parser.add_argument("--output", type=Path, default=None, help="Guardar resultados en JSON")
+    parser.add_argument("--baseline", type=Path, default=None, help="Resultados JSON de referencia")
+    parser.add_argument(
+        "--max-regression", type=float, default=0.2,
+        help="Tolerancia frente al baseline (0.2 = 20%%)",
+    )
+    args = parser.parse_args()
+
+    tools = [t.strip() for t in args.tools.split(",") if t.strip()]
+    unknown = [t for t in tools if t not in PARSERS]
+    if unknown:
+        parser.error(f"Herramientas sin benchmark: {', '.join(unknown)}")
+    sizes = [parse_size(s) for s in args.sizes.split(",") if s.strip()]
+    modes = [m.strip() for m in args.modes.split(",") if m.strip()]
+    if not modes or any(m not in MODES for m in modes):
+        parser.error(f"--modes: opciones {', '.join(MODES)}")
+
+    # (herramienta, etiqueta de tamaño, salida)
+    cases = []
+    for tool in tools:
+        for size in sizes:
+            cases.append((tool, size, None))
+    for spec in args.fixture:
+        tool, _, path = spec.partition("=")
+        if tool not in PARSERS or not path:
+            parser.error(f"--fixture inválido: {spec}")
+        cases.append((tool, f"file:{Path(path).name}", Path(path)))
+
+    print(
+        f"{'tool':<9} {'mode':<9} {'size':>9} {'records':>9} {'input MB':>9} "
+        f"{'seconds':>9} {'records/s':>12} {'MB/s':>8} {'peak MB':>9}"
+    )
+    results = []
+    for tool, size, path in cases:
+        if path is not None:
+            stdout = path.read_text(encoding="utf-8", errors="replace")
+        else:
+            stdout = load_output(tool, size, args.fixtures_dir)
+
+        for mode in modes:
+            row = {
+                "tool": tool,
+                "size": size,
+                "mode": mode,
+                **measure(PARSERS[tool](), stdout, args.repeat, mode),
+            }
+            results.append(row)
+            print_row(row)
+        del stdout
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        regressions = compare(results, baseline, args.max_regression)
+        if regressions:
+            print("\nRegresiones detectadas:")
+            for line in regressions:
+                print(f"  - {line}")
+            return 1
+        print("\nSin regresiones respecto al baseline")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())